@@ -4,3 +4,11 @@ from django.apps import AppConfig
 class AccountsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'accounts'
+
+    def ready(self):
+        # Registra las señales que invalidan el cache de principales y la matriz de permisos
+        from . import principal, permissions  # noqa: F401
+
+        # Versiones para GET condicional (ETag / Last-Modified) de los catálogos
+        from utils.versiones import versionar_modelos
+        versionar_modelos(self.get_model('Rol'), self.get_model('Permiso'))
@@ -4,15 +4,23 @@ from rest_framework import exceptions
 from django.conf import settings
 import jwt
 
-from accounts.models import Usuario
+from accounts.principal import obtener_principal
+from accounts.revocation import lista_revocacion
 
 class JWTAuthentication(BaseAuthentication):
     """
     Lee Authorization: Bearer <token>, lo decodifica con tu JWT_SECRET_KEY,
     y pone el Usuario en request.user.
+    El Usuario (con rol, residente y residencia activa) sale del cache de principales.
+    Es el único punto donde se verifica el token: los claims quedan en request.auth
+    y utils.auth.jwt_auth_required los reutiliza.
     """
     keyword = "Bearer"
 
+    def authenticate_header(self, request):
+        # Permite que DRF responda 401 (y no 403) cuando falla la autenticación
+        return self.keyword
+
     def authenticate(self, request):
         auth_header = request.headers.get("Authorization")
         if not auth_header:
@@ -35,10 +43,18 @@ class JWTAuthentication(BaseAuthentication):
         if not user_id:
             raise exceptions.AuthenticationFailed("Token sin user_id")
 
-        try:
-            usuario = Usuario.objects.get(id=user_id)
-        except Usuario.DoesNotExist:
+        # Lista de revocación en memoria: sin lecturas a la base por request
+        if lista_revocacion.token_revocado(payload.get("jti")):
+            raise exceptions.AuthenticationFailed("Token revocado")
+        if lista_revocacion.usuario_revocado(user_id):
+            raise exceptions.AuthenticationFailed("Usuario deshabilitado")
+
+        usuario = obtener_principal(user_id)
+        if usuario is None:
             raise exceptions.AuthenticationFailed("Usuario no encontrado")
+        # Deshabilitados antes de existir Revocacion: el principal cacheado ya trae el flag
+        if not usuario.esta_activo:
+            raise exceptions.AuthenticationFailed("Usuario deshabilitado")
 
-        # DRF espera (user, auth); auth puede ser None
-        return (usuario, None)
+        # DRF espera (user, auth); auth son los claims ya verificados
+        return (usuario, payload)
@@ -0,0 +1,21 @@
+# accounts/hashers.py
+from django.conf import settings
+from django.contrib.auth.hashers import PBKDF2PasswordHasher
+
+
+class PBKDF2ConfigurableHasher(PBKDF2PasswordHasher):
+    """
+    PBKDF2-SHA256 con costo configurable (PASSWORD_HASH_ITERATIONS).
+    Usa el mismo algoritmo que el hasher por defecto, así que los hashes existentes
+    siguen siendo válidos; si el costo cambia, must_update() marca el hash para
+    regenerarlo en el próximo login correcto.
+    """
+    @property
+    def iterations(self):
+        return settings.PASSWORD_HASH_ITERATIONS
+
+
+def make_password_importacion(password):
+    """Hash de costo reducido (IMPORTACION_HASH_ITERATIONS); se regenera al costo normal en el primer login"""
+    hasher = PBKDF2ConfigurableHasher()
+    return hasher.encode(password, hasher.salt(), iterations=settings.IMPORTACION_HASH_ITERATIONS)
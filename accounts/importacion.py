@@ -0,0 +1,156 @@
+# accounts/importacion.py
+import csv
+import json
+from concurrent.futures import ThreadPoolExecutor
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+
+from accounts.hashers import make_password_importacion
+from accounts.models import Rol, Usuario, Residente
+from accounts.serializers import ImportacionFilaSerializer
+from utils.lotes import lotes
+
+
+CAMPOS_RESIDENTE = ['tipo', 'telefono', 'fecha_ingreso', 'observaciones']
+
+
+def leer_filas(lineas, formato='csv'):
+    """Genera (numero_fila, dict) leyendo CSV (con cabecera) o NDJSON línea a línea"""
+    if formato == 'csv':
+        for numero, fila in enumerate(csv.DictReader(lineas), start=1):
+            yield numero, fila
+    elif formato == 'ndjson':
+        numero = 0
+        for linea in lineas:
+            if not linea.strip():
+                continue
+            numero += 1
+            try:
+                fila = json.loads(linea)
+            except json.JSONDecodeError as e:
+                fila = {'__error__': f"JSON inválido: {e.msg}"}
+            yield numero, fila
+    else:
+        raise ValueError(f"Formato no soportado: {formato}")
+
+
+class ImportadorUsuarios:
+    """
+    Importación masiva de Usuario (+ Residente opcional) por lotes:
+    - valida formato sin consultas (ImportacionFilaSerializer)
+    - verifica duplicados de ci/correo en memoria y contra la base con una consulta por lote
+    - hashea las contraseñas en un pool de hilos, a costo de importación (el login las actualiza)
+    - inserta con bulk_create dentro de una transacción por lote
+    """
+    def __init__(self, tamano_lote=None, hilos=None):
+        self.tamano_lote = tamano_lote or settings.IMPORTACION_TAMANO_LOTE
+        self.hilos = hilos or settings.IMPORTACION_HILOS_HASH
+        self.roles = {rol.nombre: rol for rol in Rol.objects.all()}
+        self.ci_vistos = set()
+        self.correos_vistos = set()
+        self.creados = 0
+        self.errores = []
+
+    def importar(self, lineas, formato='csv'):
+        with ThreadPoolExecutor(max_workers=self.hilos) as pool:
+            for lote in lotes(leer_filas(lineas, formato), self.tamano_lote):
+                self._procesar_lote(lote, pool)
+        return {
+            "creados": self.creados,
+            "con_errores": len(self.errores),
+            "errores": self.errores,
+        }
+
+    def _error(self, numero, errores):
+        self.errores.append({"fila": numero, "errores": errores})
+
+    def _procesar_lote(self, lote, pool):
+        validas = []
+        for numero, fila in lote:
+            if isinstance(fila, dict) and '__error__' in fila:
+                self._error(numero, {"fila": [fila['__error__']]})
+                continue
+            serializer = ImportacionFilaSerializer(data=fila)
+            if not serializer.is_valid():
+                self._error(numero, serializer.errors)
+                continue
+            datos = serializer.validated_data
+
+            rol = self.roles.get(datos['rol'])
+            if rol is None:
+                self._error(numero, {"rol": [f"El rol '{datos['rol']}' no existe"]})
+                continue
+            if datos.get('tipo') and rol.nombre != 'Residente':
+                self._error(numero, {"rol": ["El usuario debe tener rol 'Residente' para registrar como residente."]})
+                continue
+
+            # Duplicados dentro del mismo archivo
+            if datos['ci'] in self.ci_vistos:
+                self._error(numero, {"ci": ["CI repetido en el archivo"]})
+                continue
+            if datos['correo'] in self.correos_vistos:
+                self._error(numero, {"correo": ["Correo repetido en el archivo"]})
+                continue
+            self.ci_vistos.add(datos['ci'])
+            self.correos_vistos.add(datos['correo'])
+            validas.append((numero, datos, rol))
+
+        if not validas:
+            return
+
+        # Duplicados contra la base: una sola consulta por lote
+        existentes = list(Usuario.objects.filter(
+            Q(ci__in=[d['ci'] for _, d, _ in validas]) |
+            Q(correo__in=[d['correo'] for _, d, _ in validas])
+        ).values_list('ci', 'correo'))
+        ci_existentes = {ci for ci, _ in existentes}
+        correos_existentes = {correo for _, correo in existentes}
+
+        filas = []
+        for numero, datos, rol in validas:
+            if datos['ci'] in ci_existentes:
+                self._error(numero, {"ci": ["Ya existe un usuario con este CI"]})
+            elif datos['correo'] in correos_existentes:
+                self._error(numero, {"correo": ["Ya existe un usuario con este correo"]})
+            else:
+                filas.append((numero, datos, rol))
+
+        if not filas:
+            return
+
+        hashes = pool.map(make_password_importacion, [datos['password'] for _, datos, _ in filas])
+
+        usuarios = []
+        residentes = []
+        for (numero, datos, rol), password in zip(filas, hashes):
+            usuario = Usuario(
+                ci=datos['ci'],
+                nombre=datos['nombre'],
+                apellido=datos['apellido'],
+                correo=datos['correo'],
+                password=password,
+                foto_url=datos.get('foto_url') or None,
+                rol=rol,
+            )
+            usuarios.append(usuario)
+            if datos.get('tipo'):
+                residentes.append(Residente(
+                    usuario=usuario,
+                    **{campo: datos[campo] for campo in CAMPOS_RESIDENTE if datos.get(campo) is not None}
+                ))
+
+        try:
+            with transaction.atomic():
+                Usuario.objects.bulk_create(usuarios)
+                Residente.objects.bulk_create(residentes)
+        except IntegrityError:
+            # Otro proceso insertó el mismo ci/correo entre la verificación y el insert
+            for numero, _, _ in filas:
+                self._error(numero, {"fila": ["Conflicto de unicidad al insertar el lote; reintente la fila"]})
+            return
+        self.creados += len(usuarios)
+
+
+def importar_usuarios(lineas, formato='csv', tamano_lote=None):
+    return ImportadorUsuarios(tamano_lote=tamano_lote).importar(lineas, formato)
@@ -0,0 +1,70 @@
+#accounts/management/commands/benchmark_login.py
+import time
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test.utils import override_settings
+from rest_framework.test import APIRequestFactory
+from accounts.models import Rol, Usuario
+from accounts.views import LoginView
+
+class Command(BaseCommand):
+    help = 'Mide el login (p50/p99 y logins/seg por worker) con distintos costos de hash'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--iteraciones',
+            type=int,
+            nargs='+',
+            default=[100_000, 260_000, 600_000, 1_000_000],
+            help='Costos PBKDF2 a comparar (ej: --iteraciones 100000 600000)',
+        )
+        parser.add_argument(
+            '--logins',
+            type=int,
+            default=50,
+            help='Cantidad de logins por costo',
+        )
+
+    def handle(self, *args, **options):
+        factory = APIRequestFactory()
+        view = LoginView.as_view()
+        password = 'benchmark-password'
+
+        self.stdout.write(f"{'iteraciones':>12} {'p50 ms':>9} {'p99 ms':>9} {'logins/seg':>11}")
+
+        # Todo se hace dentro de una transacción que se revierte al final
+        with transaction.atomic():
+            rol, _ = Rol.objects.get_or_create(nombre='Residente')
+
+            for i, iteraciones in enumerate(options['iteraciones']):
+                with override_settings(PASSWORD_HASH_ITERATIONS=iteraciones):
+                    ci = f"bench-{i}"
+                    Usuario.objects.create(
+                        ci=ci,
+                        nombre='Benchmark',
+                        apellido='Login',
+                        correo=f"{ci}@benchmark.local",
+                        password=make_password(password),
+                        rol=rol,
+                    )
+
+                    tiempos = []
+                    for _ in range(options['logins']):
+                        request = factory.post('/api/accounts/login/', {'ci': ci, 'password': password}, format='json')
+                        inicio = time.perf_counter()
+                        response = view(request)
+                        tiempos.append(time.perf_counter() - inicio)
+                        if response.status_code != 200:
+                            self.stdout.write(self.style.ERROR(f" Login fallido: {response.data}"))
+                            break
+
+                tiempos.sort()
+                p50 = tiempos[len(tiempos) // 2] * 1000
+                p99 = tiempos[min(len(tiempos) - 1, int(len(tiempos) * 0.99))] * 1000
+                por_segundo = len(tiempos) / sum(tiempos)
+                self.stdout.write(f"{iteraciones:>12} {p50:>9.1f} {p99:>9.1f} {por_segundo:>11.1f}")
+
+            transaction.set_rollback(True)
+
+        self.stdout.write(self.style.SUCCESS(" Benchmark completado (datos revertidos)"))
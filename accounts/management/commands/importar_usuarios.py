@@ -0,0 +1,34 @@
+#accounts/management/commands/importar_usuarios.py
+from django.core.management.base import BaseCommand, CommandError
+from accounts.importacion import importar_usuarios
+
+class Command(BaseCommand):
+    help = 'Importa usuarios (y residentes) en lote desde un archivo CSV o NDJSON'
+
+    def add_arguments(self, parser):
+        parser.add_argument('ruta', type=str, help='Ruta del archivo a importar')
+        parser.add_argument(
+            '--formato',
+            choices=['csv', 'ndjson'],
+            help='Formato del archivo (por defecto según la extensión)',
+        )
+        parser.add_argument(
+            '--lote',
+            type=int,
+            help='Filas por lote (por defecto IMPORTACION_TAMANO_LOTE)',
+        )
+
+    def handle(self, *args, **options):
+        ruta = options['ruta']
+        formato = options['formato'] or ('ndjson' if ruta.endswith(('.ndjson', '.jsonl')) else 'csv')
+
+        try:
+            with open(ruta, encoding='utf-8-sig', newline='') as archivo:
+                reporte = importar_usuarios(archivo, formato, tamano_lote=options['lote'])
+        except OSError as e:
+            raise CommandError(f"No se pudo leer {ruta}: {e}")
+
+        self.stdout.write(self.style.SUCCESS(f" Usuarios creados: {reporte['creados']}"))
+        self.stdout.write(f" Filas con errores: {reporte['con_errores']}")
+        for error in reporte['errores']:
+            self.stdout.write(self.style.ERROR(f"  - Fila {error['fila']}: {error['errores']}"))
@@ -0,0 +1,45 @@
+#accounts/management/commands/purgar_revocaciones.py
+import datetime
+from django.core.management.base import BaseCommand
+from django.db.models import Max
+from django.utils import timezone
+from accounts.models import Revocacion
+
+class Command(BaseCommand):
+    help = 'Compacta la tabla de revocaciones: borra tokens vencidos y registros de usuario ya superados'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dias',
+            type=int,
+            default=1,
+            help='Antigüedad mínima (en días) de los registros de usuario a compactar',
+        )
+
+    def handle(self, *args, **options):
+        ahora = timezone.now()
+        limite = ahora - datetime.timedelta(days=options['dias'])
+
+        # Tokens vencidos: jwt.decode ya los rechaza por exp
+        tokens, _ = Revocacion.objects.filter(tipo='token', expira__lte=ahora).delete()
+
+        # Por usuario solo importa el último registro
+        ultimos = (
+            Revocacion.objects.filter(tipo='usuario')
+            .values('valor')
+            .annotate(ultimo=Max('id'))
+            .values_list('ultimo', flat=True)
+        )
+        superados, _ = Revocacion.objects.filter(
+            tipo='usuario', fecha_creacion__lt=limite
+        ).exclude(id__in=ultimos).delete()
+
+        # Rehabilitaciones antiguas: todos los workers ya las aplicaron
+        rehabilitados, _ = Revocacion.objects.filter(
+            tipo='usuario', revocado=False, fecha_creacion__lt=limite
+        ).delete()
+
+        self.stdout.write(self.style.SUCCESS(
+            f" Revocaciones purgadas: {tokens} tokens vencidos, "
+            f"{superados} registros superados, {rehabilitados} rehabilitaciones"
+        ))
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.6 on 2026-10-18 05:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Revocacion',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('tipo', models.CharField(choices=[('usuario', 'Usuario'), ('token', 'Token')], max_length=10)),
+                ('valor', models.CharField(max_length=64)),
+                ('revocado', models.BooleanField(default=True)),
+                ('expira', models.DateTimeField(blank=True, null=True)),
+                ('fecha_creacion', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': 'Revocación',
+                'verbose_name_plural': 'Revocaciones',
+            },
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.6 on 2026-10-18 05:54
+
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import TrigramExtension
+import django.db.models.functions.text
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0002_revocacion'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddIndex(
+            model_name='usuario',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('nombre'), name='gin_trgm_ops'), name='usuario_nombre_trgm'),
+        ),
+        migrations.AddIndex(
+            model_name='usuario',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('apellido'), name='gin_trgm_ops'), name='usuario_apellido_trgm'),
+        ),
+        migrations.AddIndex(
+            model_name='usuario',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('ci'), name='gin_trgm_ops'), name='usuario_ci_trgm'),
+        ),
+        migrations.AddIndex(
+            model_name='usuario',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('correo'), name='gin_trgm_ops'), name='usuario_correo_trgm'),
+        ),
+    ]
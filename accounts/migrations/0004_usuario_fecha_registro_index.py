@@ -0,0 +1,17 @@
+# Generated by Django 5.2.6 on 2026-10-18 05:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0003_usuario_trigram_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='usuario',
+            index=models.Index(fields=['-fecha_registro', '-id'], name='usuario_fecha_registro_idx'),
+        ),
+    ]
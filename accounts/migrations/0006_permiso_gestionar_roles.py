@@ -0,0 +1,22 @@
+from django.db import migrations
+
+
+def crear_permiso(apps, schema_editor):
+    # Las escrituras sobre roles y permisos lo exigen: sin él nadie podría administrarlos por la API
+    Permiso = apps.get_model('accounts', 'Permiso')
+    Rol = apps.get_model('accounts', 'Rol')
+    RolPermiso = apps.get_model('accounts', 'RolPermiso')
+    permiso, _ = Permiso.objects.get_or_create(nombre='gestionar_roles')
+    for rol in Rol.objects.filter(nombre__iexact='Administrador'):
+        RolPermiso.objects.get_or_create(rol=rol, permiso=permiso)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0005_cache_versiones'),
+    ]
+
+    operations = [
+        migrations.RunPython(crear_permiso, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,26 @@
+from django.db import migrations
+
+
+def revocar_inactivos(apps, schema_editor):
+    # Usuarios deshabilitados antes de la lista de revocación: sus tokens vigentes quedan revocados
+    Usuario = apps.get_model('accounts', 'Usuario')
+    Revocacion = apps.get_model('accounts', 'Revocacion')
+    # Quien ya tiene registros conserva su último estado registrado
+    registrados = set(Revocacion.objects.filter(tipo='usuario').values_list('valor', flat=True))
+    inactivos = Usuario.objects.filter(esta_activo=False).values_list('id', flat=True)
+    Revocacion.objects.bulk_create(
+        [Revocacion(tipo='usuario', valor=str(usuario_id)) for usuario_id in inactivos
+         if str(usuario_id) not in registrados],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0006_permiso_gestionar_roles'),
+    ]
+
+    operations = [
+        migrations.RunPython(revocar_inactivos, migrations.RunPython.noop),
+    ]
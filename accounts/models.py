@@ -1,6 +1,8 @@
 # accounts/models.py
 import uuid
+from django.contrib.postgres.indexes import GinIndex, OpClass
 from django.db import models
+from django.db.models.functions import Upper
 
 
 class Permiso(models.Model):
@@ -60,6 +62,17 @@ class Usuario(models.Model):
 
     rol = models.ForeignKey(Rol, on_delete=models.PROTECT, related_name='usuarios')
 
+    class Meta:
+        # Trigramas sobre UPPER(campo): sirven a los filtros icontains (búsqueda parcial)
+        indexes = [
+            GinIndex(OpClass(Upper('nombre'), name='gin_trgm_ops'), name='usuario_nombre_trgm'),
+            GinIndex(OpClass(Upper('apellido'), name='gin_trgm_ops'), name='usuario_apellido_trgm'),
+            GinIndex(OpClass(Upper('ci'), name='gin_trgm_ops'), name='usuario_ci_trgm'),
+            GinIndex(OpClass(Upper('correo'), name='gin_trgm_ops'), name='usuario_correo_trgm'),
+            # Orden del listado paginado (el id desempata registros con la misma fecha)
+            models.Index(fields=['-fecha_registro', '-id'], name='usuario_fecha_registro_idx'),
+        ]
+
     def __str__(self):
         return f"{self.nombre} {self.apellido} ({self.rol.nombre})"
     # accounts/models.py (en tu modelo Usuario)
@@ -99,4 +112,28 @@ class Residente(models.Model):
     observaciones = models.TextField(blank=True, null=True)
 
     def __str__(self):
-        return f"{self.usuario.nombre} {self.usuario.apellido} ({self.tipo})"
\ No newline at end of file
+        return f"{self.usuario.nombre} {self.usuario.apellido} ({self.tipo})"
+
+class Revocacion(models.Model):
+    """
+    Registro append-only de revocaciones: usuarios deshabilitados/rehabilitados y
+    tokens (jti) revocados. Cada worker lo lee incrementalmente por id.
+    """
+    TIPO_CHOICES = [
+        ('usuario', 'Usuario'),
+        ('token', 'Token'),
+    ]
+
+    id = models.BigAutoField(primary_key=True)  # Secuencial: se lee con id > ultimo_id - ventana
+    tipo = models.CharField(max_length=10, choices=TIPO_CHOICES)
+    valor = models.CharField(max_length=64)  # usuario_id o jti
+    revocado = models.BooleanField(default=True)  # False = usuario rehabilitado
+    expira = models.DateTimeField(null=True, blank=True)  # Vencimiento del token revocado
+    fecha_creacion = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = "Revocación"
+        verbose_name_plural = "Revocaciones"
+
+    def __str__(self):
+        return f"{self.tipo}:{self.valor} ({'revocado' if self.revocado else 'rehabilitado'})"
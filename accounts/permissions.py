@@ -0,0 +1,168 @@
+# accounts/permissions.py
+import threading
+import uuid
+from collections import defaultdict
+from contextlib import contextmanager
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from rest_framework.permissions import BasePermission
+
+from accounts.models import Permiso, Rol, RolPermiso
+from utils.versiones import cache_versiones
+
+
+PERMISOS_VERSION_KEY = "permisos:version"
+
+# Permiso que exigen las escrituras sobre roles y permisos (accounts 0006 lo crea y lo da a 'Administrador')
+PERMISO_GESTIONAR_ROLES = 'gestionar_roles'
+GESTION_ROLES = {metodo: [PERMISO_GESTIONAR_ROLES] for metodo in ('POST', 'PUT', 'PATCH', 'DELETE')}
+
+# Matriz compilada de este proceso (se reconstruye cuando cambia la versión)
+_matriz = None
+
+# Permite agrupar muchas escrituras en una sola invalidación (ver invalidacion_agrupada)
+_estado_hilo = threading.local()
+
+
+class MatrizPermisos:
+    """
+    Matriz Rol x Permiso compilada: un bit por permiso y una máscara (int) por rol.
+    Consultarla no toca la base de datos.
+    """
+    def __init__(self, version, bits, mascaras):
+        self.version = version
+        self.bits = bits            # {nombre_permiso: bit}
+        self.mascaras = mascaras    # {rol_id: bitset}
+
+    def mascara_de(self, nombres):
+        """Máscara requerida para un conjunto de permisos; None si alguno no existe"""
+        mascara = 0
+        for nombre in nombres:
+            bit = self.bits.get(nombre)
+            if bit is None:
+                return None
+            mascara |= bit
+        return mascara
+
+    def rol_tiene(self, rol_id, nombres):
+        requerida = self.mascara_de(nombres)
+        if requerida is None:
+            return False
+        return self.mascaras.get(rol_id, 0) & requerida == requerida
+
+    def permisos_de(self, rol_id):
+        mascara = self.mascaras.get(rol_id, 0)
+        return sorted(nombre for nombre, bit in self.bits.items() if mascara & bit)
+
+
+def version_permisos():
+    """Versión compartida entre workers (cache 'versiones'); si se pierde se genera una nueva"""
+    version = cache_versiones.get(PERMISOS_VERSION_KEY)
+    if version is None:
+        version = uuid.uuid4().hex
+        cache_versiones.add(PERMISOS_VERSION_KEY, version, settings.VERSION_CACHE_TTL)
+        version = cache_versiones.get(PERMISOS_VERSION_KEY, version)
+    return version
+
+
+def invalidar_matriz():
+    """Marca la matriz como obsoleta en todos los procesos"""
+    cache_versiones.set(PERMISOS_VERSION_KEY, uuid.uuid4().hex, settings.VERSION_CACHE_TTL)
+
+
+@contextmanager
+def invalidacion_agrupada():
+    """Las escrituras dentro del bloque invalidan la matriz una sola vez, al final"""
+    _estado_hilo.agrupando = True
+    _estado_hilo.pendiente = False
+    try:
+        yield
+    finally:
+        _estado_hilo.agrupando = False
+        if _estado_hilo.pendiente:
+            transaction.on_commit(invalidar_matriz)
+
+
+def compilar_matriz(version):
+    nombres = Permiso.objects.order_by('nombre').values_list('nombre', flat=True)
+    bits = {nombre: 1 << i for i, nombre in enumerate(nombres)}
+
+    mascaras = defaultdict(int)
+    for rol_id, nombre in RolPermiso.objects.values_list('rol_id', 'permiso__nombre'):
+        mascaras[rol_id] |= bits.get(nombre, 0)
+
+    return MatrizPermisos(version, bits, dict(mascaras))
+
+
+def obtener_matriz():
+    global _matriz
+    version = version_permisos()
+    if _matriz is None or _matriz.version != version:
+        _matriz = compilar_matriz(version)
+    return _matriz
+
+
+def rol_tiene_permisos(rol_id, nombres):
+    return obtener_matriz().rol_tiene(rol_id, nombres)
+
+
+def asignar_permisos(rol, permiso_ids):
+    """
+    Deja al rol exactamente con permiso_ids: calcula la diferencia contra los
+    RolPermiso actuales y aplica altas y bajas en una transacción.
+    Devuelve (agregados, quitados).
+    """
+    deseados = set(permiso_ids)
+    with transaction.atomic(), invalidacion_agrupada():
+        # Se bloquea el rol (no solo sus RolPermiso, que pueden no existir aún): dos
+        # asignaciones concurrentes al mismo rol se serializan y calculan la diferencia en orden
+        Rol.objects.select_for_update().values_list('pk', flat=True).get(pk=rol.pk)
+        actuales = set(
+            RolPermiso.objects.filter(rol=rol).values_list('permiso_id', flat=True)
+        )
+        agregados = deseados - actuales
+        quitados = actuales - deseados
+
+        RolPermiso.objects.bulk_create(
+            [RolPermiso(rol=rol, permiso_id=permiso_id) for permiso_id in agregados]
+        )
+        if quitados:
+            RolPermiso.objects.filter(rol=rol, permiso_id__in=quitados).delete()
+        if agregados:
+            _estado_hilo.pendiente = True
+    return agregados, quitados
+
+
+class TienePermiso(BasePermission):
+    """
+    Verifica request.user.rol contra la matriz compilada (sin consultas).
+    La vista declara lo que exige:
+        permisos_requeridos = ['ver_usuarios']                      # todos los métodos
+        permisos_requeridos = {'GET': ['ver_usuarios'], 'POST': ['crear_usuario']}
+    """
+    message = "No tienes permisos para realizar esta acción"
+
+    def has_permission(self, request, view):
+        requeridos = getattr(view, 'permisos_requeridos', None)
+        if isinstance(requeridos, dict):
+            requeridos = requeridos.get(request.method)
+        if not requeridos:
+            return True
+
+        rol_id = getattr(request.user, 'rol_id', None)
+        if rol_id is None:
+            return False
+        return rol_tiene_permisos(rol_id, requeridos)
+
+
+# Señales: cualquier escritura en RolPermiso o Permiso invalida la matriz
+@receiver([post_save, post_delete], sender=RolPermiso)
+@receiver([post_save, post_delete], sender=Permiso)
+def invalidar_matriz_por_cambio(sender, instance, **kwargs):
+    if getattr(_estado_hilo, 'agrupando', False):
+        _estado_hilo.pendiente = True
+        return
+    # Después del commit: otro worker no debe recompilar con datos aún no confirmados
+    transaction.on_commit(invalidar_matriz)
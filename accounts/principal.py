@@ -0,0 +1,80 @@
+# accounts/principal.py
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import FilteredRelation, Q
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from accounts.models import Usuario, Residente
+
+
+PRINCIPAL_CACHE_PREFIX = "principal"
+
+
+def _cache_key(usuario_id):
+    return f"{PRINCIPAL_CACHE_PREFIX}:{usuario_id}"
+
+
+def cargar_principal(usuario_id):
+    """
+    Carga usuario, rol, residente y residencia activa en UNA sola consulta.
+    La residencia activa queda en usuario.residencia_activa (None si no tiene); la
+    condición es la de residencia_residente_activa_unica, así el JOIN trae a lo sumo una.
+    """
+    usuario = (
+        Usuario.objects
+        .annotate(residencia_activa=FilteredRelation(
+            'residente__residencias',
+            condition=Q(residente__residencias__esta_activa=True, residente__residencias__esta_activo=True),
+        ))
+        .select_related('rol', 'residente', 'residencia_activa')
+        .filter(id=usuario_id)
+        .order_by('-residencia_activa__fecha_inicio', '-residencia_activa__id')
+        .first()
+    )
+    if usuario is not None and not hasattr(usuario, 'residencia_activa'):
+        usuario.residencia_activa = None
+    return usuario
+
+
+def obtener_principal(usuario_id):
+    """Devuelve el principal desde cache; en un miss lo carga y lo guarda con TTL corto"""
+    key = _cache_key(usuario_id)
+    usuario = cache.get(key)
+    if usuario is None:
+        usuario = cargar_principal(usuario_id)
+        if usuario is not None:
+            cache.set(key, usuario, settings.PRINCIPAL_CACHE_TTL)
+    return usuario
+
+
+def invalidar_principal(usuario_id):
+    """Borra el principal al confirmar la transacción: antes, otra request lo recargaría viejo"""
+    if usuario_id:
+        key = _cache_key(usuario_id)
+        transaction.on_commit(lambda: cache.delete(key))
+
+
+# Señales: cualquier cambio en Usuario, Residente o Residencia invalida el principal
+@receiver([post_save, post_delete], sender=Usuario)
+def invalidar_por_usuario(sender, instance, **kwargs):
+    invalidar_principal(instance.pk)
+
+
+@receiver([post_save, post_delete], sender=Residente)
+def invalidar_por_residente(sender, instance, **kwargs):
+    invalidar_principal(instance.usuario_id)
+
+
+@receiver([post_save, post_delete], sender='condominio.Residencia')
+def invalidar_por_residencia(sender, instance, **kwargs):
+    # Si el residente ya está cargado en la instancia evitamos la consulta
+    residente = instance._state.fields_cache.get('residente')
+    if residente is not None:
+        usuario_id = residente.usuario_id
+    else:
+        usuario_id = Residente.objects.filter(
+            pk=instance.residente_id
+        ).values_list('usuario_id', flat=True).first()
+    invalidar_principal(usuario_id)
@@ -0,0 +1,126 @@
+# accounts/revocation.py
+import datetime
+import threading
+import time
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+
+from accounts.models import Revocacion
+
+
+def _aplicar_en(usuarios, tokens, tipo, valor, revocado, expira):
+    """Aplica una fila; reaplicar las mismas filas en orden de id deja el mismo resultado"""
+    if tipo == 'usuario':
+        if revocado:
+            usuarios.add(valor)
+        else:
+            usuarios.discard(valor)
+    elif tipo == 'token':
+        tokens[valor] = expira.timestamp() if expira else float('inf')
+
+
+def _filas(desde_id=0):
+    return (
+        Revocacion.objects
+        .filter(id__gt=desde_id)
+        .filter(Q(expira__isnull=True) | Q(expira__gt=timezone.now()))
+        .order_by('id')
+        .values_list('id', 'tipo', 'valor', 'revocado', 'expira')
+    )
+
+
+class ListaRevocacion:
+    """
+    Copia en memoria (por proceso) de la tabla Revocacion.
+    Se refresca como máximo cada REVOCACION_REFRESH_SECONDS releyendo desde
+    ultimo_id - REVOCACION_VENTANA_IDS: una fila con id menor que se confirma tarde
+    igual se lee. Cada REVOCACION_RECONSTRUIR_SECONDS se reconstruye completa, así
+    ninguna revocación queda afuera más que ese tiempo.
+    """
+    def __init__(self):
+        self.usuarios = set()   # usuario_id (str) deshabilitados
+        self.tokens = {}        # jti -> timestamp de vencimiento
+        self.ultimo_id = 0
+        self.ultima_lectura = None
+        self.ultima_reconstruccion = None
+        self._lock = threading.Lock()
+
+    def _aplicar(self, tipo, valor, revocado, expira):
+        _aplicar_en(self.usuarios, self.tokens, tipo, valor, revocado, expira)
+
+    def _reconstruir(self, ahora):
+        usuarios, tokens, ultimo_id = set(), {}, 0
+        for id_, tipo, valor, revocado, expira in _filas():
+            _aplicar_en(usuarios, tokens, tipo, valor, revocado, expira)
+            ultimo_id = id_
+        # Se reemplaza de una vez: las lecturas sin lock nunca ven una lista a medio armar
+        self.usuarios, self.tokens, self.ultimo_id = usuarios, tokens, ultimo_id
+        self.ultima_reconstruccion = ahora
+
+    def _refrescar_incremental(self):
+        desde_id = max(self.ultimo_id - settings.REVOCACION_VENTANA_IDS, 0)
+        for id_, tipo, valor, revocado, expira in _filas(desde_id):
+            self._aplicar(tipo, valor, revocado, expira)
+            self.ultimo_id = max(self.ultimo_id, id_)
+
+        # Los tokens vencidos ya los rechaza jwt.decode
+        vencidos = [jti for jti, exp in self.tokens.items() if exp <= time.time()]
+        for jti in vencidos:
+            del self.tokens[jti]
+
+    def refrescar(self, forzar=False):
+        ahora = time.monotonic()
+        if not forzar and self.ultima_lectura is not None and \
+                ahora - self.ultima_lectura < settings.REVOCACION_REFRESH_SECONDS:
+            return
+
+        with self._lock:
+            if not forzar and self.ultima_lectura is not None and \
+                    ahora - self.ultima_lectura < settings.REVOCACION_REFRESH_SECONDS:
+                return
+
+            if self.ultima_reconstruccion is None or \
+                    ahora - self.ultima_reconstruccion >= settings.REVOCACION_RECONSTRUIR_SECONDS:
+                self._reconstruir(ahora)
+            else:
+                self._refrescar_incremental()
+
+            self.ultima_lectura = ahora
+
+    def usuario_revocado(self, usuario_id):
+        self.refrescar()
+        return str(usuario_id) in self.usuarios
+
+    def token_revocado(self, jti):
+        if not jti:
+            return False
+        self.refrescar()
+        return jti in self.tokens
+
+
+lista_revocacion = ListaRevocacion()
+
+
+def registrar_estado_usuario(usuario):
+    """Registra la (des)habilitación de un usuario y la aplica ya en este proceso"""
+    revocacion = Revocacion.objects.create(
+        tipo='usuario',
+        valor=str(usuario.id),
+        revocado=not usuario.esta_activo,
+    )
+    lista_revocacion._aplicar(revocacion.tipo, revocacion.valor, revocacion.revocado, None)
+    return revocacion
+
+
+def revocar_token(claims):
+    """Revoca el token (jti) de los claims hasta su vencimiento"""
+    jti = claims.get('jti')
+    if not jti:
+        return None
+    expira = None
+    if claims.get('exp'):
+        expira = datetime.datetime.fromtimestamp(claims['exp'], tz=datetime.timezone.utc)
+    revocacion = Revocacion.objects.create(tipo='token', valor=jti, expira=expira)
+    lista_revocacion._aplicar(revocacion.tipo, revocacion.valor, revocacion.revocado, expira)
+    return revocacion
@@ -2,6 +2,8 @@
 from rest_framework import serializers
 from django.contrib.auth.hashers import make_password
 from .models import Permiso, Rol, RolPermiso, Usuario, Residente
+from .revocation import registrar_estado_usuario
+from utils.serializers import CamposDinamicosMixin
 
 
 class PermisoSerializer(serializers.ModelSerializer):
@@ -22,7 +24,22 @@ class RolPermisoSerializer(serializers.ModelSerializer):
         fields = ['id', 'rol', 'permiso']
 
 
-class UsuarioSerializer(serializers.ModelSerializer):
+class RolPermisosAsignacionSerializer(serializers.Serializer):
+    """Conjunto completo de permisos deseado para un rol"""
+    permisos = serializers.ListField(child=serializers.UUIDField(), allow_empty=True)
+
+    def validate_permisos(self, value):
+        ids = set(value)
+        existentes = set(Permiso.objects.filter(id__in=ids).values_list('id', flat=True))
+        faltantes = ids - existentes
+        if faltantes:
+            raise serializers.ValidationError(
+                f"Permisos inexistentes: {', '.join(sorted(str(i) for i in faltantes))}"
+            )
+        return ids
+
+
+class UsuarioSerializer(CamposDinamicosMixin, serializers.ModelSerializer):
     rol_nombre = serializers.CharField(source='rol.nombre', read_only=True)
     
     class Meta:
@@ -43,6 +60,8 @@ class UsuarioSerializer(serializers.ModelSerializer):
         extra_kwargs = {
             'password': {'write_only': True}
         }
+        expandibles = ['rol_nombre']
+        select_related = {'rol_nombre': 'rol'}
 
     def get_rol_nombre(self, obj):
         return obj.rol.nombre if obj.rol else None
@@ -54,7 +73,11 @@ class UsuarioSerializer(serializers.ModelSerializer):
     def update(self, instance, validated_data):
         if 'password' in validated_data:
             validated_data['password'] = make_password(validated_data['password'])
-        return super().update(instance, validated_data)
+        cambia_estado = 'esta_activo' in validated_data and validated_data['esta_activo'] != instance.esta_activo
+        usuario = super().update(instance, validated_data)
+        if cambia_estado:
+            registrar_estado_usuario(usuario)
+        return usuario
 
 
 class LoginSerializer(serializers.Serializer):
@@ -62,7 +85,7 @@ class LoginSerializer(serializers.Serializer):
     password = serializers.CharField(write_only=True)
 
 
-class ResidenteSerializer(serializers.ModelSerializer):
+class ResidenteSerializer(CamposDinamicosMixin, serializers.ModelSerializer):
     usuario_info = UsuarioSerializer(source='usuario', read_only=True)
     nombre_completo = serializers.SerializerMethodField()
     tipo_display = serializers.CharField(source='get_tipo_display', read_only=True)
@@ -76,6 +99,11 @@ class ResidenteSerializer(serializers.ModelSerializer):
             'tiene_vehiculo', 'detalle_vehiculos', 'tiene_mascota', 'detalle_mascotas',
             'fecha_ingreso', 'observaciones'
         ]
+        expandibles = ['usuario_info']
+        select_related = {
+            'usuario_info': ['usuario', 'usuario__rol'],
+            'nombre_completo': 'usuario',
+        }
     
     def get_nombre_completo(self, obj):
         return f"{obj.usuario.nombre} {obj.usuario.apellido}"
@@ -85,4 +113,29 @@ class ResidenteSerializer(serializers.ModelSerializer):
         usuario = validated_data['usuario']
         if usuario.rol.nombre != 'Residente':
             raise serializers.ValidationError("El usuario debe tener rol 'Residente' para registrar como residente.")
-        return super().create(validated_data)
\ No newline at end of file
+        return super().create(validated_data)
+
+class ImportacionFilaSerializer(serializers.Serializer):
+    """
+    Valida el formato de una fila de la importación masiva (sin consultas).
+    La unicidad de ci/correo y el rol se verifican por lote en accounts.importacion.
+    """
+    ci = serializers.CharField(max_length=20)
+    nombre = serializers.CharField(max_length=100)
+    apellido = serializers.CharField(max_length=100)
+    correo = serializers.EmailField()
+    password = serializers.CharField(max_length=128)
+    rol = serializers.CharField(max_length=100, required=False, default='Residente')
+    foto_url = serializers.URLField(required=False, allow_blank=True)
+
+    # Datos de Residente (opcionales: si viene 'tipo' se crea el residente)
+    tipo = serializers.ChoiceField(choices=Residente.TIPO_RESIDENTE_CHOICES, required=False, allow_blank=True)
+    telefono = serializers.CharField(max_length=20, required=False, allow_blank=True)
+    fecha_ingreso = serializers.DateField(required=False, allow_null=True)
+    observaciones = serializers.CharField(required=False, allow_blank=True)
+
+    def to_internal_value(self, data):
+        # En CSV las columnas vacías llegan como '' y no deben fallar en campos opcionales
+        if isinstance(data, dict):
+            data = {k: v for k, v in data.items() if v not in ('', None)}
+        return super().to_internal_value(data)
@@ -1,3 +1,249 @@
-from django.test import TestCase
+import datetime
+from unittest import mock
 
-# Create your tests here.
+import jwt
+from django.conf import settings
+from django.contrib.auth.hashers import check_password, make_password
+from django.core.cache import cache
+from django.db import DatabaseError, connection
+from django.db.models.query import QuerySet
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from accounts.importacion import importar_usuarios
+from accounts import principal
+from accounts.models import Permiso, Residente, Rol, RolPermiso, Usuario
+from accounts.permissions import PERMISO_GESTIONAR_ROLES, asignar_permisos, rol_tiene_permisos
+
+
+@override_settings(PASSWORD_HASH_ITERATIONS=20_000, IMPORTACION_HASH_ITERATIONS=1_000)
+class ImportacionUsuariosTests(TestCase):
+    """Las contraseñas importadas se hashean a costo de importación y el login las actualiza"""
+
+    @classmethod
+    def setUpTestData(cls):
+        Rol.objects.create(nombre='Residente')
+
+    def _importar(self, *filas, tamano_lote=None):
+        lineas = ['ci,nombre,apellido,correo,password\n', *[f"{fila}\n" for fila in filas]]
+        return importar_usuarios(lineas, 'csv', tamano_lote=tamano_lote)
+
+    def test_hash_de_importacion_y_rehash_al_login(self):
+        reporte = self._importar('IMP-1,Ana,Paz,ana@test.com,clave-ana')
+        self.assertEqual(reporte['creados'], 1)
+        usuario = Usuario.objects.get(ci='IMP-1')
+        self.assertTrue(usuario.password.startswith('pbkdf2_sha256$1000$'))
+        self.assertTrue(check_password('clave-ana', usuario.password))
+
+        response = self.client.post(reverse('login'), {'ci': 'IMP-1', 'password': 'clave-ana'})
+        self.assertEqual(response.status_code, 200)
+        usuario.refresh_from_db()
+        self.assertTrue(usuario.password.startswith('pbkdf2_sha256$20000$'))
+
+
+def _usuario(rol, sufijo):
+    return Usuario.objects.create(ci=f"CI-{sufijo}", nombre=sufijo, apellido='Test', correo=f"{sufijo}@test.com",
+                                  password='x', rol=rol)
+
+
+class GestionRolesPermisoTests(TestCase):
+    """Las escrituras sobre roles y permisos exigen 'gestionar_roles' según la matriz compartida"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.permiso, _ = Permiso.objects.get_or_create(nombre=PERMISO_GESTIONAR_ROLES)
+        cls.administrador = Rol.objects.create(nombre='Admin de prueba')
+        RolPermiso.objects.create(rol=cls.administrador, permiso=cls.permiso)
+        cls.admin = _usuario(cls.administrador, 'gr1')
+        cls.guardia = _usuario(Rol.objects.create(nombre='Guardia'), 'gr2')
+
+    def _crear_rol(self, usuario=None, nombre='Nuevo'):
+        api = APIClient()
+        if usuario:
+            api.force_authenticate(usuario)
+        return api.post(reverse('rol-list-create'), {'nombre': nombre}, format='json')
+
+    def test_exige_el_permiso(self):
+        self.assertEqual(self._crear_rol().status_code, 401)
+        self.assertEqual(self._crear_rol(self.guardia).status_code, 403)
+        self.assertEqual(self._crear_rol(self.admin).status_code, 201)
+        self.assertEqual(self.client.get(reverse('rol-list-create')).status_code, 200)
+
+    def test_revocar_invalida_la_matriz(self):
+        self.assertTrue(rol_tiene_permisos(self.administrador.id, [PERMISO_GESTIONAR_ROLES]))
+        with self.captureOnCommitCallbacks(execute=True):
+            RolPermiso.objects.filter(rol=self.administrador).delete()
+        self.assertFalse(rol_tiene_permisos(self.administrador.id, [PERMISO_GESTIONAR_ROLES]))
+        self.assertEqual(self._crear_rol(self.admin).status_code, 403)
+
+
+class UsuarioDeshabilitadoTokenTests(TestCase):
+    """Un token vigente de un usuario deshabilitado sin registro en Revocacion se rechaza igual"""
+
+    def test_rechaza_token_de_usuario_inactivo(self):
+        usuario = _usuario(Rol.objects.create(nombre='Residente'), 'ud1')
+        Usuario.objects.filter(pk=usuario.pk).update(esta_activo=False)  # sin registrar_estado_usuario
+        ahora = datetime.datetime.now(datetime.timezone.utc)
+        token = jwt.encode({'user_id': str(usuario.id), 'jti': 'ud1', 'iat': ahora,
+                            'exp': ahora + datetime.timedelta(hours=1)}, settings.JWT_SECRET_KEY, algorithm='HS256')
+        response = self.client.get(reverse('rol-list-create'), HTTP_AUTHORIZATION=f"Bearer {token}")
+        self.assertEqual(response.status_code, 401)
+
+
+class ResidentePaginacionTests(TestCase):
+    """El listado de residentes se pagina por fecha de registro del usuario, sin repetir ni saltear"""
+
+    def test_recorre_en_orden_con_empates(self):
+        rol = Rol.objects.create(nombre='Residente')
+        residentes = [Residente.objects.create(usuario=_usuario(rol, f"rp{i}"), tipo='propietario') for i in range(4)]
+        fecha = Usuario.objects.get(pk=residentes[0].usuario_id).fecha_registro
+        Usuario.objects.filter(pk__in=[r.usuario_id for r in residentes[:3]]).update(fecha_registro=fecha)
+
+        ids, url = [], reverse('residente-list-create') + '?limit=1'
+        while url:
+            datos = self.client.get(url).json()
+            ids += [r['id'] for r in datos['results']]
+            url = datos['next']
+
+        esperados = sorted(residentes, key=lambda r: (Usuario.objects.get(pk=r.usuario_id).fecha_registro, r.usuario_id),
+                           reverse=True)
+        self.assertEqual(ids, [str(r.id) for r in esperados])
+
+
+class AutenticacionUnicaTests(TestCase):
+    """El token se verifica una vez por request y el principal sale del cache en las siguientes"""
+
+    def setUp(self):
+        cache.clear()
+        self.usuario = _usuario(Rol.objects.create(nombre='Administrador'), 'au1')
+        ahora = datetime.datetime.now(datetime.timezone.utc)
+        token = jwt.encode({'user_id': str(self.usuario.id), 'jti': 'au1', 'iat': ahora,
+                            'exp': ahora + datetime.timedelta(hours=1)}, settings.JWT_SECRET_KEY, algorithm='HS256')
+        self.cabecera = {'HTTP_AUTHORIZATION': f"Bearer {token}"}
+
+    def test_una_verificacion_y_una_carga(self):
+        with mock.patch('accounts.authentication.jwt.decode', wraps=jwt.decode) as decode, \
+                mock.patch('accounts.principal.cargar_principal', wraps=principal.cargar_principal) as carga:
+            # UsuarioListCreateAPIView.get pasa por JWTAuthentication y por @jwt_auth_required
+            self.assertEqual(self.client.get(reverse('usuario-list-create'), **self.cabecera).status_code, 200)
+            self.assertEqual((decode.call_count, carga.call_count), (1, 1))
+
+            self.assertEqual(self.client.get(reverse('usuario-list-create'), **self.cabecera).status_code, 200)
+            self.assertEqual((decode.call_count, carga.call_count), (2, 1))
+
+
+@override_settings(PASSWORD_HASH_ITERATIONS=20_000)
+class RehashLoginTests(TestCase):
+    """Un login correcto regenera el hash si el costo o el algoritmo quedaron viejos"""
+
+    def setUp(self):
+        self.usuario = _usuario(Rol.objects.create(nombre='Residente'), 'rh1')
+
+    def _login(self, password):
+        return self.client.post(reverse('login'), {'ci': self.usuario.ci, 'password': password})
+
+    def _hash(self):
+        return Usuario.objects.values_list('password', flat=True).get(pk=self.usuario.pk)
+
+    def test_costo_viejo_se_regenera(self):
+        with override_settings(PASSWORD_HASH_ITERATIONS=10_000):
+            Usuario.objects.filter(pk=self.usuario.pk).update(password=make_password('clave'))
+        self.assertTrue(self._hash().startswith('pbkdf2_sha256$10000$'))
+
+        self.assertEqual(self._login('clave').status_code, 200)
+        self.assertTrue(self._hash().startswith('pbkdf2_sha256$20000$'))
+        self.assertTrue(check_password('clave', self._hash()))
+
+    def test_otro_algoritmo_se_regenera(self):
+        Usuario.objects.filter(pk=self.usuario.pk).update(password=make_password('clave', hasher='pbkdf2_sha1'))
+        self.assertEqual(self._login('clave').status_code, 200)
+        self.assertTrue(self._hash().startswith('pbkdf2_sha256$20000$'))
+
+    def test_sin_cambios_ni_con_clave_incorrecta(self):
+        Usuario.objects.filter(pk=self.usuario.pk).update(password=make_password('clave'))
+        actual = self._hash()
+        self.assertEqual(self._login('otra').status_code, 401)
+        self.assertEqual(self._login('clave').status_code, 200)
+        self.assertEqual(self._hash(), actual)
+
+
+class AsignarPermisosTests(TestCase):
+    """PUT roles/<id>/permisos/ reemplaza el conjunto completo en una transacción e invalida una vez"""
+
+    @classmethod
+    def setUpTestData(cls):
+        gestionar, _ = Permiso.objects.get_or_create(nombre=PERMISO_GESTIONAR_ROLES)
+        administrador = Rol.objects.create(nombre='Admin de prueba')
+        RolPermiso.objects.create(rol=administrador, permiso=gestionar)
+        cls.admin = _usuario(administrador, 'ap1')
+        cls.rol = Rol.objects.create(nombre='Guardia')
+        cls.a, cls.b, cls.c = (Permiso.objects.create(nombre=f"permiso_{letra}") for letra in 'abc')
+
+    def setUp(self):
+        RolPermiso.objects.bulk_create([RolPermiso(rol=self.rol, permiso=p) for p in (self.a, self.b)])
+        self.api = APIClient()
+        self.api.force_authenticate(self.admin)
+
+    def _permisos(self):
+        return set(RolPermiso.objects.filter(rol=self.rol).values_list('permiso_id', flat=True))
+
+    def _asignar(self, *permisos):
+        return self.api.put(reverse('rol-permisos-asignar', args=[self.rol.id]),
+                            {'permisos': [str(p) for p in permisos]}, format='json')
+
+    def test_reemplaza_por_diferencia_e_invalida_una_vez(self):
+        with mock.patch('accounts.permissions.invalidar_matriz') as invalidar, \
+                self.captureOnCommitCallbacks(execute=True):
+            response = self._asignar(self.b.id, self.c.id)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual((response.data['agregados'], response.data['quitados']), ([str(self.c.id)], [str(self.a.id)]))
+        self.assertEqual(self._permisos(), {self.b.id, self.c.id})
+        invalidar.assert_called_once_with()
+
+    def test_permiso_inexistente_no_toca_nada(self):
+        response = self._asignar(self.c.id, '00000000-0000-0000-0000-000000000000')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(self._permisos(), {self.a.id, self.b.id})
+
+    def test_falla_a_mitad_revierte_las_altas(self):
+        with mock.patch.object(QuerySet, 'delete', side_effect=DatabaseError), \
+                self.captureOnCommitCallbacks(execute=True) as callbacks:
+            with self.assertRaises(DatabaseError):
+                asignar_permisos(self.rol, {self.b.id, self.c.id})
+        self.assertEqual(self._permisos(), {self.a.id, self.b.id})
+        self.assertEqual(callbacks, [])
+
+
+class CamposDinamicosTests(TestCase):
+    """?fields= y ?expand= recortan la salida y los joins del listado de residentes"""
+
+    @classmethod
+    def setUpTestData(cls):
+        rol = Rol.objects.create(nombre='Residente')
+        for i in range(3):
+            Residente.objects.create(usuario=_usuario(rol, f"cd{i}"), tipo='propietario')
+
+    def _listar(self, consulta=''):
+        with CaptureQueriesContext(connection) as consultas:
+            response = self.client.get(reverse('residente-list-create') + consulta)
+        self.assertEqual(response.status_code, 200)
+        return response.data['results'], [q['sql'] for q in consultas.captured_queries]
+
+    def test_sin_parametros_no_cambia(self):
+        filas, _ = self._listar()
+        self.assertIn('usuario_info', filas[0])
+        self.assertIn('nombre_completo', filas[0])
+
+    def test_fields_sin_joins(self):
+        filas, consultas = self._listar('?fields=id,tipo')
+        self.assertEqual([set(fila) for fila in filas], [{'id', 'tipo'}] * 3)
+        self.assertEqual(len(consultas), 1)
+        self.assertNotIn('JOIN "accounts_rol"', consultas[0])
+
+    def test_expand_en_una_consulta(self):
+        filas, consultas = self._listar('?fields=id&expand=usuario_info')
+        self.assertEqual([set(fila) for fila in filas], [{'id', 'usuario_info'}] * 3)
+        self.assertEqual(len(consultas), 1)
+        self.assertEqual({fila['usuario_info']['ci'] for fila in filas}, {'CI-cd0', 'CI-cd1', 'CI-cd2'})
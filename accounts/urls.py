@@ -1,17 +1,18 @@
 # accounts/urls.py
 from django.urls import path
 from .views import (
-    RolListCreateAPIView, RolDetailAPIView,
+    RolListCreateAPIView, RolDetailAPIView, RolPermisosAsignarAPIView,
     PermisoListCreateAPIView, PermisoDetailAPIView,
     RolPermisoListCreateAPIView, RolPermisoDetailAPIView,
-    UsuarioListCreateAPIView, UsuarioDetailAPIView, UsuarioToggleActivoAPIView,
-    LoginView, ResidenteListCreateAPIView, ResidenteDetailAPIView
+    UsuarioListCreateAPIView, UsuarioDetailAPIView, UsuarioToggleActivoAPIView, UsuarioImportarAPIView,
+    LoginView, LogoutView, ResidenteListCreateAPIView, ResidenteDetailAPIView
 )
 
 urlpatterns = [
     # Rol
     path('roles/', RolListCreateAPIView.as_view(), name='rol-list-create'),
     path('roles/<uuid:pk>/', RolDetailAPIView.as_view(), name='rol-detail'),
+    path('roles/<uuid:pk>/permisos/', RolPermisosAsignarAPIView.as_view(), name='rol-permisos-asignar'),
 
     # Permiso
     path('permisos/', PermisoListCreateAPIView.as_view(), name='permiso-list-create'),
@@ -23,10 +24,12 @@ urlpatterns = [
 
     # Usuario
     path('usuarios/', UsuarioListCreateAPIView.as_view(), name='usuario-list-create'),
+    path('usuarios/importar/', UsuarioImportarAPIView.as_view(), name='usuario-importar'),
     path('usuarios/<uuid:pk>/', UsuarioDetailAPIView.as_view(), name='usuario-detail'),
     path('usuarios/<uuid:pk>/toggle-activo/', UsuarioToggleActivoAPIView.as_view(), name='usuario-toggle-activo'),
     # Login
     path('login/', LoginView.as_view(), name='login'),
+    path('logout/', LogoutView.as_view(), name='logout'),
 
     path('residentes/', ResidenteListCreateAPIView.as_view(), name='residente-list-create'),
     path('residentes/<uuid:pk>/', ResidenteDetailAPIView.as_view(), name='residente-detail'),
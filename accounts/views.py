@@ -6,17 +6,28 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
 from django.shortcuts import get_object_or_404
-from django.contrib.auth.hashers import check_password
+from django.db.models import F
+from django.contrib.auth.hashers import check_password, make_password
 from accounts.models import Usuario
 from accounts.serializers import LoginSerializer
 from utils.auth import jwt_auth_required
+from utils.pagination import PaginacionKeysetMixin
+from utils.condicional import get_condicional
+from accounts.revocation import registrar_estado_usuario, revocar_token
+from accounts.importacion import importar_usuarios
+from accounts.permissions import GESTION_ROLES, TienePermiso, asignar_permisos
 import uuid
 
 from .models import Permiso, Rol, RolPermiso, Usuario, Residente
 from .serializers import PermisoSerializer, RolSerializer, RolPermisoSerializer, UsuarioSerializer, ResidenteSerializer
+from .serializers import RolPermisosAsignacionSerializer
 
 
 class RolListCreateAPIView(APIView):
+    permission_classes = [TienePermiso]
+    permisos_requeridos = GESTION_ROLES
+
+    @get_condicional(Rol)
     def get(self, request):
         roles = Rol.objects.all()
         serializer = RolSerializer(roles, many=True)
@@ -31,6 +42,10 @@ class RolListCreateAPIView(APIView):
 
 
 class RolDetailAPIView(APIView):
+    permission_classes = [TienePermiso]
+    permisos_requeridos = GESTION_ROLES
+
+    @get_condicional(Rol)
     def get(self, request, pk):
         rol = get_object_or_404(Rol, pk=pk)
         serializer = RolSerializer(rol)
@@ -49,6 +64,10 @@ class RolDetailAPIView(APIView):
         rol.delete()
         return Response(status=status.HTTP_204_NO_CONTENT)
 class PermisoListCreateAPIView(APIView):
+    permission_classes = [TienePermiso]
+    permisos_requeridos = GESTION_ROLES
+
+    @get_condicional(Permiso)
     def get(self, request):
         permisos = Permiso.objects.all()
         serializer = PermisoSerializer(permisos, many=True)
@@ -63,6 +82,10 @@ class PermisoListCreateAPIView(APIView):
 
 
 class PermisoDetailAPIView(APIView):
+    permission_classes = [TienePermiso]
+    permisos_requeridos = GESTION_ROLES
+
+    @get_condicional(Permiso)
     def get(self, request, pk):
         permiso = get_object_or_404(Permiso, pk=pk)
         serializer = PermisoSerializer(permiso)
@@ -81,6 +104,9 @@ class PermisoDetailAPIView(APIView):
         permiso.delete()
         return Response(status=status.HTTP_204_NO_CONTENT)
 class RolPermisoListCreateAPIView(APIView):
+    permission_classes = [TienePermiso]
+    permisos_requeridos = GESTION_ROLES
+
     def get(self, request):
         items = RolPermiso.objects.all()
         serializer = RolPermisoSerializer(items, many=True)
@@ -95,6 +121,9 @@ class RolPermisoListCreateAPIView(APIView):
 
 
 class RolPermisoDetailAPIView(APIView):
+    permission_classes = [TienePermiso]
+    permisos_requeridos = GESTION_ROLES
+
     def get(self, request, pk):
         item = get_object_or_404(RolPermiso, pk=pk)
         serializer = RolPermisoSerializer(item)
@@ -113,10 +142,38 @@ class RolPermisoDetailAPIView(APIView):
         item.delete()
         return Response(status=status.HTTP_204_NO_CONTENT)
 
+class RolPermisosAsignarAPIView(APIView):
+    """
+    GET: permisos actuales del rol
+    PUT: {"permisos": [<uuid>, ...]} reemplaza el conjunto completo (altas y bajas por diferencia)
+    """
+    permission_classes = [TienePermiso]
+    permisos_requeridos = GESTION_ROLES
+
+    def get(self, request, pk):
+        rol = get_object_or_404(Rol, pk=pk)
+        permisos = Permiso.objects.filter(rol_permisos__rol=rol)
+        serializer = PermisoSerializer(permisos, many=True)
+        return Response(serializer.data)
+
+    def put(self, request, pk):
+        rol = get_object_or_404(Rol, pk=pk)
+        serializer = RolPermisosAsignacionSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        agregados, quitados = asignar_permisos(rol, serializer.validated_data['permisos'])
+        return Response({
+            "rol": str(rol.id),
+            "agregados": [str(i) for i in agregados],
+            "quitados": [str(i) for i in quitados],
+            "permisos": [str(i) for i in serializer.validated_data['permisos']],
+        })
+
 class UsuarioDetailAPIView(APIView):
     def get(self, request, pk):
-        usuario = get_object_or_404(Usuario, pk=pk)
-        serializer = UsuarioSerializer(usuario)
+        usuario = get_object_or_404(UsuarioSerializer.preparar_queryset(Usuario.objects.all(), request), pk=pk)
+        serializer = UsuarioSerializer(usuario, context={'request': request})
         return Response(serializer.data)
 
     def patch(self, request, pk):
@@ -133,6 +190,7 @@ class UsuarioToggleActivoAPIView(APIView):
         usuario = get_object_or_404(Usuario, pk=pk)
         usuario.esta_activo = not usuario.esta_activo
         usuario.save()
+        registrar_estado_usuario(usuario)
         return Response({
             "id": str(usuario.id),
             "correo": usuario.correo,
@@ -152,22 +210,31 @@ class LoginView(APIView):
         password = serializer.validated_data['password']
 
         try:
-            usuario = Usuario.objects.get(ci=ci)
+            # Usuario + rol en una sola consulta
+            usuario = Usuario.objects.select_related('rol').get(ci=ci)
         except Usuario.DoesNotExist:
             return Response({"detail": "Credenciales inválidas"}, status=status.HTTP_401_UNAUTHORIZED)
 
         if not usuario.esta_activo:
             return Response({"detail": "Usuario deshabilitado"}, status=status.HTTP_403_FORBIDDEN)
 
-        if not check_password(password, usuario.password):
+        def rehash(raw_password):
+            # Si el hash quedó con otro costo/algoritmo se regenera sin un save() completo
+            usuario.password = make_password(raw_password)
+            Usuario.objects.filter(pk=usuario.pk).update(password=usuario.password)
+
+        if not check_password(password, usuario.password, setter=rehash):
             return Response({"detail": "Credenciales inválidas"}, status=status.HTTP_401_UNAUTHORIZED)
 
         # Creamos el JWT
+        ahora = datetime.datetime.now(datetime.timezone.utc)
         payload = {
             "user_id": str(usuario.id),
             "ci": usuario.ci,
             "rol": usuario.rol.nombre,
-            "exp": datetime.datetime.utcnow() + datetime.timedelta(seconds=settings.JWT_EXP_DELTA_SECONDS)
+            "jti": uuid.uuid4().hex,  # Permite revocar este token puntualmente
+            "iat": ahora,
+            "exp": ahora + datetime.timedelta(seconds=settings.JWT_EXP_DELTA_SECONDS)
         }
         token = jwt.encode(payload, settings.JWT_SECRET_KEY, algorithm='HS256')
 
@@ -180,13 +247,19 @@ class LoginView(APIView):
             "rol": usuario.rol.nombre
         })
 
-class UsuarioListCreateAPIView(APIView):
+class LogoutView(APIView):
+    @jwt_auth_required
+    def post(self, request):
+        revocar_token(request.auth)
+        return Response({"detail": "Sesión cerrada"})
+
+class UsuarioListCreateAPIView(PaginacionKeysetMixin, APIView):
+    ordering_paginacion = ('-fecha_registro', '-id')
 
     @jwt_auth_required
     def get(self, request):
-        usuarios = Usuario.objects.all()
-        serializer = UsuarioSerializer(usuarios, many=True)
-        return Response(serializer.data)
+        usuarios = UsuarioSerializer.preparar_queryset(Usuario.objects.all(), request)
+        return self.paginar(usuarios, UsuarioSerializer, context={'request': request})
 
     @jwt_auth_required
     def post(self, request):
@@ -199,11 +272,40 @@ class UsuarioListCreateAPIView(APIView):
 #implementar @jwt_auth_required cuando el seeder este listo en todo
 
 
-class ResidenteListCreateAPIView(APIView):
+class UsuarioImportarAPIView(APIView):
+    """
+    Alta masiva de usuarios (+ residentes) desde un archivo CSV o NDJSON.
+    multipart: archivo=<archivo>, formato=csv|ndjson (por defecto según la extensión)
+    """
+    @jwt_auth_required
+    def post(self, request):
+        archivo = request.FILES.get('archivo')
+        if not archivo:
+            return Response({"error": "Debe enviar un archivo en el campo 'archivo'"}, status=status.HTTP_400_BAD_REQUEST)
+
+        formato = request.data.get('formato')
+        if not formato:
+            formato = 'ndjson' if archivo.name.endswith(('.ndjson', '.jsonl')) else 'csv'
+        if formato not in ('csv', 'ndjson'):
+            return Response({"error": "Formato no soportado. Use csv o ndjson"}, status=status.HTTP_400_BAD_REQUEST)
+
+        # Se lee línea a línea: el archivo nunca se carga completo en memoria
+        lineas = (linea.decode('utf-8-sig') for linea in archivo)
+        reporte = importar_usuarios(lineas, formato)
+
+        codigo = status.HTTP_201_CREATED if reporte['creados'] else status.HTTP_400_BAD_REQUEST
+        return Response(reporte, status=codigo)
+
+
+class ResidenteListCreateAPIView(PaginacionKeysetMixin, APIView):
+    # El id es un UUID: se pagina en el orden del listado de usuarios (índice usuario_fecha_registro_idx)
+    ordering_paginacion = ('-fecha_registro', '-usuario_id')
+
     def get(self, request):
-        residentes = Residente.objects.all()
-        serializer = ResidenteSerializer(residentes, many=True)
-        return Response(serializer.data)
+        residentes = ResidenteSerializer.preparar_queryset(
+            Residente.objects.annotate(fecha_registro=F('usuario__fecha_registro')), request
+        )
+        return self.paginar(residentes, ResidenteSerializer, context={'request': request})
 
     def post(self, request):
         serializer = ResidenteSerializer(data=request.data)
@@ -214,8 +316,8 @@ class ResidenteListCreateAPIView(APIView):
 
 class ResidenteDetailAPIView(APIView):
     def get(self, request, pk):
-        residente = get_object_or_404(Residente, pk=pk)
-        serializer = ResidenteSerializer(residente)
+        residente = get_object_or_404(ResidenteSerializer.preparar_queryset(Residente.objects.all(), request), pk=pk)
+        serializer = ResidenteSerializer(residente, context={'request': request})
         return Response(serializer.data)
 
     def patch(self, request, pk):
@@ -36,6 +36,7 @@ INSTALLED_APPS = [
     #NECESARIAS
     'django.contrib.auth',
     'django.contrib.contenttypes',
+    'django.contrib.postgres',
     'corsheaders',
     'rest_framework',
     'accounts',
@@ -93,6 +94,32 @@ DATABASES = {
 
 AUTH_PASSWORD_VALIDATORS = []
 
+# El primer hasher es el preferido; los hashes con otro costo/algoritmo se regeneran al hacer login
+PASSWORD_HASHERS = [
+    'accounts.hashers.PBKDF2ConfigurableHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'django.contrib.auth.hashers.ScryptPasswordHasher',
+]
+
+PASSWORD_HASH_ITERATIONS = config('PASSWORD_HASH_ITERATIONS', default=1_000_000, cast=int)
+
+# Paginación keyset de los listados: tamaño por defecto y máximo permitido con ?limit=
+PAGINACION_TAMANO = config('PAGINACION_TAMANO', default=50, cast=int)
+PAGINACION_MAXIMO = config('PAGINACION_MAXIMO', default=200, cast=int)
+
+# Importación masiva de usuarios: filas por lote e hilos para hashear contraseñas
+IMPORTACION_TAMANO_LOTE = config('IMPORTACION_TAMANO_LOTE', default=500, cast=int)
+IMPORTACION_HILOS_HASH = config('IMPORTACION_HILOS_HASH', default=4, cast=int)
+# Costo PBKDF2 de las contraseñas importadas (miles de filas dentro de la request). El hasher
+# las marca con must_update() y el primer login correcto las regenera con PASSWORD_HASH_ITERATIONS.
+IMPORTACION_HASH_ITERATIONS = config('IMPORTACION_HASH_ITERATIONS', default=5_000, cast=int)
+
+# Máximo de habitantes por alta en lote (un grupo familiar) en residencias/<id>/habitantes/lote/
+HABITANTES_LOTE_MAXIMO = config('HABITANTES_LOTE_MAXIMO', default=30, cast=int)
+
+# Directorio para guardias: cada página trae offset + limit filas por fuente, así que el offset tiene tope
+DIRECTORIO_OFFSET_MAXIMO = config('DIRECTORIO_OFFSET_MAXIMO', default=200, cast=int)
+
 
 # Internationalization
 # https://docs.djangoproject.com/en/5.2/topics/i18n/
@@ -118,6 +145,49 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 JWT_SECRET_KEY = config("JWT_SECRET_KEY", default="s3cr3t_cl4v3_muylargaysegura")
 JWT_EXP_DELTA_SECONDS = 60 * 60 * 24  # 1 día
+
+# Cache: 'default' guarda datos materializados (LocMem por proceso, o Redis/Memcached); 'versiones'
+# guarda las claves de versión (ETag, matriz de permisos, jerarquía, disponibilidad, ocupación) y debe
+# verse igual en todos los workers: por defecto es una tabla de la base (accounts 0005 la crea).
+# Si 'versiones' fuera local al proceso, el check utils.W001 avisa y el GET condicional se desactiva.
+CACHES = {
+    'default': {
+        'BACKEND': config('CACHE_BACKEND', default='django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': config('CACHE_LOCATION', default=''),
+    },
+    'versiones': {
+        'BACKEND': config('VERSION_CACHE_BACKEND', default='django.core.cache.backends.db.DatabaseCache'),
+        'LOCATION': config('VERSION_CACHE_LOCATION', default='cache_versiones'),
+        'OPTIONS': {'MAX_ENTRIES': config('VERSION_CACHE_MAX_ENTRIES', default=10_000, cast=int)},
+    },
+}
+
+# Vida de las claves de versión. Al vencer se genera una versión nueva: los clientes revalidan una
+# vez de más, nunca reciben un 304 equivocado.
+VERSION_CACHE_TTL = config('VERSION_CACHE_TTL', default=300, cast=int)
+
+# Segundos que vive en cache el principal autenticado (usuario + rol + residente + residencia activa)
+PRINCIPAL_CACHE_TTL = config('PRINCIPAL_CACHE_TTL', default=30, cast=int)
+
+# Tope de vida del tablero de ocupación; normalmente se invalida antes, al cambiar una Unidad
+OCUPACION_CACHE_TTL = config('OCUPACION_CACHE_TTL', default=3600, cast=int)
+
+# Vida en cache de cada versión del árbol edificio -> piso -> unidades
+JERARQUIA_CACHE_TTL = config('JERARQUIA_CACHE_TTL', default=86400, cast=int)
+
+# Disponibilidad de áreas comunes: vida en cache (se invalida antes al cambiar una reserva) y rango máximo
+DISPONIBILIDAD_CACHE_TTL = config('DISPONIBILIDAD_CACHE_TTL', default=3600, cast=int)
+DISPONIBILIDAD_DIAS_MAXIMO = config('DISPONIBILIDAD_DIAS_MAXIMO', default=62, cast=int)
+
+# Máximo de ocurrencias de una serie de reservas recurrentes (un año semanal = 53)
+RESERVAS_SERIE_MAXIMO = config('RESERVAS_SERIE_MAXIMO', default=60, cast=int)
+
+# Cada cuántos segundos un worker relee (incrementalmente) la tabla de revocaciones
+REVOCACION_REFRESH_SECONDS = config('REVOCACION_REFRESH_SECONDS', default=5, cast=int)
+# Los ids no se confirman en orden: cada refresco relee esta cantidad de ids por debajo del último
+# leído y cada REVOCACION_RECONSTRUIR_SECONDS se reconstruye la lista completa (tope de atraso)
+REVOCACION_VENTANA_IDS = config('REVOCACION_VENTANA_IDS', default=1000, cast=int)
+REVOCACION_RECONSTRUIR_SECONDS = config('REVOCACION_RECONSTRUIR_SECONDS', default=300, cast=int)
 # api/settings.py
 
 # CORS configuration
@@ -4,3 +4,12 @@ from django.apps import AppConfig
 class CondominioConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'condominio'
+
+    def ready(self):
+        # Registra las señales que invalidan el tablero de ocupación, versionan la jerarquía,
+        # mantienen el contador de ocupantes y versionan la disponibilidad de las áreas comunes
+        from . import ocupacion, jerarquia, ocupantes, disponibilidad  # noqa: F401
+
+        # Versiones para GET condicional (ETag / Last-Modified) de los catálogos
+        from utils.versiones import versionar_modelos
+        versionar_modelos(self.get_model('Unidad'), self.get_model('AreaComun'))
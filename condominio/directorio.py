@@ -0,0 +1,64 @@
+# condominio/directorio.py
+from django.contrib.postgres.search import TrigramWordSimilarity
+from django.db.models import F, Q, OuterRef, Subquery, Value
+from django.db.models.functions import Greatest
+
+from accounts.models import Usuario
+from .models import Residencia, Habitante
+
+
+def _score(q, *campos):
+    return Greatest(*[TrigramWordSimilarity(q, campo) for campo in campos])
+
+
+def buscar_directorio(q, limit=20, offset=0):
+    """
+    Busca residentes (Usuario con Residente) y habitantes activos por coincidencia
+    parcial en nombre, apellido, CI o correo. Los filtros icontains usan los índices
+    de trigramas sobre UPPER(campo); el ranking es por similitud de palabra.
+    Devuelve (resultados, hay_mas).
+    """
+    tope = offset + limit + 1  # +1 para saber si hay otra página
+
+    unidad_activa = Residencia.objects.filter(
+        residente__usuario=OuterRef('pk'), esta_activa=True
+    ).values('unidad__codigo')[:1]
+
+    residentes = (
+        Usuario.objects
+        .filter(residente__isnull=False)
+        .filter(
+            Q(nombre__icontains=q) | Q(apellido__icontains=q) |
+            Q(ci__icontains=q) | Q(correo__icontains=q)
+        )
+        .annotate(
+            score=_score(q, 'nombre', 'apellido', 'ci', 'correo'),
+            tipo=Value('residente'),
+            residente_id=F('residente__id'),
+            unidad_codigo=Subquery(unidad_activa),
+        )
+        .order_by('-score', 'apellido', 'nombre')
+        .values('tipo', 'residente_id', 'nombre', 'apellido', 'ci', 'correo', 'unidad_codigo', 'score')
+        [:tope]
+    )
+
+    habitantes = (
+        Habitante.objects
+        .filter(esta_activo=True)
+        .filter(Q(nombre__icontains=q) | Q(apellido__icontains=q) | Q(ci__icontains=q))
+        .annotate(
+            score=_score(q, 'nombre', 'apellido', 'ci'),
+            tipo=Value('habitante'),
+            unidad_codigo=F('residencia__unidad__codigo'),
+        )
+        .order_by('-score', 'apellido', 'nombre')
+        .values('tipo', 'id', 'residencia_id', 'nombre', 'apellido', 'ci', 'correo', 'unidad_codigo', 'score')
+        [:tope]
+    )
+
+    resultados = sorted(
+        [*residentes, *habitantes],
+        key=lambda r: (-r['score'], r['apellido'], r['nombre']),
+    )
+    pagina = resultados[offset:offset + limit]
+    return pagina, len(resultados) > offset + limit
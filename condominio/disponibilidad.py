@@ -0,0 +1,176 @@
+# condominio/disponibilidad.py
+import uuid
+from datetime import time, timedelta
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_init, post_save, post_delete
+from django.dispatch import receiver
+from django.utils import timezone
+
+from utils.versiones import cache_versiones
+from .models import AreaComun, ReservaAreaComun
+
+
+# Campos de ReservaAreaComun que mueven los huecos libres; cambios en otros campos no invalidan
+CAMPOS_RESERVA = ('area_comun_id', 'fecha', 'hora_inicio', 'hora_fin', 'estado')
+
+# Campos de AreaComun que van en la respuesta cacheada (el horario además recorta los intervalos
+# y con estado/esta_activa se decide si el área admite reservas)
+CAMPOS_AREA = ('nombre', 'estado', 'esta_activa', 'hora_apertura', 'hora_cierre')
+
+
+def _version_key(area_id):
+    return f"areas:disponibilidad:{area_id}:version"
+
+
+def version_disponibilidad(area_id):
+    """Versión del área compartida entre workers; si se pierde del cache se genera una nueva"""
+    key = _version_key(area_id)
+    version = cache_versiones.get(key)
+    if version is None:
+        version = uuid.uuid4().hex
+        cache_versiones.add(key, version, settings.VERSION_CACHE_TTL)
+        version = cache_versiones.get(key, version)
+    return version
+
+
+def invalidar_disponibilidad(area_id):
+    """Publica una versión nueva del área; las disponibilidades anteriores dejan de servirse"""
+    if area_id:
+        cache_versiones.set(_version_key(area_id), uuid.uuid4().hex, settings.VERSION_CACHE_TTL)
+
+
+def intervalos_libres(ocupados, apertura, cierre):
+    """
+    Huecos de [apertura, cierre) que no cubre ningún intervalo de `ocupados`
+    (lista de (inicio, fin) ordenada por inicio). Un solo recorrido.
+    """
+    libres = []
+    cursor = apertura
+    for inicio, fin in ocupados:
+        if inicio >= cierre:
+            break
+        if inicio > cursor:
+            libres.append((cursor, inicio))
+        if fin > cursor:
+            cursor = fin
+        if cursor >= cierre:
+            break
+    if cursor < cierre:
+        libres.append((cursor, cierre))
+    return libres
+
+
+def calcular_disponibilidad(area, desde, hasta):
+    """
+    Intervalos libres por día de `area` entre `desde` y `hasta` (inclusive), recortados
+    al horario de funcionamiento. Una consulta: las reservas activas del rango, ordenadas.
+    Un área en mantenimiento o desactivada no tiene huecos libres.
+    """
+    reservable = area.esta_activa and area.estado == 'disponible'
+    ocupados = {}
+    reservas = (
+        ReservaAreaComun.objects
+        .filter(
+            area_comun=area,
+            fecha__range=(desde, hasta),
+            estado__in=ReservaAreaComun.ESTADOS_ACTIVOS,
+        )
+        .order_by('fecha', 'hora_inicio')
+        .values_list('fecha', 'hora_inicio', 'hora_fin')
+    )
+    for fecha, inicio, fin in (reservas if reservable else ()):
+        ocupados.setdefault(fecha, []).append((inicio, fin))
+
+    dias = []
+    fecha = desde
+    while fecha <= hasta:
+        libres = intervalos_libres(ocupados.get(fecha, []), area.hora_apertura, area.hora_cierre) if reservable else []
+        dias.append({
+            "fecha": fecha.isoformat(),
+            "libres": [{"hora_inicio": inicio.isoformat(), "hora_fin": fin.isoformat()} for inicio, fin in libres],
+        })
+        fecha += timedelta(days=1)
+
+    return {
+        "area_comun": area.id,
+        "nombre": area.nombre,
+        "estado": area.estado,
+        "reservable": reservable,
+        "hora_apertura": area.hora_apertura.isoformat(),
+        "hora_cierre": area.hora_cierre.isoformat(),
+        "desde": desde.isoformat(),
+        "hasta": hasta.isoformat(),
+        "dias": dias,
+    }
+
+
+def recortar_al_presente(disponibilidad, ahora):
+    """Quita los huecos que ya pasaron: los de días anteriores a hoy y, hoy, lo previo a `ahora`"""
+    hoy = ahora.date().isoformat()
+    hora_actual = ahora.time().replace(microsecond=0)
+    dias = []
+    for dia in disponibilidad["dias"]:
+        libres = dia["libres"]
+        if dia["fecha"] < hoy:
+            libres = []
+        elif dia["fecha"] == hoy:
+            libres = [
+                {"hora_inicio": max(time.fromisoformat(hueco["hora_inicio"]), hora_actual).isoformat(),
+                 "hora_fin": hueco["hora_fin"]}
+                for hueco in libres if time.fromisoformat(hueco["hora_fin"]) > hora_actual
+            ]
+        dias.append({**dia, "libres": libres})
+    return {**disponibilidad, "dias": dias}
+
+
+def obtener_disponibilidad(area, desde, hasta, ahora=None):
+    """
+    Desde cache mientras no cambie ninguna reserva ni los datos del área que se muestran.
+    Se cachea sin recortar y se recorta a la hora actual en cada respuesta.
+    """
+    key = f"areas:disponibilidad:{area.id}:{version_disponibilidad(area.id)}:{desde}:{hasta}"
+    disponibilidad = cache.get(key)
+    if disponibilidad is None:
+        disponibilidad = calcular_disponibilidad(area, desde, hasta)
+        cache.set(key, disponibilidad, settings.DISPONIBILIDAD_CACHE_TTL)
+    return recortar_al_presente(disponibilidad, ahora or timezone.localtime())
+
+
+def _snapshot(instance, campos):
+    return tuple(instance.__dict__.get(campo) for campo in campos)
+
+
+# Señales: se recuerda lo cargado para invalidar solo si cambió algo que afecta los huecos
+@receiver(post_init, sender=ReservaAreaComun)
+def recordar_reserva(sender, instance, **kwargs):
+    instance._disponibilidad_previa = _snapshot(instance, CAMPOS_RESERVA)
+
+
+@receiver(post_save, sender=ReservaAreaComun)
+def invalidar_por_reserva(sender, instance, created, **kwargs):
+    previa = instance._disponibilidad_previa
+    actual = _snapshot(instance, CAMPOS_RESERVA)
+    if created or actual != previa:
+        for area_id in {previa[0], actual[0]}:
+            transaction.on_commit(lambda area_id=area_id: invalidar_disponibilidad(area_id))
+    instance._disponibilidad_previa = actual
+
+
+@receiver(post_delete, sender=ReservaAreaComun)
+def invalidar_por_borrado(sender, instance, **kwargs):
+    transaction.on_commit(lambda: invalidar_disponibilidad(instance.area_comun_id))
+
+
+@receiver(post_init, sender=AreaComun)
+def recordar_area(sender, instance, **kwargs):
+    instance._area_previa = _snapshot(instance, CAMPOS_AREA)
+
+
+@receiver(post_save, sender=AreaComun)
+def invalidar_por_area(sender, instance, created, **kwargs):
+    actual = _snapshot(instance, CAMPOS_AREA)
+    if not created and actual != instance._area_previa:
+        transaction.on_commit(lambda: invalidar_disponibilidad(instance.pk))
+    instance._area_previa = actual
@@ -0,0 +1,139 @@
+# condominio/importacion.py
+import json
+from collections import defaultdict
+from django.conf import settings
+from django.db import IntegrityError, transaction
+
+from accounts.importacion import leer_filas
+from utils.lotes import lotes
+from utils.versiones import registrar_cambio_coleccion
+from .models import Unidad
+from .serializers import UnidadImportacionSerializer
+from .ocupacion import invalidar_ocupacion
+from .jerarquia import invalidar_jerarquia
+
+
+FORMATOS = ('csv', 'ndjson', 'json')
+
+
+def leer_filas_unidades(lineas, formato='csv'):
+    """Como accounts.importacion.leer_filas, más 'json': un arreglo de objetos"""
+    if formato != 'json':
+        yield from leer_filas(lineas, formato)
+        return
+    try:
+        filas = json.loads(''.join(lineas))
+    except json.JSONDecodeError as e:
+        yield 1, {'__error__': f"JSON inválido: {e.msg}"}
+        return
+    if not isinstance(filas, list):
+        yield 1, {'__error__': "Se esperaba un arreglo JSON de unidades"}
+        return
+    yield from enumerate(filas, start=1)
+
+
+class ImportadorUnidades:
+    """
+    Importación masiva de Unidad por lotes:
+    - valida formato sin consultas (UnidadImportacionSerializer)
+    - aplica las reglas por tipo de Unidad.clean sobre el lote agrupado por tipo
+    - detecta codigo repetido en el archivo (memoria) y en la base (una consulta por lote)
+    - inserta con bulk_create dentro de una transacción por lote
+    """
+    def __init__(self, tamano_lote=None):
+        self.tamano_lote = tamano_lote or settings.IMPORTACION_TAMANO_LOTE
+        self.codigos_vistos = set()
+        self.creados = 0
+        self.errores = []
+
+    def importar(self, lineas, formato='csv'):
+        for lote in lotes(leer_filas_unidades(lineas, formato), self.tamano_lote):
+            self._procesar_lote(lote)
+
+        if self.creados:
+            # bulk_create no dispara señales: se invalidan a mano las vistas derivadas de Unidad
+            transaction.on_commit(invalidar_ocupacion)
+            transaction.on_commit(invalidar_jerarquia)
+            transaction.on_commit(lambda: registrar_cambio_coleccion(Unidad))
+        return {
+            "creados": self.creados,
+            "con_errores": len(self.errores),
+            "errores": sorted(self.errores, key=lambda e: e['fila']),
+        }
+
+    def _error(self, numero, errores):
+        self.errores.append({"fila": numero, "errores": errores})
+
+    def _validar_formato(self, lote):
+        validas = []
+        for numero, fila in lote:
+            if isinstance(fila, dict) and '__error__' in fila:
+                self._error(numero, {"fila": [fila['__error__']]})
+                continue
+            serializer = UnidadImportacionSerializer(data=fila)
+            if not serializer.is_valid():
+                self._error(numero, serializer.errors)
+                continue
+            validas.append((numero, serializer.validated_data))
+        return validas
+
+    def _validar_reglas_por_tipo(self, validas):
+        """Reglas de Unidad.clean aplicadas a todas las filas de cada tipo de una vez"""
+        por_tipo = defaultdict(list)
+        for numero, datos in validas:
+            por_tipo[datos['tipo_unidad']].append((numero, datos))
+
+        con_error = set()
+        for tipo, filas in por_tipo.items():
+            if tipo not in Unidad.CAMPOS_OBLIGATORIOS_POR_TIPO and tipo not in Unidad.CAMPOS_PROHIBIDOS_POR_TIPO:
+                continue  # tipos sin reglas: nada que revisar
+            for numero, datos in filas:
+                errores = Unidad.errores_por_tipo(tipo, datos)
+                if errores:
+                    self._error(numero, {"tipo_unidad": errores})
+                    con_error.add(numero)
+        return [(numero, datos) for numero, datos in validas if numero not in con_error]
+
+    def _procesar_lote(self, lote):
+        validas = self._validar_reglas_por_tipo(self._validar_formato(lote))
+
+        # Duplicados dentro del mismo archivo
+        filas = []
+        for numero, datos in validas:
+            if datos['codigo'] in self.codigos_vistos:
+                self._error(numero, {"codigo": ["Código repetido en el archivo"]})
+                continue
+            self.codigos_vistos.add(datos['codigo'])
+            filas.append((numero, datos))
+
+        if not filas:
+            return
+
+        # Duplicados contra la base: una sola consulta por lote
+        existentes = set(
+            Unidad.objects.filter(codigo__in=[datos['codigo'] for _, datos in filas])
+            .values_list('codigo', flat=True)
+        )
+        nuevas = []
+        for numero, datos in filas:
+            if datos['codigo'] in existentes:
+                self._error(numero, {"codigo": ["Ya existe una unidad con este código"]})
+            else:
+                nuevas.append((numero, datos))
+
+        if not nuevas:
+            return
+
+        try:
+            with transaction.atomic():
+                Unidad.objects.bulk_create([Unidad(**datos) for _, datos in nuevas])
+        except IntegrityError:
+            # Otro proceso insertó el mismo codigo entre la verificación y el insert
+            for numero, _ in nuevas:
+                self._error(numero, {"fila": ["Conflicto de unicidad al insertar el lote; reintente la fila"]})
+            return
+        self.creados += len(nuevas)
+
+
+def importar_unidades(lineas, formato='csv', tamano_lote=None):
+    return ImportadorUnidades(tamano_lote=tamano_lote).importar(lineas, formato)
@@ -0,0 +1,126 @@
+# condominio/jerarquia.py
+import json
+import re
+import uuid
+from collections import Counter
+from itertools import groupby
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_init, post_save, post_delete
+from django.dispatch import receiver
+
+from utils.versiones import cache_versiones
+from .models import Unidad
+
+
+JERARQUIA_VERSION_KEY = "unidades:jerarquia:version"
+
+# Campos de Unidad que aparecen en el árbol; cambios en otros campos no generan versión nueva
+CAMPOS_JERARQUIA = ('codigo', 'nombre', 'edificio', 'piso', 'numero', 'tipo_unidad', 'estado', 'esta_activa')
+
+# Árbol materializado de este proceso: (version, json_bytes)
+_arbol = None
+
+
+def version_jerarquia():
+    """Versión compartida entre workers; si se pierde del cache se genera una nueva"""
+    version = cache_versiones.get(JERARQUIA_VERSION_KEY)
+    if version is None:
+        version = uuid.uuid4().hex
+        cache_versiones.add(JERARQUIA_VERSION_KEY, version, settings.VERSION_CACHE_TTL)
+        version = cache_versiones.get(JERARQUIA_VERSION_KEY, version)
+    return version
+
+
+def invalidar_jerarquia():
+    """Publica una versión nueva; los árboles anteriores dejan de servirse"""
+    cache_versiones.set(JERARQUIA_VERSION_KEY, uuid.uuid4().hex, settings.VERSION_CACHE_TTL)
+
+
+def _orden_natural(valor):
+    """'2' < '10' y las unidades sin edificio/piso al final"""
+    if valor is None or valor == '':
+        return (1, [])
+    return (0, [(0, int(p), '') if p.isdigit() else (1, 0, p.lower()) for p in re.split(r'(\d+)', valor) if p])
+
+
+def _conteos(unidades):
+    por_estado = Counter(u['estado'] for u in unidades)
+    return {"total": len(unidades), "por_estado": dict(por_estado)}
+
+
+def construir_jerarquia():
+    """
+    Árbol edificio -> piso -> unidades (solo unidades activas) con conteos por nodo,
+    armado con UNA consulta.
+    """
+    unidades = sorted(
+        Unidad.objects.filter(esta_activa=True).values(
+            'id', 'codigo', 'nombre', 'edificio', 'piso', 'numero', 'tipo_unidad', 'estado'
+        ),
+        key=lambda u: (
+            _orden_natural(u['edificio']), _orden_natural(u['piso']),
+            _orden_natural(u['numero']), u['codigo'],
+        ),
+    )
+
+    edificios = []
+    for edificio, grupo_edificio in groupby(unidades, key=lambda u: u['edificio'] or None):
+        grupo_edificio = list(grupo_edificio)
+        pisos = []
+        for piso, grupo_piso in groupby(grupo_edificio, key=lambda u: u['piso'] or None):
+            grupo_piso = list(grupo_piso)
+            pisos.append({
+                "piso": piso,
+                **_conteos(grupo_piso),
+                "unidades": [
+                    {campo: u[campo] for campo in ('id', 'codigo', 'nombre', 'numero', 'tipo_unidad', 'estado')}
+                    for u in grupo_piso
+                ],
+            })
+        edificios.append({"edificio": edificio, **_conteos(grupo_edificio), "pisos": pisos})
+
+    return {**_conteos(unidades), "edificios": edificios}
+
+
+def obtener_jerarquia(version=None):
+    """
+    Devuelve (version, json_bytes). Se sirve desde memoria del proceso o desde el
+    cache compartido; solo se reconstruye cuando cambia la versión.
+    """
+    global _arbol
+    version = version or version_jerarquia()
+    if _arbol is not None and _arbol[0] == version:
+        return _arbol
+
+    key = f"{JERARQUIA_VERSION_KEY}:{version}"
+    contenido = cache.get(key)
+    if contenido is None:
+        contenido = json.dumps(construir_jerarquia(), ensure_ascii=False).encode('utf-8')
+        cache.set(key, contenido, settings.JERARQUIA_CACHE_TTL)
+    _arbol = (version, contenido)
+    return _arbol
+
+
+def _snapshot(unidad):
+    return tuple(unidad.__dict__.get(campo) for campo in CAMPOS_JERARQUIA)
+
+
+# Señales: se recuerda lo cargado para versionar solo si cambió algo que muestra el árbol
+@receiver(post_init, sender=Unidad)
+def recordar_unidad(sender, instance, **kwargs):
+    instance._jerarquia_previa = _snapshot(instance)
+
+
+@receiver(post_save, sender=Unidad)
+def versionar_por_unidad(sender, instance, created, **kwargs):
+    actual = _snapshot(instance)
+    if created or actual != instance._jerarquia_previa:
+        transaction.on_commit(invalidar_jerarquia)
+    instance._jerarquia_previa = actual
+
+
+@receiver(post_delete, sender=Unidad)
+def versionar_por_borrado(sender, instance, **kwargs):
+    transaction.on_commit(invalidar_jerarquia)
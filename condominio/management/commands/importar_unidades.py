@@ -0,0 +1,41 @@
+#condominio/management/commands/importar_unidades.py
+from django.core.management.base import BaseCommand, CommandError
+from condominio.importacion import importar_unidades, FORMATOS
+
+class Command(BaseCommand):
+    help = 'Importa unidades en lote desde un archivo CSV, NDJSON o JSON'
+
+    def add_arguments(self, parser):
+        parser.add_argument('ruta', type=str, help='Ruta del archivo a importar')
+        parser.add_argument(
+            '--formato',
+            choices=FORMATOS,
+            help='Formato del archivo (por defecto según la extensión)',
+        )
+        parser.add_argument(
+            '--lote',
+            type=int,
+            help='Filas por lote (por defecto IMPORTACION_TAMANO_LOTE)',
+        )
+
+    def handle(self, *args, **options):
+        ruta = options['ruta']
+        formato = options['formato']
+        if not formato:
+            if ruta.endswith(('.ndjson', '.jsonl')):
+                formato = 'ndjson'
+            elif ruta.endswith('.json'):
+                formato = 'json'
+            else:
+                formato = 'csv'
+
+        try:
+            with open(ruta, encoding='utf-8-sig', newline='') as archivo:
+                reporte = importar_unidades(archivo, formato, tamano_lote=options['lote'])
+        except OSError as e:
+            raise CommandError(f"No se pudo leer {ruta}: {e}")
+
+        self.stdout.write(self.style.SUCCESS(f" Unidades creadas: {reporte['creados']}"))
+        self.stdout.write(f" Filas con errores: {reporte['con_errores']}")
+        for error in reporte['errores']:
+            self.stdout.write(self.style.ERROR(f"  - Fila {error['fila']}: {error['errores']}"))
@@ -0,0 +1,27 @@
+#condominio/management/commands/reconciliar_ocupantes.py
+from django.core.management.base import BaseCommand
+from condominio.ocupantes import reconciliar_ocupantes
+
+class Command(BaseCommand):
+    help = 'Recalcula Residencia.cantidad_ocupantes a partir de los habitantes activos'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Solo informa las residencias desviadas, sin corregirlas',
+        )
+
+    def handle(self, *args, **options):
+        desviadas = reconciliar_ocupantes(aplicar=not options['dry_run'])
+
+        if not desviadas:
+            self.stdout.write(self.style.SUCCESS(" Todos los contadores están al día"))
+            return
+
+        accion = "a corregir" if options['dry_run'] else "corregidas"
+        self.stdout.write(self.style.WARNING(f" Residencias {accion}: {len(desviadas)}"))
+        for residencia in desviadas:
+            self.stdout.write(
+                f"  - Residencia {residencia['id']}: {residencia['cantidad_ocupantes']} → {residencia['real']}"
+            )
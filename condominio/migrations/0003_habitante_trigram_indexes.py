@@ -0,0 +1,28 @@
+# Generated by Django 5.2.6 on 2026-10-18 05:54
+
+import django.contrib.postgres.indexes
+import django.db.models.functions.text
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0003_usuario_trigram_indexes'),
+        ('condominio', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='habitante',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('nombre'), name='gin_trgm_ops'), name='habitante_nombre_trgm'),
+        ),
+        migrations.AddIndex(
+            model_name='habitante',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('apellido'), name='gin_trgm_ops'), name='habitante_apellido_trgm'),
+        ),
+        migrations.AddIndex(
+            model_name='habitante',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('ci'), name='gin_trgm_ops'), name='habitante_ci_trgm'),
+        ),
+    ]
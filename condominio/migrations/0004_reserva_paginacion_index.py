@@ -0,0 +1,19 @@
+# Generated by Django 5.2.6 on 2026-10-18 05:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0004_usuario_fecha_registro_index'),
+        ('condominio', '0003_habitante_trigram_indexes'),
+        ('finance', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='reservaareacomun',
+            index=models.Index(fields=['residente', '-id'], name='reserva_residente_id_idx'),
+        ),
+    ]
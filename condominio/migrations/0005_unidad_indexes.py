@@ -0,0 +1,39 @@
+# Generated by Django 5.2.6 on 2026-10-18 05:59
+
+import django.contrib.postgres.indexes
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('condominio', '0004_reserva_paginacion_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='unidad',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('codigo'), name='gin_trgm_ops'), name='unidad_codigo_trgm'),
+        ),
+        migrations.AddIndex(
+            model_name='unidad',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('nombre'), name='gin_trgm_ops'), name='unidad_nombre_trgm'),
+        ),
+        migrations.AddIndex(
+            model_name='unidad',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('edificio'), name='gin_trgm_ops'), name='unidad_edificio_trgm'),
+        ),
+        migrations.AddIndex(
+            model_name='unidad',
+            index=models.Index(fields=['esta_activa', 'estado', 'id'], name='unidad_activa_estado_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='unidad',
+            index=models.Index(fields=['tipo_unidad', 'esta_activa', 'id'], name='unidad_tipo_activa_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='unidad',
+            index=models.Index(fields=['piso', 'id'], name='unidad_piso_idx'),
+        ),
+    ]
@@ -0,0 +1,59 @@
+# Generated by Django 5.2.6 on 2026-10-18 06:06
+
+import logging
+
+from django.db import migrations, models
+
+logger = logging.getLogger(__name__)
+
+
+def desactivar_duplicadas(apps, schema_editor):
+    """
+    Antes solo el serializer evitaba dos residencias activas por unidad o por residente,
+    con carrera incluida. Por cada unidad y cada residente se deja activa la más reciente
+    (fecha_inicio, id) y se desactivan e informan las demás.
+    """
+    Residencia = apps.get_model('condominio', 'Residencia')
+    for campo in ('residente_id', 'unidad_id'):
+        activas = (
+            Residencia.objects
+            .filter(esta_activa=True, esta_activo=True)
+            .order_by(campo, '-fecha_inicio', '-id')
+            .values_list('id', campo)
+        )
+        vistos = set()
+        duplicadas = []
+        for residencia_id, valor in activas:
+            if valor in vistos:
+                duplicadas.append(residencia_id)
+            vistos.add(valor)
+        if duplicadas:
+            Residencia.objects.filter(pk__in=duplicadas).update(esta_activa=False)
+            logger.warning(
+                "Residencias desactivadas por duplicar %s activo: %s",
+                campo.removesuffix('_id'), ', '.join(map(str, duplicadas)),
+            )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0004_usuario_fecha_registro_index'),
+        ('condominio', '0005_unidad_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterUniqueTogether(
+            name='residencia',
+            unique_together=set(),
+        ),
+        migrations.RunPython(desactivar_duplicadas, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='residencia',
+            constraint=models.UniqueConstraint(condition=models.Q(('esta_activa', True), ('esta_activo', True)), fields=('unidad',), name='residencia_unidad_activa_unica'),
+        ),
+        migrations.AddConstraint(
+            model_name='residencia',
+            constraint=models.UniqueConstraint(condition=models.Q(('esta_activa', True), ('esta_activo', True)), fields=('residente',), name='residencia_residente_activa_unica'),
+        ),
+    ]
@@ -0,0 +1,55 @@
+# Generated by Django 5.2.6 on 2026-10-18 06:07
+
+import logging
+
+import django.contrib.postgres.fields.ranges
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import BtreeGistExtension
+from django.db import migrations, models
+from django.db.models import F
+
+logger = logging.getLogger(__name__)
+
+
+def corregir_fechas_invertidas(apps, schema_editor):
+    """
+    DATERANGE falla con fecha_fin < fecha_inicio. No se inventa una fecha: se deja
+    fecha_fin en NULL (sin fin conocido) y se informan los valores originales para
+    que administración los revise.
+    """
+    Residencia = apps.get_model('condominio', 'Residencia')
+    invertidas = Residencia.objects.filter(fecha_fin__lt=F('fecha_inicio'))
+    filas = list(invertidas.values_list('id', 'fecha_inicio', 'fecha_fin'))
+    if not filas:
+        return
+    invertidas.update(fecha_fin=None)
+    logger.warning(
+        "Residencias con fecha_fin anterior a fecha_inicio, fecha_fin anulada: %s",
+        ', '.join(f"{pk} ({inicio} > {fin})" for pk, inicio, fin in filas),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0004_usuario_fecha_registro_index'),
+        ('condominio', '0006_residencia_activa_constraints'),
+    ]
+
+    operations = [
+        # GiST sobre (unidad, rango) necesita btree_gist para la columna entera
+        BtreeGistExtension(),
+        migrations.RunPython(corregir_fechas_invertidas, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='residencia',
+            constraint=models.CheckConstraint(condition=models.Q(('fecha_fin__isnull', True), ('fecha_fin__gte', models.F('fecha_inicio')), _connector='OR'), name='residencia_fechas_validas'),
+        ),
+        migrations.AddIndex(
+            model_name='residencia',
+            index=django.contrib.postgres.indexes.GistIndex(models.F('unidad'), models.Func(models.F('fecha_inicio'), models.F('fecha_fin'), models.Value('[]'), function='DATERANGE', output_field=django.contrib.postgres.fields.ranges.DateRangeField()), name='residencia_unidad_periodo_gist'),
+        ),
+        migrations.AddIndex(
+            model_name='residencia',
+            index=django.contrib.postgres.indexes.GistIndex(models.Func(models.F('fecha_inicio'), models.F('fecha_fin'), models.Value('[]'), function='DATERANGE', output_field=django.contrib.postgres.fields.ranges.DateRangeField()), name='residencia_periodo_gist'),
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.6 on 2026-10-18 06:09
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def contar_ocupantes(apps, schema_editor):
+    Residencia = apps.get_model('condominio', 'Residencia')
+    Habitante = apps.get_model('condominio', 'Habitante')
+    habitantes = (
+        Habitante.objects
+        .filter(residencia=OuterRef('pk'), esta_activo=True)
+        .order_by()
+        .values('residencia')
+        .annotate(cantidad=Count('id'))
+        .values('cantidad')
+    )
+    Residencia.objects.update(cantidad_ocupantes=Coalesce(Subquery(habitantes), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('condominio', '0007_residencia_periodo_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='residencia',
+            name='cantidad_ocupantes',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(contar_ocupantes, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,62 @@
+# Generated by Django 5.2.6 on 2026-10-18 06:12
+
+import logging
+
+import django.contrib.postgres.constraints
+import django.contrib.postgres.fields.ranges
+import django.db.models.expressions
+from django.db import migrations, models
+
+logger = logging.getLogger(__name__)
+
+
+def cancelar_solapadas(apps, schema_editor):
+    """
+    La restricción falla si ya hay reservas activas superpuestas. En cada área y día se
+    conserva primero la confirmada y luego la más antigua; las que chocan se cancelan y se
+    informan (con su cobro, si tenían, para que la administración lo revise).
+    """
+    ReservaAreaComun = apps.get_model('condominio', 'ReservaAreaComun')
+    activas = (
+        ReservaAreaComun.objects
+        .filter(estado__in=['pendiente', 'reservada'])
+        .values_list('id', 'area_comun_id', 'fecha', 'hora_inicio', 'hora_fin', 'estado', 'detalle_cuota_id')
+    )
+    conservadas = {}
+    canceladas = []
+    for fila in sorted(activas, key=lambda r: (r[1], r[2], r[5] != 'reservada', r[0])):
+        reserva_id, area_id, fecha, inicio, fin, estado, detalle_cuota_id = fila
+        dia = conservadas.setdefault((area_id, fecha), [])
+        if any(inicio < f and fin > i for i, f in dia):
+            canceladas.append(fila)
+        else:
+            dia.append((inicio, fin))
+
+    if canceladas:
+        ReservaAreaComun.objects.filter(pk__in=[fila[0] for fila in canceladas]).update(estado='cancelada')
+        for reserva_id, area_id, fecha, inicio, fin, estado, detalle_cuota_id in canceladas:
+            logger.warning(
+                "Reserva %s cancelada por solapamiento (área %s, %s %s-%s, estaba %s, detalle_cuota %s)",
+                reserva_id, area_id, fecha, inicio, fin, estado, detalle_cuota_id,
+            )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0004_usuario_fecha_registro_index'),
+        ('condominio', '0008_residencia_cantidad_ocupantes'),
+        ('finance', '0002_paginacion_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(cancelar_solapadas, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='reservaareacomun',
+            constraint=models.CheckConstraint(condition=models.Q(('hora_fin__gt', models.F('hora_inicio'))), name='reserva_horario_valido'),
+        ),
+        migrations.AddConstraint(
+            model_name='reservaareacomun',
+            constraint=django.contrib.postgres.constraints.ExclusionConstraint(condition=models.Q(('estado__in', ['pendiente', 'reservada'])), expressions=[(models.F('area_comun'), '='), (models.Func(models.ExpressionWrapper(django.db.models.expressions.CombinedExpression(models.F('fecha'), '+', models.F('hora_inicio')), output_field=models.DateTimeField()), models.ExpressionWrapper(django.db.models.expressions.CombinedExpression(models.F('fecha'), '+', models.F('hora_fin')), output_field=models.DateTimeField()), models.Value('[)'), function='TSRANGE', output_field=django.contrib.postgres.fields.ranges.DateTimeRangeField()), '&&')], name='reserva_area_sin_solapamiento'),
+        ),
+    ]
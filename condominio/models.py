@@ -1,9 +1,12 @@
 # condominio/models.py
-from django.db import models
+from django.contrib.postgres.constraints import ExclusionConstraint
+from django.contrib.postgres.fields import DateRangeField, DateTimeRangeField, RangeOperators
+from django.contrib.postgres.indexes import GinIndex, GistIndex, OpClass
+from django.db import models, transaction
+from django.db.models import ExpressionWrapper, F, Func, Q, Value
+from django.db.models.functions import Upper
 from django.utils import timezone
 from django.core.exceptions import ValidationError
-from django.db.models.signals import post_save, post_delete
-from django.dispatch import receiver
 from django.utils import timezone
 from finance.models import Expensa, Cuota, DetalleCuota
 
@@ -48,23 +51,50 @@ class Unidad(models.Model):
     class Meta:
         verbose_name = 'Unidad'
         verbose_name_plural = 'Unidades'
+        indexes = [
+            # Búsqueda parcial (icontains => UPPER(campo) LIKE): trigramas sobre UPPER(campo)
+            GinIndex(OpClass(Upper('codigo'), name='gin_trgm_ops'), name='unidad_codigo_trgm'),
+            GinIndex(OpClass(Upper('nombre'), name='gin_trgm_ops'), name='unidad_nombre_trgm'),
+            GinIndex(OpClass(Upper('edificio'), name='gin_trgm_ops'), name='unidad_edificio_trgm'),
+            # Filtros de igualdad más comunes del listado, terminando en id (orden de paginación)
+            models.Index(fields=['esta_activa', 'estado', 'id'], name='unidad_activa_estado_idx'),
+            models.Index(fields=['tipo_unidad', 'esta_activa', 'id'], name='unidad_tipo_activa_idx'),
+            models.Index(fields=['piso', 'id'], name='unidad_piso_idx'),
+        ]
+
+    # Reglas por tipo de unidad: las aplica clean() y, por lotes, la importación masiva
+    CAMPOS_OBLIGATORIOS_POR_TIPO = {
+        'departamento': [('edificio', 'edificio'), ('numero', 'número')],
+        'local': [('edificio', 'edificio'), ('numero', 'número')],
+    }
+    CAMPOS_PROHIBIDOS_POR_TIPO = {
+        'casa': [
+            ('edificio', "Las casas no deben tener edificio asignado"),
+            ('piso', "Las casas no deben tener piso asignado"),
+        ],
+    }
+
+    @staticmethod
+    def _tiene_valor(valor):
+        return bool(valor) and str(valor).strip() != ""
+
+    @classmethod
+    def errores_por_tipo(cls, tipo_unidad, datos):
+        """Mensajes de las reglas por tipo que incumple `datos` (dict campo -> valor)"""
+        errores = []
+        for campo, nombre in cls.CAMPOS_OBLIGATORIOS_POR_TIPO.get(tipo_unidad, []):
+            if not cls._tiene_valor(datos.get(campo)):
+                errores.append(f"El campo '{nombre}' es obligatorio para unidades tipo {tipo_unidad}")
+        for campo, mensaje in cls.CAMPOS_PROHIBIDOS_POR_TIPO.get(tipo_unidad, []):
+            if cls._tiene_valor(datos.get(campo)):
+                errores.append(mensaje)
+        return errores
 
     def clean(self):
         """Validación contextual según tipo de unidad"""
-        
-        def campo_obligatorio(valor, nombre):
-            if not valor or str(valor).strip() == "":
-                raise ValidationError(f"El campo '{nombre}' es obligatorio para unidades tipo {self.tipo_unidad}")
-
-        if self.tipo_unidad in ['departamento', 'local']:
-            campo_obligatorio(self.edificio, "edificio")
-            campo_obligatorio(self.numero, "número")
-
-        elif self.tipo_unidad == 'casa':
-            if self.edificio and self.edificio.strip() != "":
-                raise ValidationError("Las casas no deben tener edificio asignado")
-            if self.piso and self.piso.strip() != "":
-                raise ValidationError("Las casas no deben tener piso asignado")
+        errores = self.errores_por_tipo(self.tipo_unidad, self.__dict__)
+        if errores:
+            raise ValidationError(errores[0])
             
     def save(self, *args, **kwargs):
         self.clean()  # Ejecutar validaciones antes de guardar
@@ -75,6 +105,16 @@ class Unidad(models.Model):
             return f"{self.edificio} - {self.codigo}"
         return f"{self.codigo} - {self.nombre or self.get_tipo_unidad_display()}"
 
+def periodo_residencia():
+    """
+    daterange [fecha_inicio, fecha_fin] de una residencia (fecha_fin NULL = sin fin).
+    Es la misma expresión de los índices GiST: filtrar con ella usa el índice.
+    """
+    return Func(
+        F('fecha_inicio'), F('fecha_fin'), Value('[]'),
+        function='DATERANGE', output_field=DateRangeField(),
+    )
+
 class Residencia(models.Model):
     TIPO_CONTRATO_CHOICES = [
         ('propiedad', 'Propiedad'),
@@ -94,31 +134,62 @@ class Residencia(models.Model):
     fecha_registro = models.DateTimeField(auto_now_add=True)
     esta_activo = models.BooleanField(default=True)  # Soft delete
 
+    # Habitantes activos; lo mantiene condominio/ocupantes.py con UPDATE ... F() (ver reconciliar_ocupantes)
+    cantidad_ocupantes = models.PositiveIntegerField(default=0, editable=False)
+
     class Meta:
-        unique_together = [('unidad', 'esta_activa')]  # Una unidad solo una residencia activa
         verbose_name = 'Residencia'
         verbose_name_plural = 'Residencias'
+        # Una residencia activa por unidad y por residente; el historial inactivo no tiene límite.
+        # Los índices parciales cierran la carrera entre creaciones concurrentes sin consultas previas.
+        constraints = [
+            models.UniqueConstraint(
+                fields=['unidad'], condition=models.Q(esta_activa=True, esta_activo=True),
+                name='residencia_unidad_activa_unica',
+            ),
+            models.UniqueConstraint(
+                fields=['residente'], condition=models.Q(esta_activa=True, esta_activo=True),
+                name='residencia_residente_activa_unica',
+            ),
+            # El período [fecha_inicio, fecha_fin] de los índices GiST debe ser un rango válido
+            models.CheckConstraint(
+                condition=Q(fecha_fin__isnull=True) | Q(fecha_fin__gte=F('fecha_inicio')),
+                name='residencia_fechas_validas',
+            ),
+        ]
+        # Consultas temporales (quién ocupaba la unidad en una fecha, contratos vigentes en un período)
+        indexes = [
+            GistIndex(F('unidad'), periodo_residencia(), name='residencia_unidad_periodo_gist'),
+            GistIndex(periodo_residencia(), name='residencia_periodo_gist'),
+        ]
 
-    def clean(self):
-        """Validación adicional para evitar múltiples residencias activas por unidad"""
-        if self.esta_activa and self.esta_activo:
-            residencias_activas = Residencia.objects.filter(
-                unidad=self.unidad, 
-                esta_activa=True,
-                esta_activo=True
-            ).exclude(pk=self.pk)
-            
-            if residencias_activas.exists():
-                raise ValidationError(
-                    f"Ya existe una residencia activa para la unidad {self.unidad.codigo}"
-                )
+    def mensaje_conflicto(self, error):
+        """Traduce el IntegrityError de las restricciones de residencia activa a un mensaje de API"""
+        restriccion = getattr(getattr(error.__cause__, 'diag', None), 'constraint_name', None) or str(error)
+        if 'residencia_unidad_activa_unica' in restriccion:
+            return f"Ya existe una residencia activa para la unidad {self.unidad.codigo}"
+        if 'residencia_residente_activa_unica' in restriccion:
+            return "El residente ya tiene una residencia activa"
+        if 'residencia_fechas_validas' in restriccion:
+            return "La fecha de inicio no puede ser posterior a la fecha de fin"
+        return None
 
     def save(self, *args, **kwargs):
             """Override save para generar cuota al crear residencia de alquiler"""
-            # Primero validar y guardar
-            self.clean()
+            # Las reglas de residencia activa las garantiza la base (ver Meta.constraints)
             es_nuevo = self._state.adding  # True si es creación nueva
             
+            if not es_nuevo:
+                # cantidad_ocupantes lo mantienen las señales de Habitante con F(); el valor en
+                # memoria puede estar desactualizado, así que un save() normal nunca lo escribe
+                update_fields = kwargs.get('update_fields')
+                if update_fields is None:
+                    update_fields = [
+                        campo.attname for campo in self._meta.concrete_fields
+                        if not campo.primary_key
+                    ]
+                kwargs['update_fields'] = [campo for campo in update_fields if campo != 'cantidad_ocupantes']
+            
             super().save(*args, **kwargs)
             
             # Solo si es NUEVA residencia de alquiler ACTIVA
@@ -204,11 +275,6 @@ class Residencia(models.Model):
         # Por ejemplo, día 5 de cada mes
         return timezone.datetime.strptime(periodo + '-05', '%Y-%m-%d').date()
     
-    @property
-    def cantidad_ocupantes(self):
-        """Calcula la cantidad de ocupantes activos"""
-        return self.habitantes.filter(esta_activo=True).count()
-
     def __str__(self):
         return f"{self.residente} → {self.unidad.codigo} ({self.tipo_contrato})"
     
@@ -249,6 +315,11 @@ class Habitante(models.Model):
     class Meta:
         verbose_name = 'Habitante'
         verbose_name_plural = 'Habitantes'
+        indexes = [
+            GinIndex(OpClass(Upper('nombre'), name='gin_trgm_ops'), name='habitante_nombre_trgm'),
+            GinIndex(OpClass(Upper('apellido'), name='gin_trgm_ops'), name='habitante_apellido_trgm'),
+            GinIndex(OpClass(Upper('ci'), name='gin_trgm_ops'), name='habitante_ci_trgm'),
+        ]
 
     def __str__(self):
         return f"{self.nombre} {self.apellido} ({self.get_tipo_parentesco_display()})"
@@ -266,20 +337,6 @@ class Habitante(models.Model):
     def es_menor(self):
         return self.edad is not None and self.edad < 18
 
-# Señal para actualizar contadores cuando cambien los habitantes
-@receiver([post_save, post_delete], sender=Habitante)
-def actualizar_contadores_residencia(sender, instance, **kwargs):
-    """Actualizar contadores automáticamente cuando cambien los habitantes"""
-    try:
-        # Solo actualizar si el habitante está activo o se está eliminando
-        if instance.esta_activo or kwargs.get('created') is False:
-            instance.residencia.actualizar_contadores()
-            instance.residencia.save()
-    except Residencia.DoesNotExist:
-        # Si la residencia fue eliminada, ignorar
-        pass
-
-
 # condominio/models.py (solo partes afectadas)
 
 class AreaComun(models.Model):
@@ -326,6 +383,21 @@ class AreaComun(models.Model):
     def __str__(self):
         return self.nombre
     
+def horario_reserva():
+    """
+    tsrange [fecha + hora_inicio, fecha + hora_fin) de una reserva. Dos reservas
+    del mismo área se superponen si sus rangos se intersectan (&&).
+    """
+    return Func(
+        ExpressionWrapper(F('fecha') + F('hora_inicio'), output_field=models.DateTimeField()),
+        ExpressionWrapper(F('fecha') + F('hora_fin'), output_field=models.DateTimeField()),
+        Value('[)'),
+        function='TSRANGE', output_field=DateTimeRangeField(),
+    )
+
+# Estados que ocupan el horario del área (fuera de la clase para usarlo también en Meta)
+ESTADOS_RESERVA_ACTIVOS = ('pendiente', 'reservada')
+
 class ReservaAreaComun(models.Model):
     ESTADO_CHOICES = [
         ('pendiente', 'Pendiente'),
@@ -333,6 +405,15 @@ class ReservaAreaComun(models.Model):
         ('cancelada', 'Cancelada'),
         ('completada', 'Completada')
     ]
+    ESTADOS_ACTIVOS = ESTADOS_RESERVA_ACTIVOS
+    MENSAJE_SOLAPAMIENTO = "El área común ya está reservada para ese horario"
+
+    # Máquina de estados: acción -> (estados de origen, estado destino)
+    TRANSICIONES = {
+        'confirmar': (('pendiente',), 'reservada'),
+        'cancelar': (('pendiente', 'reservada'), 'cancelada'),
+        'completar': (('reservada',), 'completada'),
+    }
     
     area_comun = models.ForeignKey('AreaComun', on_delete=models.CASCADE)
     residente = models.ForeignKey('accounts.Residente', on_delete=models.CASCADE)
@@ -347,6 +428,33 @@ class ReservaAreaComun(models.Model):
     class Meta:
         verbose_name = 'Reserva de Área Común'
         verbose_name_plural = 'Reservas de Áreas Comunes'
+        indexes = [
+            models.Index(fields=['residente', '-id'], name='reserva_residente_id_idx'),
+        ]
+        # Sin reservas activas superpuestas en un área: lo garantiza la base aun con
+        # creaciones concurrentes (el insert que llega segundo falla)
+        constraints = [
+            models.CheckConstraint(
+                condition=Q(hora_fin__gt=F('hora_inicio')),
+                name='reserva_horario_valido',
+            ),
+            ExclusionConstraint(
+                name='reserva_area_sin_solapamiento',
+                expressions=[
+                    (F('area_comun'), RangeOperators.EQUAL),
+                    (horario_reserva(), RangeOperators.OVERLAPS),
+                ],
+                condition=Q(estado__in=list(ESTADOS_RESERVA_ACTIVOS)),
+            ),
+        ]
+
+    @classmethod
+    def mensaje_conflicto(cls, error):
+        """Traduce el IntegrityError de la restricción de solapamiento a un mensaje de API"""
+        restriccion = getattr(getattr(error.__cause__, 'diag', None), 'constraint_name', None) or str(error)
+        if 'reserva_area_sin_solapamiento' in restriccion:
+            return cls.MENSAJE_SOLAPAMIENTO
+        return None
 
     @property
     def costo(self):
@@ -355,26 +463,37 @@ class ReservaAreaComun(models.Model):
             return 0
         return self.area_comun.costo_fin_semana if self.fecha.weekday() in [5, 6] else self.area_comun.costo_normal
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Estado leído de la base: las transiciones lo usan como condición del UPDATE
+        instance._estado_cargado = instance.__dict__.get('estado')
+        return instance
+
     def crear_cuota_reserva(self):
         """Crea la cuota y detalle de cuota - SUPER SIMPLE"""
-        from finance.models import Expensa, Cuota, DetalleCuota
-        
+        if self.detalle_cuota_id:
+            return self.detalle_cuota  # El cobro ya existe: nunca se cobra dos veces
         if self.costo == 0:
             return None
             
-        try:
+        # Sin residencia activa no hay cuota a la que cargar el cobro: la transición no procede
+        residencia = self.residente.residencias.filter(esta_activa=True, esta_activo=True).first()
+        if not residencia:
+            raise ValidationError(
+                "El residente no tiene una residencia activa a la que cargar la reserva",
+                code='invalida'
+            )
+        
+        # Cualquier error revierte también la transición que llamó: nunca queda confirmada sin cobro
+        with transaction.atomic():
             # 1. Expensa de reserva (CONCEPTO)
             expensa, _ = Expensa.objects.get_or_create(
                 nombre="Reserva de Área Común",
                 defaults={'tipo': 'reserva_area', 'es_activo': True}
             )
             
-            # 2. Residencia activa del residente
-            residencia = self.residente.residencias.filter(esta_activa=True).first()
-            if not residencia:
-                return None
-                
-            # 3. Cuota del mes (DOCUMENTO)
+            # 2. Cuota del mes (DOCUMENTO)
             periodo = self.fecha.strftime('%Y-%m')
             cuota, _ = Cuota.objects.get_or_create(
                 residencia=residencia,
@@ -382,7 +501,7 @@ class ReservaAreaComun(models.Model):
                 defaults={'monto_total': 0, 'fecha_emision': timezone.now().date()}
             )
             
-            # 4. DetalleCuota (LÍNEA de cobro)
+            # 3. DetalleCuota (LÍNEA de cobro)
             detalle = DetalleCuota.objects.create(
                 cuota=cuota,
                 expensa=expensa,
@@ -392,44 +511,76 @@ class ReservaAreaComun(models.Model):
                 fecha_vencimiento=self.fecha
             )
             
-            # 5. Guardar relaciones
-            self.cuota_relacionada = cuota
-            self.detalle_cuota = detalle
-            self.save()
-            
-            return detalle
-            
-        except Exception as e:
-            print(f"Error creando cuota: {e}")
-            return None
+            # 4. Guardar relaciones (solo estas columnas, sin volver a pasar por save())
+            ReservaAreaComun.objects.filter(pk=self.pk).update(cuota_relacionada=cuota, detalle_cuota=detalle)
+        
+        self.cuota_relacionada = cuota
+        self.detalle_cuota = detalle
+        return detalle
 
     def cancelar_cuota_reserva(self):
         """ELIMINA el cobro si se cancela la reserva"""
-        if self.detalle_cuota:
-            self.detalle_cuota.delete()  # HARD DELETE
+        if self.detalle_cuota_id:
+            ReservaAreaComun.objects.filter(pk=self.pk).update(cuota_relacionada=None, detalle_cuota=None)
+            DetalleCuota.objects.filter(pk=self.detalle_cuota_id).delete()  # HARD DELETE
             self.detalle_cuota = None
             self.cuota_relacionada = None
-            self.save()
+
+    def transicionar(self, accion):
+        """
+        Aplica confirmar/cancelar/completar con UPDATE ... WHERE estado = <estado cargado>.
+        Si otra petición cambió la reserva desde que se leyó, no se actualiza nada y se
+        informa el conflicto; los cobros solo los ejecuta la petición que ganó el UPDATE.
+        """
+        from .disponibilidad import invalidar_disponibilidad
+        
+        origenes, destino = self.TRANSICIONES[accion]
+        if self.estado not in origenes:
+            raise ValidationError(f"La reserva ya está {self.get_estado_display()}", code='invalida')
+        
+        with transaction.atomic():
+            actualizadas = ReservaAreaComun.objects.filter(pk=self.pk, estado=self.estado).update(estado=destino)
+            if not actualizadas:
+                raise ValidationError(
+                    "La reserva cambió de estado mientras se procesaba; vuelva a consultarla",
+                    code='conflicto'
+                )
+            anterior = self.estado
+            
+            # Si el cobro falla, la excepción revierte también el UPDATE de estado
+            if destino == 'reservada':
+                self.crear_cuota_reserva()  # Crear cobro
+            elif destino == 'cancelada' and anterior == 'reservada':
+                self.cancelar_cuota_reserva()  # Eliminar cobro
+            
+            self.estado = self._estado_cargado = destino
+            
+            # update() no dispara señales: se invalida a mano la disponibilidad del área
+            transaction.on_commit(lambda: invalidar_disponibilidad(self.area_comun_id))
+        return anterior
+
+    def confirmar(self):
+        return self.transicionar('confirmar')
+
+    def cancelar(self):
+        return self.transicionar('cancelar')
+
+    def completar(self):
+        return self.transicionar('completar')
 
     def save(self, *args, **kwargs):
         # Validación básica
         if self.hora_inicio >= self.hora_fin:
-            from django.core.exceptions import ValidationError
             raise ValidationError("La hora de fin debe ser posterior al inicio")
         
-        # Manejar cambios de estado
-        if self.pk:
-            original = ReservaAreaComun.objects.get(pk=self.pk)
-            
-            if original.estado == 'pendiente' and self.estado == 'reservada':
-                super().save(*args, **kwargs)
-                self.crear_cuota_reserva()  # Crear cobro
-                return
-                
-            elif original.estado == 'reservada' and self.estado == 'cancelada':
-                self.cancelar_cuota_reserva()  # Eliminar cobro
+        # Los cambios de estado pasan por transicionar(): save() no vuelve a leer la fila
+        # ni dispara cobros, así que un estado cambiado a mano se rechaza
+        estado_cargado = getattr(self, '_estado_cargado', None)
+        if not self._state.adding and estado_cargado is not None and self.estado != estado_cargado:
+            raise ValidationError("Use confirmar(), cancelar() o completar() para cambiar el estado")
         
         super().save(*args, **kwargs)
+        self._estado_cargado = self.estado
 
     def __str__(self):
         return f"Reserva {self.area_comun.nombre} - {self.fecha}"
\ No newline at end of file
@@ -0,0 +1,128 @@
+# condominio/ocupacion.py
+import uuid
+from collections import Counter
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count
+from django.db.models.signals import post_init, post_save, post_delete
+from django.dispatch import receiver
+
+from utils.versiones import cache_versiones
+from .models import Unidad
+
+
+OCUPACION_CACHE_KEY = "unidades:ocupacion"
+OCUPACION_VERSION_KEY = "unidades:ocupacion:version"
+
+# Campos de Unidad que alteran los conteos; cambios en otros campos no invalidan
+CAMPOS_OCUPACION = ('edificio', 'piso', 'tipo_unidad', 'estado', 'esta_activa')
+
+
+def _nodo():
+    return {"total": 0, "por_estado": Counter()}
+
+
+def _sumar(nodo, estado, cantidad):
+    nodo["total"] += cantidad
+    nodo["por_estado"][estado] += cantidad
+
+
+def _plano(nodo):
+    """Counter -> dict con las claves ordenadas, para un JSON estable entre cálculos"""
+    nodo["por_estado"] = dict(sorted(nodo["por_estado"].items()))
+    return nodo
+
+
+def calcular_ocupacion():
+    """
+    Conteos de unidades activas por estado, tipo, edificio y piso a partir de UNA
+    consulta agrupada. Las unidades desactivadas solo suman en "inactivas".
+    """
+    filas = (
+        Unidad.objects
+        .values(*CAMPOS_OCUPACION)
+        .annotate(cantidad=Count('id'))
+        .order_by()
+    )
+
+    resumen = _nodo()
+    resumen["inactivas"] = 0
+    por_tipo = {}
+    por_edificio = {}
+    for fila in filas:
+        cantidad = fila['cantidad']
+        if not fila['esta_activa']:
+            resumen["inactivas"] += cantidad
+            continue
+        estado = fila['estado']
+        _sumar(resumen, estado, cantidad)
+        _sumar(por_tipo.setdefault(fila['tipo_unidad'], _nodo()), estado, cantidad)
+
+        # Casas y unidades sin edificio quedan agrupadas bajo None
+        edificio = por_edificio.setdefault(fila['edificio'], {**_nodo(), "pisos": {}})
+        _sumar(edificio, estado, cantidad)
+        _sumar(edificio["pisos"].setdefault(fila['piso'], _nodo()), estado, cantidad)
+
+    _plano(resumen)
+    resumen["por_tipo"] = {tipo: _plano(conteo) for tipo, conteo in sorted(por_tipo.items())}
+    resumen["por_edificio"] = [
+        {"edificio": nombre, **_plano(datos), "pisos": [
+            {"piso": piso, **_plano(conteo)} for piso, conteo in sorted(datos["pisos"].items(), key=lambda p: p[0] or '')
+        ]}
+        for nombre, datos in sorted(por_edificio.items(), key=lambda e: e[0] or '')
+    ]
+    return resumen
+
+
+def version_ocupacion():
+    """Versión compartida entre workers; si se pierde del cache se genera una nueva"""
+    version = cache_versiones.get(OCUPACION_VERSION_KEY)
+    if version is None:
+        version = uuid.uuid4().hex
+        cache_versiones.add(OCUPACION_VERSION_KEY, version, settings.VERSION_CACHE_TTL)
+        version = cache_versiones.get(OCUPACION_VERSION_KEY, version)
+    return version
+
+
+def obtener_ocupacion():
+    """
+    Devuelve los conteos desde cache; solo se recalculan tras un cambio de estado de Unidad.
+    La versión va en la clave: quien calculó con datos previos al cambio guarda en una
+    clave que ya nadie lee.
+    """
+    key = f"{OCUPACION_CACHE_KEY}:{version_ocupacion()}"
+    resumen = cache.get(key)
+    if resumen is None:
+        resumen = calcular_ocupacion()
+        cache.set(key, resumen, settings.OCUPACION_CACHE_TTL)
+    return resumen
+
+
+def invalidar_ocupacion():
+    """Publica una versión nueva; los conteos anteriores dejan de servirse"""
+    cache_versiones.set(OCUPACION_VERSION_KEY, uuid.uuid4().hex, settings.VERSION_CACHE_TTL)
+
+
+def _snapshot(unidad):
+    return tuple(unidad.__dict__.get(campo) for campo in CAMPOS_OCUPACION)
+
+
+# Señales: se recuerda el estado cargado para invalidar solo si cambió algo que se cuenta
+@receiver(post_init, sender=Unidad)
+def recordar_estado_unidad(sender, instance, **kwargs):
+    instance._ocupacion_previa = _snapshot(instance)
+
+
+@receiver(post_save, sender=Unidad)
+def invalidar_por_unidad(sender, instance, created, **kwargs):
+    actual = _snapshot(instance)
+    if created or actual != instance._ocupacion_previa:
+        # Después del commit: otro request no debe recalcular con datos aún no confirmados
+        transaction.on_commit(invalidar_ocupacion)
+    instance._ocupacion_previa = actual
+
+
+@receiver(post_delete, sender=Unidad)
+def invalidar_por_borrado(sender, instance, **kwargs):
+    transaction.on_commit(invalidar_ocupacion)
@@ -0,0 +1,78 @@
+# condominio/ocupantes.py
+from django.db.models import Count, F, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce, Greatest
+from django.db.models.signals import post_init, post_save, post_delete
+from django.dispatch import receiver
+
+from .models import Residencia, Habitante
+
+
+def ajustar_ocupantes(residencia_id, delta):
+    """
+    Suma `delta` a Residencia.cantidad_ocupantes con un UPDATE atómico (F()), sin leer
+    ni guardar la residencia. Nunca baja de 0: una desviación la corrige reconciliar_ocupantes.
+    """
+    if not residencia_id or not delta:
+        return
+    Residencia.objects.filter(pk=residencia_id).update(
+        cantidad_ocupantes=Greatest(F('cantidad_ocupantes') + delta, Value(0))
+    )
+
+
+def conteo_real():
+    """Expresión con la cantidad real de habitantes activos de cada residencia"""
+    habitantes = (
+        Habitante.objects
+        .filter(residencia=OuterRef('pk'), esta_activo=True)
+        .order_by()
+        .values('residencia')
+        .annotate(cantidad=Count('id'))
+        .values('cantidad')
+    )
+    return Coalesce(Subquery(habitantes), 0)
+
+
+def reconciliar_ocupantes(aplicar=True):
+    """
+    Compara el contador de cada residencia con el conteo real y devuelve las desviadas
+    ({id, cantidad_ocupantes, real}). Con `aplicar` las corrige en un solo UPDATE.
+    """
+    desviadas = list(
+        Residencia.objects
+        .annotate(real=conteo_real())
+        .exclude(cantidad_ocupantes=F('real'))
+        .order_by('id')
+        .values('id', 'cantidad_ocupantes', 'real')
+    )
+    if aplicar and desviadas:
+        Residencia.objects.filter(pk__in=[r['id'] for r in desviadas]).update(cantidad_ocupantes=conteo_real())
+    return desviadas
+
+
+def _residencia_contada(habitante):
+    """Residencia en la que cuenta el habitante, o None si está desactivado"""
+    if habitante.__dict__.get('esta_activo'):
+        return habitante.__dict__.get('residencia_id')
+    return None
+
+
+# Señales: se recuerda dónde contaba el habitante al cargarlo para aplicar solo la diferencia
+@receiver(post_init, sender=Habitante)
+def recordar_habitante(sender, instance, **kwargs):
+    instance._residencia_contada = _residencia_contada(instance)
+
+
+@receiver(post_save, sender=Habitante)
+def contar_habitante(sender, instance, created, **kwargs):
+    previa = None if created else instance._residencia_contada
+    actual = _residencia_contada(instance)
+    if previa != actual:
+        # Alta, activación/desactivación o cambio de residencia
+        ajustar_ocupantes(previa, -1)
+        ajustar_ocupantes(actual, 1)
+    instance._residencia_contada = actual
+
+
+@receiver(post_delete, sender=Habitante)
+def descontar_habitante(sender, instance, **kwargs):
+    ajustar_ocupantes(instance._residencia_contada, -1)
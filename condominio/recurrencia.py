@@ -0,0 +1,79 @@
+# condominio/recurrencia.py
+import calendar
+from datetime import timedelta
+from django.db import IntegrityError, transaction
+
+from .models import ReservaAreaComun
+from .disponibilidad import invalidar_disponibilidad
+
+
+def _sumar_meses(fecha, meses, dia):
+    """Misma `dia` del mes `meses` después; en meses más cortos, el último día"""
+    anio, mes = divmod(fecha.month - 1 + meses, 12)
+    anio, mes = fecha.year + anio, mes + 1
+    return fecha.replace(year=anio, month=mes, day=min(dia, calendar.monthrange(anio, mes)[1]))
+
+
+def expandir_fechas(inicio, fin, frecuencia):
+    """Fechas de la serie entre `inicio` y `fin` (inclusive), en memoria"""
+    fechas = []
+    if frecuencia == 'semanal':
+        fecha = inicio
+        while fecha <= fin:
+            fechas.append(fecha)
+            fecha += timedelta(weeks=1)
+        return fechas
+
+    meses = 0
+    fecha = inicio
+    while fecha <= fin:
+        fechas.append(fecha)
+        meses += 1
+        fecha = _sumar_meses(inicio, meses, inicio.day)
+    return fechas
+
+
+def fechas_ocupadas(area_comun, fechas, hora_inicio, hora_fin):
+    """Fechas de la serie que chocan con reservas activas del área: una sola consulta"""
+    return set(
+        ReservaAreaComun.objects
+        .filter(
+            area_comun=area_comun,
+            fecha__range=(fechas[0], fechas[-1]),
+            fecha__in=fechas,
+            estado__in=ReservaAreaComun.ESTADOS_ACTIVOS,
+            hora_inicio__lt=hora_fin,
+            hora_fin__gt=hora_inicio,
+        )
+        .values_list('fecha', flat=True)
+    )
+
+
+def reservar_serie(residente, area_comun, fechas, hora_inicio, hora_fin, intentos=2):
+    """
+    Crea en estado pendiente las ocurrencias libres de la serie con un bulk_create y
+    devuelve (creadas, fechas_en_conflicto). Si otra reserva entra entre la consulta y
+    el insert, la restricción de solapamiento rechaza el lote y se recalcula.
+    """
+    for intento in range(intentos):
+        conflictos = fechas_ocupadas(area_comun, fechas, hora_inicio, hora_fin)
+        nuevas = [
+            ReservaAreaComun(
+                area_comun=area_comun, residente=residente, fecha=fecha,
+                hora_inicio=hora_inicio, hora_fin=hora_fin, estado='pendiente',
+            )
+            for fecha in fechas if fecha not in conflictos
+        ]
+        if not nuevas:
+            return [], sorted(conflictos)
+        try:
+            with transaction.atomic():
+                creadas = ReservaAreaComun.objects.bulk_create(nuevas)
+        except IntegrityError as e:
+            if ReservaAreaComun.mensaje_conflicto(e) is None or intento == intentos - 1:
+                raise
+            continue
+
+        # bulk_create no dispara señales: se invalida a mano la disponibilidad del área
+        transaction.on_commit(lambda: invalidar_disponibilidad(area_comun.id))
+        return creadas, sorted(conflictos)
@@ -1,6 +1,10 @@
 # condominio/serializers.py
+from django.conf import settings
+from django.db import IntegrityError, transaction
 from rest_framework import serializers
+from rest_framework.settings import api_settings
 from .models import Unidad, Residencia, Habitante, AreaComun, ReservaAreaComun
+from .recurrencia import expandir_fechas
 
 class UnidadSerializer(serializers.ModelSerializer):
     tipo_unidad_display = serializers.CharField(source='get_tipo_unidad_display', read_only=True)
@@ -27,6 +31,64 @@ class UnidadSerializer(serializers.ModelSerializer):
             return f"${obj.precio_alquiler:,.2f}"
         return "No especificado"
 
+class UnidadImportacionSerializer(serializers.ModelSerializer):
+    """
+    Valida el formato de una fila de la importación masiva de unidades (sin consultas).
+    La unicidad de codigo y las reglas por tipo se verifican por lote en condominio.importacion.
+    """
+    class Meta:
+        model = Unidad
+        fields = [
+            'tipo_unidad', 'codigo', 'nombre', 'edificio', 'piso', 'numero',
+            'dimensiones', 'habitaciones', 'banios', 'precio_venta', 'precio_alquiler',
+            'ubicacion', 'caracteristicas', 'estado', 'esta_activa', 'foto_url'
+        ]
+        extra_kwargs = {'codigo': {'validators': []}}
+
+    def to_internal_value(self, data):
+        # En CSV las columnas vacías llegan como '' y no deben fallar en campos opcionales
+        if isinstance(data, dict):
+            data = {k: v for k, v in data.items() if v not in ('', None)}
+        return super().to_internal_value(data)
+
+class UnidadTransicionSerializer(serializers.Serializer):
+    """
+    Transición masiva de estado. Las unidades se eligen por 'ids', por filtros
+    exactos o por ambos (intersección); se exige al menos uno.
+    """
+    FILTROS = ('edificio', 'piso', 'tipo_unidad', 'estado')
+
+    accion = serializers.ChoiceField(choices=['activar', 'desactivar', 'mantenimiento'])
+    ids = serializers.ListField(child=serializers.IntegerField(), required=False, allow_empty=False)
+    edificio = serializers.CharField(max_length=100, required=False)
+    piso = serializers.CharField(max_length=10, required=False)
+    tipo_unidad = serializers.ChoiceField(choices=Unidad.TIPO_UNIDAD_CHOICES, required=False)
+    estado = serializers.ChoiceField(choices=Unidad.ESTADO_CHOICES, required=False)
+
+    def validate(self, data):
+        if not data.get('ids') and not any(campo in data for campo in self.FILTROS):
+            raise serializers.ValidationError(
+                "Indique 'ids' o al menos un filtro (edificio, piso, tipo_unidad, estado)"
+            )
+        return data
+
+class VigenciaConsultaSerializer(serializers.Serializer):
+    """Parámetros de las consultas temporales: ?fecha= (un día) o ?desde=&hasta= (intervalo)"""
+    fecha = serializers.DateField(required=False)
+    desde = serializers.DateField(required=False)
+    hasta = serializers.DateField(required=False)
+
+    def validate(self, data):
+        intervalo = 'desde' in data or 'hasta' in data
+        if 'fecha' in data:
+            if intervalo:
+                raise serializers.ValidationError("Use 'fecha' o 'desde'/'hasta', no ambos")
+        elif not ('desde' in data and 'hasta' in data):
+            raise serializers.ValidationError("Indique 'fecha' o el intervalo completo 'desde' y 'hasta'")
+        elif data['desde'] > data['hasta']:
+            raise serializers.ValidationError("'desde' no puede ser posterior a 'hasta'")
+        return data
+
 class HabitanteSerializer(serializers.ModelSerializer):
     tipo_parentesco_display = serializers.CharField(source='get_tipo_parentesco_display', read_only=True)
     edad = serializers.ReadOnlyField()
@@ -64,12 +126,16 @@ class ResidenciaSerializer(serializers.ModelSerializer):
             'id', 'residente', 'unidad', 'residente_nombre', 'residente_apellido', 'residente_ci',
             'unidad_codigo', 'unidad_tipo', 'tipo_contrato', 'tipo_contrato_display',
             'fecha_inicio', 'fecha_fin', 'duracion_contrato', 'esta_activa', 'fecha_registro', 
-            'esta_activo', 'habitantes'
+            'esta_activo', 'cantidad_ocupantes', 'habitantes'
         ]
+
+    @staticmethod
+    def preparar_queryset(queryset):
+        """Todo lo que lee el serializer en 2 consultas: residente/usuario/unidad por join y habitantes por prefetch"""
+        return queryset.select_related('residente__usuario', 'unidad').prefetch_related('habitantes')
     
     def validate(self, data):
         unidad = data.get('unidad')
-        residente = data.get('residente')
         
         # Validar que la unidad esté disponible (solo al crear)
         if self.instance is None and unidad and unidad.estado != 'disponible':
@@ -77,20 +143,12 @@ class ResidenciaSerializer(serializers.ModelSerializer):
                 f"La unidad {unidad.codigo} no está disponible. Estado actual: {unidad.estado}"
             )
         
-        # Validar que el residente no tenga otra residencia activa (solo al crear)
-        if self.instance is None and residente:
-            residencias_activas = Residencia.objects.filter(
-                residente=residente, 
-                esta_activa=True
-            )
-            if residencias_activas.exists():
-                raise serializers.ValidationError(
-                    "El residente ya tiene una residencia activa"
-                )
-        
-        # Validar fechas del contrato
-        fecha_inicio = data.get('fecha_inicio')
-        fecha_fin = data.get('fecha_fin')
+        # Una residencia activa por residente y por unidad: lo garantizan las
+        # restricciones de Residencia; el conflicto se traduce en _guardar()
+
+        # Validar fechas del contrato (en un PATCH, la fecha que no viene es la guardada)
+        fecha_inicio = data['fecha_inicio'] if 'fecha_inicio' in data else getattr(self.instance, 'fecha_inicio', None)
+        fecha_fin = data['fecha_fin'] if 'fecha_fin' in data else getattr(self.instance, 'fecha_fin', None)
         
         if fecha_inicio and fecha_fin and fecha_inicio > fecha_fin:
             raise serializers.ValidationError(
@@ -99,19 +157,36 @@ class ResidenciaSerializer(serializers.ModelSerializer):
             
         return data
     
+    def _guardar(self, guardar, residencia):
+        """Ejecuta el insert/update en un savepoint y traduce las violaciones de residencia activa"""
+        try:
+            with transaction.atomic():
+                return guardar()
+        except IntegrityError as e:
+            mensaje = residencia.mensaje_conflicto(e)
+            if mensaje is None:
+                raise
+            raise serializers.ValidationError(mensaje)
+
     def create(self, validated_data):
         # Crear la residencia
-        residencia = super().create(validated_data)
+        residencia = self._guardar(
+            lambda: super(ResidenciaSerializer, self).create(validated_data),
+            Residencia(**validated_data),
+        )
         
         # Actualizar el estado de la unidad a "ocupada"
         unidad = residencia.unidad
         unidad.estado = 'ocupada'
-        unidad.save()
+        unidad.save(update_fields=['estado'])
         
         return residencia
     
     def update(self, instance, validated_data):
-        residencia = super().update(instance, validated_data)
+        residencia = self._guardar(
+            lambda: super(ResidenciaSerializer, self).update(instance, validated_data),
+            instance,
+        )
         
         # Manejar cambios en el estado activo
         if 'esta_activa' in validated_data:
@@ -120,7 +195,7 @@ class ResidenciaSerializer(serializers.ModelSerializer):
                 unidad.estado = 'ocupada'
             else:
                 unidad.estado = 'disponible'
-            unidad.save()
+            unidad.save(update_fields=['estado'])
             
         return residencia
 
@@ -145,6 +220,29 @@ class HabitanteCreateSerializer(serializers.ModelSerializer):
             )
             
         return data
+
+class DisponibilidadConsultaSerializer(serializers.Serializer):
+    """Parámetros de la disponibilidad de un área: ?desde= (obligatorio) y ?hasta= (por defecto, el mismo día)"""
+    desde = serializers.DateField()
+    hasta = serializers.DateField(required=False)
+
+    def validate(self, data):
+        data.setdefault('hasta', data['desde'])
+        if data['desde'] > data['hasta']:
+            raise serializers.ValidationError("'desde' no puede ser posterior a 'hasta'")
+        dias = (data['hasta'] - data['desde']).days + 1
+        if dias > settings.DISPONIBILIDAD_DIAS_MAXIMO:
+            raise serializers.ValidationError(f"El rango no puede superar {settings.DISPONIBILIDAD_DIAS_MAXIMO} días")
+        return data
+
+class HabitanteLoteSerializer(serializers.ModelSerializer):
+    """Un habitante del alta en lote: residencia y titular los asigna la vista, una vez para todo el grupo"""
+    class Meta:
+        model = Habitante
+        fields = [
+            'nombre', 'apellido', 'ci', 'fecha_nacimiento', 'tipo_parentesco',
+            'es_contacto_emergencia', 'telefono', 'correo', 'observaciones'
+        ]
     
 # condominio/serializers.py 
 class AreaComunSerializer(serializers.ModelSerializer):
@@ -204,25 +302,51 @@ class ReservaAreaComunCreateSerializer(serializers.ModelSerializer):
                 f"El área común cierra a las {area_comun.hora_cierre}"
             )
         
+        if data['hora_inicio'] >= data['hora_fin']:
+            raise serializers.ValidationError("La hora de fin debe ser posterior al inicio")
         
-        # Validar disponibilidad (no hay reservas superpuestas)
-        reservas_existentes = ReservaAreaComun.objects.filter(
-            area_comun=area_comun,
-            fecha=data['fecha'],
-            estado__in=['pendiente', 'reservada'],
-            hora_inicio__lt=data['hora_fin'],
-            hora_fin__gt=data['hora_inicio']
-        )
+        # La disponibilidad (sin reservas superpuestas) la garantiza la restricción
+        # de exclusión de ReservaAreaComun; el conflicto se traduce en create()
+        return data
+
+    def create(self, validated_data):
+        """Un solo INSERT en un savepoint: si otra reserva ocupa el horario, la base lo rechaza"""
+        try:
+            with transaction.atomic():
+                return super().create(validated_data)
+        except IntegrityError as e:
+            mensaje = ReservaAreaComun.mensaje_conflicto(e)
+            if mensaje is None:
+                raise
+            raise serializers.ValidationError({api_settings.NON_FIELD_ERRORS_KEY: [mensaje]})
+
+class ReservaRecurrenteSerializer(ReservaAreaComunCreateSerializer):
+    """Serie de reservas: la primera ocurrencia (fecha/horario) más la regla de repetición"""
+    FRECUENCIAS = ('semanal', 'mensual')
+
+    frecuencia = serializers.ChoiceField(choices=FRECUENCIAS)
+    fecha_fin = serializers.DateField(help_text="Última fecha posible de la serie (inclusive)")
+
+    class Meta(ReservaAreaComunCreateSerializer.Meta):
+        fields = ReservaAreaComunCreateSerializer.Meta.fields + ['frecuencia', 'fecha_fin']
+
+    def validate(self, data):
+        data = super().validate(data)
+        if data['fecha_fin'] < data['fecha']:
+            raise serializers.ValidationError("La fecha de fin de la serie no puede ser anterior a la primera fecha")
         
-        if reservas_existentes.exists():
+        data['fechas'] = expandir_fechas(data['fecha'], data['fecha_fin'], data['frecuencia'])
+        if len(data['fechas']) > settings.RESERVAS_SERIE_MAXIMO:
             raise serializers.ValidationError(
-                "El área común ya está reservada para ese horario"
+                f"La serie no puede superar {settings.RESERVAS_SERIE_MAXIMO} reservas"
             )
-        
         return data
 
 class ReservaAreaComunUpdateSerializer(serializers.ModelSerializer):
     """Serializer específico para actualizaciones (solo permite cambiar estado)"""
+    # Estado pedido -> acción de la máquina de estados de ReservaAreaComun
+    ACCIONES = {'reservada': 'confirmar', 'cancelada': 'cancelar', 'completada': 'completar'}
+
     class Meta:
         model = ReservaAreaComun
         fields = ['estado']
@@ -237,4 +361,20 @@ class ReservaAreaComunUpdateSerializer(serializers.ModelSerializer):
         if instance.estado == 'completada' and value != 'completada':
             raise serializers.ValidationError("Una reserva completada no puede ser modificada")
         
-        return value
\ No newline at end of file
+        if value != instance.estado and value not in self.ACCIONES:
+            raise serializers.ValidationError("Una reserva no puede volver a pendiente")
+        
+        return value
+
+class DirectorioResultadoSerializer(serializers.Serializer):
+    """Resultado compacto del directorio (residente o habitante)"""
+    tipo = serializers.CharField()
+    residente_id = serializers.UUIDField(required=False)
+    id = serializers.IntegerField(required=False)
+    residencia_id = serializers.IntegerField(required=False)
+    nombre = serializers.CharField()
+    apellido = serializers.CharField()
+    ci = serializers.CharField(allow_null=True)
+    correo = serializers.CharField(allow_null=True)
+    unidad_codigo = serializers.CharField(allow_null=True)
+    score = serializers.FloatField()
@@ -0,0 +1,21 @@
+# condominio/temporal.py
+from django.db.backends.postgresql.psycopg_any import DateRange
+
+from .models import Residencia, periodo_residencia
+
+
+def _con_periodo(queryset):
+    if queryset is None:
+        queryset = Residencia.objects.all()
+    # Solo se excluyen las residencias dadas de baja (soft delete); las terminadas son historial
+    return queryset.filter(esta_activo=True).annotate(periodo=periodo_residencia())
+
+
+def residencias_vigentes_en(fecha, queryset=None):
+    """Residencias cuyo contrato cubría `fecha` (usa el índice GiST del período)"""
+    return _con_periodo(queryset).filter(periodo__contains=fecha)
+
+
+def residencias_vigentes_entre(desde, hasta, queryset=None):
+    """Residencias con contrato vigente en algún día de [desde, hasta]"""
+    return _con_periodo(queryset).filter(periodo__overlap=DateRange(desde, hasta, '[]'))
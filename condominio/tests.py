@@ -1,3 +1,843 @@
-from django.test import TestCase
+import json
+import time
+from importlib import import_module
+from datetime import date, time as hora, timedelta
 
-# Create your tests here.
+from django.apps import apps
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from accounts.models import Rol, Usuario, Residente
+from accounts.principal import cargar_principal, obtener_principal, _cache_key
+from finance.models import DetalleCuota
+from utils.lotes import lotes
+from utils.versiones import obtener_version
+from .models import Unidad, Residencia, Habitante, AreaComun, ReservaAreaComun
+from .recurrencia import expandir_fechas
+from .disponibilidad import obtener_disponibilidad
+from .importacion import importar_unidades
+from .ocupacion import version_ocupacion
+from .temporal import residencias_vigentes_en, residencias_vigentes_entre
+
+
+def _crear_residente(rol, sufijo):
+    usuario = Usuario.objects.create(ci=f"CI-{sufijo}", nombre=f"Nombre{sufijo}", apellido='Test',
+                                     correo=f"{sufijo}@test.com", password='x', rol=rol)
+    return Residente.objects.create(usuario=usuario, tipo='propietario')
+
+
+def _crear_unidad(codigo):
+    return Unidad.objects.create(tipo_unidad='departamento', codigo=codigo, edificio='Torre A', numero='1',
+                                 dimensiones='80m2', ubicacion='Condominio')
+
+
+def _cliente(usuario):
+    """APIClient autenticado como `usuario`, con claims para las vistas @jwt_auth_required"""
+    api = APIClient()
+    api.force_authenticate(usuario, token={'user_id': str(usuario.id)})
+    return api
+
+
+def _nodos(plan):
+    """Recorre el árbol de un EXPLAIN (FORMAT JSON)"""
+    yield plan
+    for hijo in plan.get('Plans', []):
+        yield from _nodos(hijo)
+
+
+class UnidadListadoPlanTests(TestCase):
+    """
+    Regresión de planes del listado de unidades: con 50k filas, cada combinación
+    de filtros/búsqueda debe resolverse por índices (sin Seq Scan sobre la tabla)
+    y responder dentro del presupuesto de latencia.
+    """
+    TOTAL_UNIDADES = 50_000
+    PRESUPUESTO_MS = 300
+
+    CASOS = [
+        {'search': 'U-04217'},
+        {'search': 'TORRE 17'},
+        {'edificio': 'Torre 3'},
+        {'estado': 'mantenimiento', 'esta_activa': 'true'},
+        {'tipo_unidad': 'oficina', 'esta_activa': 'false'},
+        {'piso': '7'},
+        {'piso': '7', 'estado': 'reservada'},
+    ]
+
+    @classmethod
+    def setUpTestData(cls):
+        tipos = ['departamento', 'local', 'oficina', 'otro', 'casa']
+        estados = ['disponible', 'ocupada', 'mantenimiento', 'reservada']
+        unidades = []
+        for i in range(cls.TOTAL_UNIDADES):
+            tipo = tipos[i % len(tipos)]
+            es_casa = tipo == 'casa'
+            unidades.append(Unidad(
+                tipo_unidad=tipo,
+                codigo=f"U-{i:05d}",
+                nombre=f"Unidad {i}",
+                edificio=None if es_casa else f"Torre {i % 40}",
+                piso=None if es_casa else str(i % 25),
+                numero=str(i % 100),
+                dimensiones='80m2',
+                ubicacion='Condominio',
+                estado=estados[(i // 7) % len(estados)],
+                esta_activa=i % 10 != 0,
+            ))
+        Unidad.objects.bulk_create(unidades, batch_size=5000)
+        with connection.cursor() as cursor:
+            # Lo que haría autovacuum: volcar la lista pendiente de los GIN y recolectar estadísticas
+            for indice in ('unidad_codigo_trgm', 'unidad_nombre_trgm', 'unidad_edificio_trgm'):
+                cursor.execute('SELECT gin_clean_pending_list(%s::regclass)', [indice])
+            cursor.execute('ANALYZE condominio_unidad')
+
+    def _listar(self, params):
+        with CaptureQueriesContext(connection) as consultas:
+            inicio = time.perf_counter()
+            response = self.client.get(reverse('unidad-list-create'), params)
+            duracion_ms = (time.perf_counter() - inicio) * 1000
+        self.assertEqual(response.status_code, 200)
+        sql = [q['sql'] for q in consultas.captured_queries if 'condominio_unidad' in q['sql']]
+        self.assertEqual(len(sql), 1, sql)
+        return sql[0], duracion_ms
+
+    def test_filtros_usan_indices(self):
+        for params in self.CASOS:
+            with self.subTest(params=params):
+                sql, _ = self._listar(params)
+                with connection.cursor() as cursor:
+                    cursor.execute('EXPLAIN (FORMAT JSON) ' + sql)
+                    plan = cursor.fetchone()[0]
+                if isinstance(plan, str):
+                    plan = json.loads(plan)
+                nodos = list(_nodos(plan[0]['Plan']))
+                seq_scans = [n for n in nodos if n['Node Type'] == 'Seq Scan'
+                             and n.get('Relation Name') == 'condominio_unidad']
+                self.assertEqual(seq_scans, [], f"Seq Scan en {params}")
+
+    def test_presupuesto_de_latencia(self):
+        for params in self.CASOS:
+            with self.subTest(params=params):
+                self._listar(params)  # calienta cache de planes y páginas
+                _, duracion_ms = self._listar(params)
+                self.assertLess(duracion_ms, self.PRESUPUESTO_MS)
+
+
+class ResidenciaListadoConsultasTests(TestCase):
+    """
+    Los listados de residencias cargan residente, usuario, unidad y habitantes con un
+    número fijo de consultas, sin importar cuántas filas devuelven.
+    """
+    TOTAL_RESIDENCIAS = 30
+    HABITANTES_POR_RESIDENCIA = 3
+
+    @classmethod
+    def setUpTestData(cls):
+        rol = Rol.objects.create(nombre='Residente')
+        usuarios = Usuario.objects.bulk_create([
+            Usuario(ci=f"CI{i}", nombre=f"Nombre{i}", apellido=f"Apellido{i}",
+                    correo=f"r{i}@test.com", password='x', rol=rol)
+            for i in range(cls.TOTAL_RESIDENCIAS)
+        ])
+        residentes = Residente.objects.bulk_create([
+            Residente(usuario=usuario, tipo='propietario') for usuario in usuarios
+        ])
+        unidades = Unidad.objects.bulk_create([
+            Unidad(tipo_unidad='departamento', codigo=f"R-{i}", edificio='Torre A', numero=str(i),
+                   dimensiones='80m2', ubicacion='Condominio', estado='ocupada')
+            for i in range(cls.TOTAL_RESIDENCIAS)
+        ])
+        residencias = Residencia.objects.bulk_create([
+            Residencia(residente=residente, unidad=unidad, fecha_inicio='2025-01-01',
+                       tipo_contrato='alquiler' if i % 2 else 'propiedad')
+            for i, (residente, unidad) in enumerate(zip(residentes, unidades))
+        ])
+        Habitante.objects.bulk_create([
+            Habitante(residente_titular=residencia.residente, residencia=residencia,
+                      nombre=f"Hab{j}", apellido='Test', tipo_parentesco='hijo')
+            for residencia in residencias
+            for j in range(cls.HABITANTES_POR_RESIDENCIA)
+        ])
+        cls.unidad = unidades[0]
+        cls.residente = residentes[0]
+
+    def test_listado_consultas_fijas(self):
+        # 1: residencias + residente + usuario + unidad (join), 2: habitantes (prefetch)
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse('residencia-list-create'), {'limit': 100})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['results']), self.TOTAL_RESIDENCIAS)
+        self.assertEqual(len(response.data['results'][0]['habitantes']), self.HABITANTES_POR_RESIDENCIA)
+
+    def test_filtros(self):
+        casos = [
+            ({'tipo_contrato': 'alquiler'}, self.TOTAL_RESIDENCIAS // 2),
+            ({'esta_activa': 'true', 'tipo_contrato': 'propiedad'}, self.TOTAL_RESIDENCIAS // 2),
+            ({'esta_activa': 'false'}, 0),
+            ({'unidad': self.unidad.id}, 1),
+            ({'residente': str(self.residente.id)}, 1),
+        ]
+        for params, esperadas in casos:
+            with self.subTest(params=params), self.assertNumQueries(1 if esperadas == 0 else 2):
+                response = self.client.get(reverse('residencia-list-create'), {**params, 'limit': 100})
+                self.assertEqual(len(response.data['results']), esperadas)
+
+    def test_filtro_invalido(self):
+        response = self.client.get(reverse('residencia-list-create'), {'residente': 'no-es-uuid'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_residencias_de_unidad_consultas_fijas(self):
+        # 1: unidad, 2: residencias con joins, 3: habitantes
+        with self.assertNumQueries(3):
+            response = self.client.get(reverse('unidad-residencias', args=[self.unidad.id]))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data), 1)
+
+
+class ResidenciaContadorOcupantesTests(TestCase):
+    """El contador de ocupantes lo mantienen las señales de Habitante; un save() de la residencia no lo pisa"""
+
+    @classmethod
+    def setUpTestData(cls):
+        rol = Rol.objects.create(nombre='Residente')
+        usuario = Usuario.objects.create(ci='CI-OC', nombre='Ana', apellido='Paz',
+                                         correo='oc@test.com', password='x', rol=rol)
+        cls.residente = Residente.objects.create(usuario=usuario, tipo='propietario')
+        cls.unidad = Unidad.objects.create(tipo_unidad='departamento', codigo='OC-1', edificio='Torre A',
+                                           numero='1', dimensiones='80m2', ubicacion='Condominio')
+
+    def setUp(self):
+        self.residencia = Residencia.objects.create(residente=self.residente, unidad=self.unidad,
+                                                    tipo_contrato='propiedad', fecha_inicio='2025-01-01')
+
+    def _crear_habitante(self, nombre):
+        response = self.client.post(
+            reverse('residencia-habitantes', args=[self.residencia.id]),
+            {'nombre': nombre, 'apellido': 'Paz', 'tipo_parentesco': 'hijo'},
+        )
+        self.assertEqual(response.status_code, 201)
+        return response.data['id']
+
+    def _contador(self):
+        return Residencia.objects.values_list('cantidad_ocupantes', flat=True).get(pk=self.residencia.pk)
+
+    def test_patch_no_pisa_contador(self):
+        self._crear_habitante('Luis')
+        self.assertEqual(self.residencia.cantidad_ocupantes, 0)  # la instancia en memoria quedó vieja
+        self.assertEqual(self._contador(), 1)
+
+        response = self.client.patch(
+            reverse('residencia-detail', args=[self.residencia.id]),
+            {'fecha_fin': '2030-12-31'}, content_type='application/json',
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['cantidad_ocupantes'], 1)
+        self.assertEqual(self._contador(), 1)
+
+    def test_save_completo_no_pisa_contador(self):
+        self._crear_habitante('Luis')
+        self.residencia.tipo_contrato = 'comodato'
+        self.residencia.save()
+        self.assertEqual(self._contador(), 1)
+
+    def test_toggle_y_borrado_de_habitante(self):
+        primero = self._crear_habitante('Luis')
+        self._crear_habitante('Eva')
+        self.assertEqual(self._contador(), 2)
+        self.client.patch(reverse('habitante-toggle-activa', args=[self.residencia.id, primero]))
+        self.assertEqual(self._contador(), 1)
+        self.client.delete(reverse('habitante-detail', args=[self.residencia.id, primero]))
+        self.assertEqual(self._contador(), 1)  # ya estaba desactivado: no descuenta dos veces
+
+
+class ResidenciaActivaRestriccionesTests(TestCase):
+    """Las restricciones parciales de residencia activa se traducen a 400 con el mensaje de la API"""
+
+    @classmethod
+    def setUpTestData(cls):
+        rol = Rol.objects.create(nombre='Residente')
+        cls.residente = _crear_residente(rol, 'ra1')
+        cls.otro_residente = _crear_residente(rol, 'ra2')
+        cls.unidad = _crear_unidad('RA-1')
+        cls.otra_unidad = _crear_unidad('RA-2')
+
+    def _crear(self, residente, unidad):
+        return self.client.post(reverse('residencia-list-create'), {
+            'residente': str(residente.id), 'unidad': unidad.id,
+            'tipo_contrato': 'propiedad', 'fecha_inicio': '2025-01-01',
+        }, content_type='application/json')
+
+    def test_residente_con_residencia_activa(self):
+        self.assertEqual(self._crear(self.residente, self.unidad).status_code, 201)
+        response = self._crear(self.residente, self.otra_unidad)
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("El residente ya tiene una residencia activa", str(response.data))
+        self.assertEqual(Residencia.objects.filter(residente=self.residente).count(), 1)
+
+    def test_unidad_con_residencia_activa(self):
+        self.assertEqual(self._crear(self.residente, self.unidad).status_code, 201)
+        # Estado de la unidad desalineado (p. ej. cambio masivo): la base igual rechaza la segunda
+        Unidad.objects.filter(pk=self.unidad.pk).update(estado='disponible')
+        response = self._crear(self.otro_residente, self.unidad)
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("Ya existe una residencia activa para la unidad RA-1", str(response.data))
+
+    def test_historial_inactivo_no_cuenta(self):
+        residencia = Residencia.objects.create(residente=self.residente, unidad=self.unidad,
+                                               tipo_contrato='propiedad', fecha_inicio='2024-01-01',
+                                               fecha_fin='2024-12-31', esta_activa=False)
+        self.assertEqual(self._crear(self.residente, self.otra_unidad).status_code, 201)
+        self.assertFalse(Residencia.objects.get(pk=residencia.pk).esta_activa)
+
+
+class ReservaSolapamientoTests(TestCase):
+    """La restricción de exclusión rechaza reservas activas superpuestas con el mensaje de siempre"""
+
+    @classmethod
+    def setUpTestData(cls):
+        rol = Rol.objects.create(nombre='Residente')
+        cls.residente = _crear_residente(rol, 'rs1')
+        cls.area = AreaComun.objects.create(nombre='Quincho', tipo='parrilla')
+        cls.fecha = date.today() + timedelta(days=7)
+
+    def setUp(self):
+        self.api = APIClient()
+        self.api.force_authenticate(self.residente.usuario)
+
+    def _reservar(self, inicio, fin):
+        return self.api.post(reverse('reserva-list-create'), {
+            'area_comun': self.area.id, 'fecha': self.fecha, 'hora_inicio': inicio, 'hora_fin': fin,
+        }, format='json')
+
+    def test_solapamiento_rechazado(self):
+        self.assertEqual(self._reservar('18:00', '21:00').status_code, 201)
+        response = self._reservar('20:00', '22:00')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['non_field_errors'], [ReservaAreaComun.MENSAJE_SOLAPAMIENTO])
+        self.assertEqual(ReservaAreaComun.objects.filter(area_comun=self.area).count(), 1)
+
+    def test_adyacente_y_cancelada_no_chocan(self):
+        self.assertEqual(self._reservar('18:00', '20:00').status_code, 201)
+        self.assertEqual(self._reservar('20:00', '21:00').status_code, 201)  # [inicio, fin)
+        ReservaAreaComun.objects.filter(area_comun=self.area, hora_inicio=hora(18)).update(estado='cancelada')
+        self.assertEqual(self._reservar('17:00', '20:00').status_code, 201)
+
+
+class ReservaTransicionesTests(TestCase):
+    """Confirmar/cancelar/completar: UPDATE condicional y cobro creado o anulado una sola vez"""
+
+    @classmethod
+    def setUpTestData(cls):
+        rol = Rol.objects.create(nombre='Residente')
+        cls.admin = Usuario.objects.create(ci='CI-rta', nombre='Admin', apellido='Test', correo='rta@test.com',
+                                           password='x', rol=Rol.objects.create(nombre='Administrador'))
+        cls.residente = _crear_residente(rol, 'rt1')
+        cls.sin_residencia = _crear_residente(rol, 'rt2')
+        Residencia.objects.create(residente=cls.residente, unidad=_crear_unidad('RT-1'),
+                                  tipo_contrato='propiedad', fecha_inicio='2025-01-01')
+        cls.area = AreaComun.objects.create(nombre='Salón', tipo='salon_eventos',
+                                            tiene_costo=True, costo_normal=100, costo_fin_semana=150)
+
+    def setUp(self):
+        self.api = _cliente(self.admin)
+        self.reserva = ReservaAreaComun.objects.create(
+            area_comun=self.area, residente=self.residente, fecha=date.today() + timedelta(days=7),
+            hora_inicio=hora(10), hora_fin=hora(12),
+        )
+
+    def _cobros(self, reserva):
+        return DetalleCuota.objects.filter(referencia=f"RESERVA_{reserva.id}").count()
+
+    def test_doble_confirmacion_cobra_una_vez(self):
+        url = reverse('reserva-confirmar', args=[self.reserva.id])
+        self.assertEqual(self.api.post(url).status_code, 200)
+        self.assertEqual(self.api.post(url).status_code, 400)
+        self.assertEqual(self._cobros(self.reserva), 1)
+
+    def test_transicion_con_estado_desactualizado(self):
+        vieja = ReservaAreaComun.objects.get(pk=self.reserva.pk)
+        self.reserva.confirmar()
+        with self.assertRaises(ValidationError) as contexto:
+            vieja.confirmar()
+        self.assertEqual(contexto.exception.code, 'conflicto')
+        self.assertEqual(self._cobros(self.reserva), 1)
+
+    def test_cancelar_elimina_el_cobro(self):
+        self.reserva.confirmar()
+        self.assertEqual(self._cobros(self.reserva), 1)
+        response = self.api.post(reverse('reserva-cancelar', args=[self.reserva.id]))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self._cobros(self.reserva), 0)
+        reserva = ReservaAreaComun.objects.get(pk=self.reserva.pk)
+        self.assertEqual((reserva.estado, reserva.detalle_cuota_id), ('cancelada', None))
+
+    def test_sin_residencia_no_confirma(self):
+        reserva = ReservaAreaComun.objects.create(
+            area_comun=self.area, residente=self.sin_residencia, fecha=self.reserva.fecha,
+            hora_inicio=hora(14), hora_fin=hora(16),
+        )
+        response = self.api.post(reverse('reserva-confirmar', args=[reserva.id]))
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(ReservaAreaComun.objects.get(pk=reserva.pk).estado, 'pendiente')
+
+    def test_residente_no_completa(self):
+        self.reserva.confirmar()
+        response = _cliente(self.residente.usuario).post(reverse('reserva-completar', args=[self.reserva.id]))
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(ReservaAreaComun.objects.get(pk=self.reserva.pk).estado, 'reservada')
+
+    def test_anonimo_no_confirma_ni_completa(self):
+        self.assertEqual(self.client.post(reverse('reserva-confirmar', args=[self.reserva.id])).status_code, 401)
+        self.reserva.confirmar()
+        self.assertEqual(self.client.post(reverse('reserva-completar', args=[self.reserva.id])).status_code, 401)
+        self.assertEqual(ReservaAreaComun.objects.get(pk=self.reserva.pk).estado, 'reservada')
+
+
+class ReservaRecurrenteTests(TestCase):
+    """Expansión de la serie en memoria y reparto entre creadas y en conflicto"""
+
+    @classmethod
+    def setUpTestData(cls):
+        rol = Rol.objects.create(nombre='Residente')
+        cls.residente = _crear_residente(rol, 'rr1')
+        cls.area = AreaComun.objects.create(nombre='Cancha', tipo='cancha')
+        cls.fecha = date.today() + timedelta(days=7)
+
+    def setUp(self):
+        self.api = APIClient()
+        self.api.force_authenticate(self.residente.usuario)
+
+    def _serie(self, semanas):
+        return self.api.post(reverse('reserva-recurrente'), {
+            'area_comun': self.area.id, 'fecha': self.fecha, 'hora_inicio': '18:00', 'hora_fin': '20:00',
+            'frecuencia': 'semanal', 'fecha_fin': self.fecha + timedelta(weeks=semanas),
+        }, format='json')
+
+    def test_mensual_ajusta_al_ultimo_dia(self):
+        fechas = expandir_fechas(date(2026, 1, 31), date(2026, 6, 30), 'mensual')
+        self.assertEqual(fechas, [
+            date(2026, 1, 31), date(2026, 2, 28), date(2026, 3, 31),
+            date(2026, 4, 30), date(2026, 5, 31), date(2026, 6, 30),
+        ])
+
+    def test_semanal_incluye_fecha_fin(self):
+        fechas = expandir_fechas(date(2026, 3, 3), date(2026, 3, 24), 'semanal')
+        self.assertEqual(fechas, [date(2026, 3, 3), date(2026, 3, 10), date(2026, 3, 17), date(2026, 3, 24)])
+        self.assertEqual(len(expandir_fechas(date(2026, 3, 3), date(2026, 3, 23), 'semanal')), 3)
+
+    @override_settings(RESERVAS_SERIE_MAXIMO=3)
+    def test_serie_supera_el_maximo(self):
+        response = self._serie(3)
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(ReservaAreaComun.objects.filter(area_comun=self.area).exists())
+
+    def test_conflictos_parciales(self):
+        ocupada = self.fecha + timedelta(weeks=1)
+        ReservaAreaComun.objects.create(
+            area_comun=self.area, residente=self.residente, fecha=ocupada,
+            hora_inicio=hora(19), hora_fin=hora(21),
+        )
+        response = self._serie(3)
+        self.assertEqual(response.status_code, 201)
+        datos = response.json()
+        self.assertEqual((datos['creadas'], datos['en_conflicto']), (3, 1))
+        self.assertEqual([c['fecha'] for c in datos['conflictos']], [ocupada.isoformat()])
+        self.assertEqual(ReservaAreaComun.objects.filter(area_comun=self.area).count(), 4)
+
+    def test_todas_en_conflicto(self):
+        ReservaAreaComun.objects.create(
+            area_comun=self.area, residente=self.residente, fecha=self.fecha,
+            hora_inicio=hora(17), hora_fin=hora(19),
+        )
+        response = self._serie(0)
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()['en_conflicto'], 1)
+
+
+class PrincipalResidenciaTests(TestCase):
+    """El principal trae la residencia vigente y se invalida recién al confirmar"""
+
+    @classmethod
+    def setUpTestData(cls):
+        rol = Rol.objects.create(nombre='Residente')
+        cls.residente = _crear_residente(rol, 'pr1')
+        # Residencias dadas de baja (soft delete) que siguen marcadas como activas
+        for codigo in ('PR-1', 'PR-2'):
+            Residencia.objects.create(residente=cls.residente, unidad=_crear_unidad(codigo), tipo_contrato='propiedad',
+                                      fecha_inicio='2026-01-01', esta_activo=False)
+        cls.vigente = Residencia.objects.create(residente=cls.residente, unidad=_crear_unidad('PR-3'),
+                                                tipo_contrato='propiedad', fecha_inicio='2025-01-01')
+
+    def test_residencia_activa_es_la_vigente(self):
+        usuario = cargar_principal(self.residente.usuario_id)
+        self.assertEqual(usuario.residencia_activa.pk, self.vigente.pk)
+
+    def test_invalidacion_al_confirmar(self):
+        usuario_id = self.residente.usuario_id
+        obtener_principal(usuario_id)
+        with self.captureOnCommitCallbacks(execute=True):
+            Residencia.objects.get(pk=self.vigente.pk).save()
+            self.assertIsNotNone(cache.get(_cache_key(usuario_id)))
+        self.assertIsNone(cache.get(_cache_key(usuario_id)))
+
+
+class DirectorioOffsetTests(TestCase):
+    """El offset del directorio tiene tope: cada página lee offset + limit filas por fuente"""
+
+    @classmethod
+    def setUpTestData(cls):
+        rol = Rol.objects.create(nombre='Residente')
+        for sufijo in ('do1', 'do2', 'do3'):
+            _crear_residente(rol, sufijo)
+
+    def _buscar(self, offset, limit=1):
+        return self.client.get(reverse('directorio-busqueda'), {'q': 'Nombredo', 'offset': offset, 'limit': limit})
+
+    @override_settings(DIRECTORIO_OFFSET_MAXIMO=1)
+    def test_offset_recortado(self):
+        response = self._buscar(10 ** 9)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['resultados']), 1)
+        self.assertIsNone(response.data['siguiente_offset'])
+
+    @override_settings(DIRECTORIO_OFFSET_MAXIMO=1)
+    def test_sin_siguiente_pasado_el_tope(self):
+        self.assertEqual(self._buscar(0).data['siguiente_offset'], 1)
+        self.assertIsNone(self._buscar(1).data['siguiente_offset'])
+
+
+class ReservaSolapadasMigracionTests(TestCase):
+    """0009 cancela las reservas superpuestas que ya existían antes de crear la restricción"""
+
+    def test_cancela_las_solapadas(self):
+        migracion = import_module('condominio.migrations.0009_reserva_sin_solapamiento')
+        residente = _crear_residente(Rol.objects.create(nombre='Residente'), 'ms1')
+        area = AreaComun.objects.create(nombre='Piscina', tipo='piscina')
+        fecha = date.today() + timedelta(days=3)
+        with connection.cursor() as cursor:
+            cursor.execute(f'ALTER TABLE {ReservaAreaComun._meta.db_table} DROP CONSTRAINT reserva_area_sin_solapamiento')
+
+        def reservar(inicio, fin, estado='pendiente'):
+            return ReservaAreaComun.objects.create(area_comun=area, residente=residente, fecha=fecha,
+                                                   hora_inicio=hora(inicio), hora_fin=hora(fin), estado=estado)
+        antigua = reservar(10, 12)
+        confirmada = reservar(11, 13, 'reservada')
+        libre = reservar(13, 14)
+        solapada = reservar(12, 14)
+
+        with self.assertLogs(migracion.__name__, 'WARNING') as logs:
+            migracion.cancelar_solapadas(apps, None)
+
+        estados = dict(ReservaAreaComun.objects.values_list('id', 'estado'))
+        self.assertEqual(estados[confirmada.id], 'reservada')
+        self.assertEqual(estados[libre.id], 'pendiente')
+        self.assertEqual((estados[antigua.id], estados[solapada.id]), ('cancelada', 'cancelada'))
+        self.assertEqual(len(logs.records), 2)
+
+
+class ResidenciasDuplicadasMigracionTests(TestCase):
+    """0006 deja activa solo la residencia más reciente por unidad y por residente"""
+
+    def test_desactiva_las_duplicadas(self):
+        migracion = import_module('condominio.migrations.0006_residencia_activa_constraints')
+        rol = Rol.objects.create(nombre='Residente')
+        ana, beto = _crear_residente(rol, 'md1'), _crear_residente(rol, 'md2')
+        unidad, otra = _crear_unidad('MD-1'), _crear_unidad('MD-2')
+        with connection.cursor() as cursor:
+            for nombre in ('residencia_unidad_activa_unica', 'residencia_residente_activa_unica'):
+                cursor.execute(f'DROP INDEX {nombre}')  # las únicas parciales son índices
+
+        def residencia(residente, unidad, fecha_inicio):
+            return Residencia.objects.create(residente=residente, unidad=unidad, tipo_contrato='propiedad',
+                                             fecha_inicio=fecha_inicio)
+        vieja = residencia(ana, unidad, '2024-01-01')
+        nueva = residencia(ana, otra, '2025-01-01')
+        misma_unidad = residencia(beto, otra, '2024-06-01')
+
+        with self.assertLogs(migracion.__name__, 'WARNING'):
+            migracion.desactivar_duplicadas(apps, None)
+
+        activas = set(Residencia.objects.filter(esta_activa=True).values_list('id', flat=True))
+        self.assertEqual(activas, {nueva.id})
+        self.assertFalse({vieja.id, misma_unidad.id} & activas)
+
+
+class GetCondicionalTests(TestCase):
+    """Con la configuración por defecto las versiones se comparten (cache 'versiones' en la base)"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.area = AreaComun.objects.create(nombre='Gimnasio', tipo='gimnasio')
+
+    def test_304_con_la_version_vigente(self):
+        url = reverse('area-comun-list-create')
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        etag = response['ETag']
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            AreaComun.objects.create(nombre='Sauna', tipo='sauna')
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_404_no_crea_version(self):
+        response = self.client.get(reverse('area-comun-detail', args=[self.area.id + 1000]))
+        self.assertEqual(response.status_code, 404)
+        self.assertIsNone(obtener_version(AreaComun, self.area.id + 1000, crear=False))
+
+
+class JerarquiaCondicionalTests(TestCase):
+    """El árbol responde 304 con la versión vigente y cambia de ETag al modificar una unidad"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.unidad = _crear_unidad('JC-1')
+
+    def test_304_y_nueva_version(self):
+        url = reverse('unidad-jerarquia')
+        etag = self.client.get(url)['ETag']
+        with self.assertNumQueries(1):  # solo la lectura de la versión
+            self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.unidad.nombre = 'Renombrada'
+            self.unidad.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('Renombrada', response.content.decode())
+
+
+class DisponibilidadTests(TestCase):
+    """Sin huecos para áreas no reservables y sin huecos en el pasado"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.area = AreaComun.objects.create(nombre='Terraza', tipo='otro', hora_apertura=hora(8), hora_cierre=hora(22))
+        cls.residente = _crear_residente(Rol.objects.create(nombre='Residente'), 'di1')
+
+    def test_recorta_a_la_hora_actual(self):
+        ahora = timezone.localtime().replace(hour=15, minute=30, second=0, microsecond=0)
+        hoy = ahora.date()
+        ReservaAreaComun.objects.create(area_comun=self.area, residente=self.residente, fecha=hoy,
+                                        hora_inicio=hora(18), hora_fin=hora(20))
+        dias = obtener_disponibilidad(self.area, hoy - timedelta(days=1), hoy + timedelta(days=1), ahora)['dias']
+        self.assertEqual([d['libres'] for d in dias], [
+            [],
+            [{'hora_inicio': '15:30:00', 'hora_fin': '18:00:00'}, {'hora_inicio': '20:00:00', 'hora_fin': '22:00:00'}],
+            [{'hora_inicio': '08:00:00', 'hora_fin': '22:00:00'}],
+        ])
+
+    def test_area_en_mantenimiento_sin_huecos(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.area.estado = 'mantenimiento'
+            self.area.save()
+        fecha = date.today() + timedelta(days=1)
+        disponibilidad = obtener_disponibilidad(self.area, fecha, fecha + timedelta(days=2))
+        self.assertFalse(disponibilidad['reservable'])
+        self.assertTrue(all(dia['libres'] == [] for dia in disponibilidad['dias']))
+
+
+class UnidadTransicionMasivaTests(TestCase):
+    """Un solo UPDATE para todas las unidades; las residencias dadas de baja no bloquean"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.unidades = [_crear_unidad(f"TM-{i}") for i in range(3)]
+        residente = _crear_residente(Rol.objects.create(nombre='Residente'), 'tm1')
+        Residencia.objects.create(residente=residente, unidad=cls.unidades[0], tipo_contrato='propiedad',
+                                  fecha_inicio='2025-01-01', esta_activo=False)
+        cls.ocupada = _crear_unidad('TM-X')
+        Residencia.objects.create(residente=_crear_residente(Rol.objects.get(nombre='Residente'), 'tm2'),
+                                  unidad=cls.ocupada, tipo_contrato='propiedad', fecha_inicio='2025-01-01')
+
+    def test_un_solo_update(self):
+        ids = [u.id for u in self.unidades] + [self.ocupada.id]
+        with CaptureQueriesContext(connection) as consultas:
+            response = self.client.post(reverse('unidad-transicion-masiva'),
+                                        {'accion': 'desactivar', 'ids': ids}, content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual((response.data['actualizadas'], response.data['rechazadas']), (3, 1))
+        updates = [q['sql'] for q in consultas.captured_queries if q['sql'].startswith('UPDATE')]
+        self.assertEqual(len(updates), 1)
+        self.assertEqual(Unidad.objects.filter(id__in=ids, esta_activa=False).count(), 3)
+
+
+class HabitantesLoteTests(TestCase):
+    """Alta en lote: todo o nada, y solo sobre residencias activas"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.residente = _crear_residente(Rol.objects.create(nombre='Residente'), 'LT')
+        cls.unidad = _crear_unidad('LT-1')
+
+    def setUp(self):
+        self.residencia = Residencia.objects.create(residente=self.residente, unidad=self.unidad,
+                                                    tipo_contrato='propiedad', fecha_inicio='2025-01-01')
+        self.url = reverse('residencia-habitantes-lote', args=[self.residencia.id])
+
+    def _contador(self):
+        return Residencia.objects.values_list('cantidad_ocupantes', flat=True).get(pk=self.residencia.pk)
+
+    def test_fila_invalida_no_crea_ninguno(self):
+        filas = [
+            {'nombre': 'Luis', 'apellido': 'Paz', 'tipo_parentesco': 'hijo', 'ci': 'H-1'},
+            {'nombre': 'Eva', 'apellido': 'Paz', 'tipo_parentesco': 'conyuge', 'ci': 'H-1'},
+        ]
+        response = self.client.post(self.url, {'habitantes': filas}, content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['habitantes'][0], {})
+        self.assertIn('ci', response.data['habitantes'][1])
+        self.assertFalse(Habitante.objects.filter(residencia=self.residencia).exists())
+        self.assertEqual(self._contador(), 0)
+
+    def test_lote_valido_ajusta_contador(self):
+        filas = [
+            {'nombre': 'Luis', 'apellido': 'Paz', 'tipo_parentesco': 'hijo', 'ci': 'H-1'},
+            {'nombre': 'Eva', 'apellido': 'Paz', 'tipo_parentesco': 'conyuge', 'ci': 'H-2'},
+        ]
+        response = self.client.post(self.url, {'habitantes': filas}, content_type='application/json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['creados'], 2)
+        self.assertEqual(self._contador(), 2)
+
+    def test_residencia_inactiva_se_rechaza(self):
+        Residencia.objects.filter(pk=self.residencia.pk).update(esta_activa=False)
+        filas = [{'nombre': 'Luis', 'apellido': 'Paz', 'tipo_parentesco': 'hijo'}]
+        response = self.client.post(self.url, {'habitantes': filas}, content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(Habitante.objects.filter(residencia=self.residencia).exists())
+        self.assertEqual(self._contador(), 0)
+
+
+class ResidenciaPeriodoTests(TestCase):
+    """Consultas por período de contrato y el arreglo de 0007 para fechas invertidas"""
+
+    @classmethod
+    def setUpTestData(cls):
+        rol = Rol.objects.create(nombre='Residente')
+        cls.ana, cls.beto = _crear_residente(rol, 'pe1'), _crear_residente(rol, 'pe2')
+        cls.unidad, cls.otra = _crear_unidad('PE-1'), _crear_unidad('PE-2')
+
+    def _residencia(self, residente, unidad, inicio, fin=None, **extra):
+        return Residencia.objects.create(residente=residente, unidad=unidad, tipo_contrato='propiedad',
+                                         fecha_inicio=inicio, fecha_fin=fin, **extra)
+
+    def test_vigentes_en_y_entre(self):
+        cerrada = self._residencia(self.ana, self.unidad, date(2024, 1, 1), date(2024, 6, 30), esta_activa=False)
+        abierta = self._residencia(self.beto, self.otra, date(2024, 6, 1))
+        borrada = self._residencia(self.ana, self.otra, date(2024, 1, 1), date(2024, 12, 31),
+                                   esta_activa=False, esta_activo=False)
+
+        def ids(queryset):
+            return set(queryset.values_list('id', flat=True))
+
+        self.assertEqual(ids(residencias_vigentes_en(date(2024, 6, 30))), {cerrada.id, abierta.id})
+        self.assertEqual(ids(residencias_vigentes_en(date(2024, 7, 1))), {abierta.id})
+        self.assertEqual(ids(residencias_vigentes_entre(date(2023, 1, 1), date(2024, 1, 1))), {cerrada.id})
+        self.assertEqual(ids(residencias_vigentes_entre(date(2024, 5, 1), date(2024, 5, 31))), {cerrada.id})
+        self.assertEqual(ids(residencias_vigentes_entre(date(2030, 1, 1), date(2030, 1, 2))), {abierta.id})
+        self.assertNotIn(borrada.id, ids(residencias_vigentes_entre(date(2024, 1, 1), date(2024, 12, 31))))
+
+    def test_migracion_anula_fechas_invertidas(self):
+        migracion = import_module('condominio.migrations.0007_residencia_periodo_indexes')
+        with connection.cursor() as cursor:
+            cursor.execute(f'ALTER TABLE {Residencia._meta.db_table} DROP CONSTRAINT residencia_fechas_validas')
+            for nombre in ('residencia_unidad_periodo_gist', 'residencia_periodo_gist'):
+                cursor.execute(f'DROP INDEX {nombre}')  # la migración corre antes de crearlos
+        invertida = self._residencia(self.ana, self.unidad, date(2025, 3, 1), date(2025, 1, 31))
+        valida = self._residencia(self.beto, self.otra, date(2025, 1, 1), date(2025, 12, 31))
+
+        with self.assertLogs(migracion.__name__, 'WARNING') as logs:
+            migracion.corregir_fechas_invertidas(apps, None)
+
+        fechas = dict(Residencia.objects.values_list('id', 'fecha_fin'))
+        self.assertIsNone(fechas[invertida.id])
+        self.assertEqual(fechas[valida.id], date(2025, 12, 31))
+        self.assertIn(f"{invertida.id} (2025-03-01 > 2025-01-31)", logs.output[0])
+
+
+class OcupacionTests(TestCase):
+    """Conteos de ocupación cacheados: se recalculan solo tras confirmar un cambio que cuenta"""
+
+    def setUp(self):
+        cache.clear()
+        self.unidad = _crear_unidad('OC-1')
+        _crear_unidad('OC-2')
+
+    def _ocupacion(self):
+        response = self.client.get(reverse('unidad-ocupacion'))
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_cambio_de_estado_invalida_los_conteos(self):
+        self.assertEqual(self._ocupacion()['por_estado'], {'disponible': 2})
+        with self.assertNumQueries(1):  # solo la lectura de la versión compartida
+            self._ocupacion()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.unidad.estado = 'ocupada'
+            self.unidad.save()
+        resumen = self._ocupacion()
+        self.assertEqual(resumen['total'], 2)
+        self.assertEqual(resumen['por_estado'], {'disponible': 1, 'ocupada': 1})
+        self.assertEqual(list(resumen['por_estado']), ['disponible', 'ocupada'])
+
+    def test_cambio_que_no_cuenta_no_invalida(self):
+        self._ocupacion()
+        version = version_ocupacion()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.unidad.dimensiones = '90m2'
+            self.unidad.save()
+        self.assertEqual(version_ocupacion(), version)
+
+    def test_payload_sin_counter(self):
+        resumen = self._ocupacion()
+        nodos = [resumen, *resumen['por_tipo'].values()]
+        for edificio in resumen['por_edificio']:
+            nodos += [edificio, *edificio['pisos']]
+        for nodo in nodos:
+            self.assertIs(type(nodo['por_estado']), dict)
+        json.dumps(resumen)
+
+
+class ImportacionUnidadesTests(TestCase):
+    """Importación por lotes: una verificación de códigos y un INSERT por lote, errores por fila"""
+
+    def _csv(self, *filas):
+        return ['tipo_unidad,codigo,edificio,numero,dimensiones,ubicacion\n', *[f"{fila}\n" for fila in filas]]
+
+    def test_lotes(self):
+        self.assertEqual(list(lotes(iter(range(5)), 2)), [[0, 1], [2, 3], [4]])
+        self.assertEqual(list(lotes([], 2)), [])
+
+    def test_consultas_por_lote(self):
+        filas = [f"departamento,IM-{i},Torre A,{i},80m2,Condominio" for i in range(5)]
+        with CaptureQueriesContext(connection) as consultas:
+            reporte = importar_unidades(self._csv(*filas), 'csv', tamano_lote=2)
+        self.assertEqual((reporte['creados'], reporte['con_errores']), (5, 0))
+        sql = [q['sql'] for q in consultas.captured_queries]
+        self.assertEqual(len([q for q in sql if q.startswith('INSERT')]), 3)
+        self.assertEqual(len([q for q in sql if q.startswith('SELECT')]), 3)
+
+    def test_errores_por_fila(self):
+        _crear_unidad('IM-EXISTE')
+        reporte = importar_unidades(self._csv(
+            'departamento,IM-1,Torre A,1,80m2,Condominio',
+            'departamento,IM-1,Torre A,2,80m2,Condominio',   # repetido en el archivo
+            'departamento,IM-EXISTE,Torre A,3,80m2,Condominio',
+            'departamento,IM-2,,4,80m2,Condominio',          # falta edificio
+            'casa,IM-3,Torre A,5,200m2,Condominio',          # casa con edificio
+        ), 'csv', tamano_lote=2)
+        self.assertEqual(reporte['creados'], 1)
+        self.assertEqual([error['fila'] for error in reporte['errores']], [2, 3, 4, 5])
+        self.assertIn('codigo', reporte['errores'][0]['errores'])
+        self.assertIn('tipo_unidad', reporte['errores'][2]['errores'])
+        self.assertTrue(Unidad.objects.filter(codigo='IM-1').exists())
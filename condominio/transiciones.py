@@ -0,0 +1,106 @@
+# condominio/transiciones.py
+from django.db import transaction
+from django.db.models import Case, F, Value, When
+
+from utils.versiones import registrar_cambios
+from .models import Unidad, Residencia
+from .ocupacion import invalidar_ocupacion
+from .jerarquia import invalidar_jerarquia
+
+
+ACCIONES = ('activar', 'desactivar', 'mantenimiento')
+
+MOTIVO_RESIDENCIAS = "Tiene residencias activas. Desactive las residencias primero."
+MOTIVO_INACTIVA = "La unidad está desactivada"
+
+
+def _evaluar(accion, unidad, ocupada):
+    """Devuelve (resultado, motivo) para una unidad; sin consultas"""
+    if accion == 'activar':
+        if unidad['esta_activa'] and unidad['estado'] != 'mantenimiento':
+            return 'sin_cambios', None
+        return 'actualizada', None
+
+    if accion == 'desactivar':
+        if not unidad['esta_activa']:
+            return 'sin_cambios', None
+        if ocupada:
+            return 'rechazada', MOTIVO_RESIDENCIAS
+        return 'actualizada', None
+
+    # mantenimiento
+    if unidad['estado'] == 'mantenimiento':
+        return 'sin_cambios', None
+    if not unidad['esta_activa']:
+        return 'rechazada', MOTIVO_INACTIVA
+    if ocupada:
+        return 'rechazada', MOTIVO_RESIDENCIAS
+    return 'actualizada', None
+
+
+def _cambios(accion):
+    if accion == 'activar':
+        # Activar también saca de mantenimiento: la unidad vuelve a estar en servicio
+        return {
+            'esta_activa': True,
+            'estado': Case(When(estado='mantenimiento', then=Value('disponible')), default=F('estado')),
+        }
+    if accion == 'desactivar':
+        return {'esta_activa': False}
+    return {'estado': 'mantenimiento'}
+
+
+def transicionar_unidades(accion, queryset, ids_pedidos=None):
+    """
+    Aplica `accion` a todas las unidades del queryset en una transacción:
+    bloquea las filas (1 consulta), busca las que tienen residencias activas (1 consulta)
+    y actualiza las que corresponden con un solo UPDATE.
+    Devuelve el resumen con el resultado de cada unidad.
+    """
+    with transaction.atomic():
+        unidades = list(
+            queryset.select_for_update()
+            .order_by('id')
+            .values('id', 'codigo', 'esta_activa', 'estado')
+        )
+        ids = [u['id'] for u in unidades]
+        # Mismo criterio que residencia_unidad_activa_unica: las dadas de baja no ocupan
+        ocupadas = set(
+            Residencia.objects.filter(unidad_id__in=ids, esta_activa=True, esta_activo=True)
+            .values_list('unidad_id', flat=True)
+        )
+
+        resultados = []
+        actualizar = []
+        for unidad in unidades:
+            resultado, motivo = _evaluar(accion, unidad, unidad['id'] in ocupadas)
+            item = {"id": unidad['id'], "codigo": unidad['codigo'], "resultado": resultado}
+            if motivo:
+                item["motivo"] = motivo
+            resultados.append(item)
+            if resultado == 'actualizada':
+                actualizar.append(unidad['id'])
+
+        if actualizar:
+            Unidad.objects.filter(id__in=actualizar).update(**_cambios(accion))
+            # update() no dispara señales: se invalidan a mano las vistas derivadas de Unidad
+            transaction.on_commit(invalidar_ocupacion)
+            transaction.on_commit(invalidar_jerarquia)
+            transaction.on_commit(lambda: registrar_cambios(Unidad, actualizar))
+
+    encontrados = set(ids)
+    for id_pedido in ids_pedidos or []:
+        if id_pedido not in encontrados:
+            resultados.append({"id": id_pedido, "codigo": None, "resultado": 'no_encontrada'})
+
+    conteo = {clave: 0 for clave in ('actualizada', 'sin_cambios', 'rechazada', 'no_encontrada')}
+    for item in resultados:
+        conteo[item['resultado']] += 1
+    return {
+        "accion": accion,
+        "actualizadas": conteo['actualizada'],
+        "sin_cambios": conteo['sin_cambios'],
+        "rechazadas": conteo['rechazada'],
+        "no_encontradas": conteo['no_encontrada'],
+        "resultados": resultados,
+    }
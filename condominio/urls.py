@@ -2,11 +2,13 @@
 from django.urls import path
 from .views import (
     UnidadListCreateAPIView, UnidadDetailAPIView, UnidadToggleActivaAPIView, UnidadHardDeleteAPIView,
-    ResidenciaListCreateAPIView, ResidenciaDetailAPIView, ResidenciaToggleActivaAPIView,
-    ResidenciaHabitantesListAPIView, UnidadResidenciasListAPIView,
-    HabitanteDetailAPIView, HabitanteToggleActivaAPIView, AreaComunDetailAPIView, 
+    UnidadOcupacionAPIView, UnidadJerarquiaAPIView, UnidadImportarAPIView, UnidadTransicionMasivaAPIView,
+    ResidenciaListCreateAPIView, ResidenciaDetailAPIView, ResidenciaToggleActivaAPIView, ResidenciaVigentesAPIView,
+    ResidenciaHabitantesListAPIView, ResidenciaHabitantesLoteAPIView, UnidadResidenciasListAPIView,
+    HabitanteDetailAPIView, HabitanteToggleActivaAPIView, AreaComunDetailAPIView, AreaComunDisponibilidadAPIView,
     AreaComunListCreateAPIView, ReservaAreaComunListCreateAPIView, ReservaAreaComunDetailAPIView,
-    CancelarReservaAPIView, ConfirmarReservaAPIView
+    CancelarReservaAPIView, ConfirmarReservaAPIView, CompletarReservaAPIView, ReservaRecurrenteAPIView,
+    DirectorioBusquedaAPIView
 )
 
 urlpatterns = [
@@ -26,11 +28,26 @@ urlpatterns = [
     path('unidades/<int:pk>/hard-delete/', UnidadHardDeleteAPIView.as_view(), name='unidad-hard-delete'),  
     # DELETE: Eliminar unidad y todas sus residencias/habitantes (forzado)
 
+    path('unidades/transicion/', UnidadTransicionMasivaAPIView.as_view(), name='unidad-transicion-masiva'),
+    # POST: Activar/desactivar/mantenimiento en lote (ids y/o filtros exactos)
+
+    path('unidades/importar/', UnidadImportarAPIView.as_view(), name='unidad-importar'),
+    # POST: Alta masiva desde archivo (multipart: archivo, formato=csv|ndjson|json)
+
+    path('unidades/ocupacion/', UnidadOcupacionAPIView.as_view(), name='unidad-ocupacion'),
+    # GET: Conteos de ocupación por estado, tipo, edificio y piso
+
+    path('unidades/jerarquia/', UnidadJerarquiaAPIView.as_view(), name='unidad-jerarquia'),
+    # GET: Árbol edificio -> piso -> unidades (ETag / If-None-Match)
+
     # Residencias
     path('residencias/', ResidenciaListCreateAPIView.as_view(), name='residencia-list-create'),  
     # GET: Listar residencias
     # POST: Crear residencia
 
+    path('residencias/vigentes/', ResidenciaVigentesAPIView.as_view(), name='residencia-vigentes'),
+    # GET: Historial temporal (?fecha= o ?desde=&hasta=, con unidad/residente/tipo_contrato)
+
     path('residencias/<int:pk>/', ResidenciaDetailAPIView.as_view(), name='residencia-detail'),  
     # GET: Detalle de residencia
     # PATCH: Actualizar residencia
@@ -44,6 +61,9 @@ urlpatterns = [
     # GET: Listar habitantes de una residencia
     # POST: Crear habitante en una residencia
 
+    path('residencias/<int:residencia_id>/habitantes/lote/', ResidenciaHabitantesLoteAPIView.as_view(), name='residencia-habitantes-lote'),
+    # POST: Registrar un grupo familiar completo (todo o nada)
+
     path('residencias/<int:residencia_id>/habitantes/<int:pk>/', HabitanteDetailAPIView.as_view(), name='habitante-detail'),  
     # GET: Detalle de habitante
     # PATCH: Actualizar habitante
@@ -56,6 +76,10 @@ urlpatterns = [
     path('unidades/<int:unidad_id>/residencias/', UnidadResidenciasListAPIView.as_view(), name='unidad-residencias'),  
     # GET: Listar residencias de una unidad
 
+    # Directorio (búsqueda de residentes y habitantes)
+    path('directorio/', DirectorioBusquedaAPIView.as_view(), name='directorio-busqueda'),
+    # GET: ?q=<texto>&limit=&offset=
+
     # Áreas comunes
     path('areas-comunes/', AreaComunListCreateAPIView.as_view(), name='area-comun-list-create'),  
     # GET: Listar áreas comunes
@@ -64,8 +88,14 @@ urlpatterns = [
     path('areas-comunes/<int:pk>/', AreaComunDetailAPIView.as_view(), name='area-comun-detail'),  
     # GET: Detalle de área común
     # PATCH: Actualizar área común
+
+    path('areas-comunes/<int:pk>/disponibilidad/', AreaComunDisponibilidadAPIView.as_view(), name='area-comun-disponibilidad'),
+    # GET: Horarios libres por día (?desde=&hasta=)
+
     path('reservas/', ReservaAreaComunListCreateAPIView.as_view(), name='reserva-list-create'),
+    path('reservas/recurrentes/', ReservaRecurrenteAPIView.as_view(), name='reserva-recurrente'),
     path('reservas/<int:pk>/', ReservaAreaComunDetailAPIView.as_view(), name='reserva-detail'),
     path('reservas/<int:pk>/confirmar/', ConfirmarReservaAPIView.as_view(), name='reserva-confirmar'),
     path('reservas/<int:pk>/cancelar/', CancelarReservaAPIView.as_view(), name='reserva-cancelar'),
+    path('reservas/<int:pk>/completar/', CompletarReservaAPIView.as_view(), name='reserva-completar'),
 ]    
@@ -1,15 +1,38 @@
 # condominio/views.py
+import uuid
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
+from django.conf import settings
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.http import HttpResponse
 from django.shortcuts import get_object_or_404
+from django.db import IntegrityError, transaction
 from django.db.models import Q
+from utils.auth import jwt_auth_required
+from utils.pagination import PaginacionKeysetMixin
 from .models import Unidad, Residencia, Habitante, AreaComun, ReservaAreaComun
 from .serializers import UnidadSerializer, ResidenciaSerializer, HabitanteSerializer
-from .serializers import HabitanteCreateSerializer, AreaComunSerializer
+from .serializers import HabitanteCreateSerializer, HabitanteLoteSerializer, AreaComunSerializer
 from .serializers import ReservaAreaComunSerializer, ReservaAreaComunCreateSerializer, ReservaAreaComunUpdateSerializer
+from .serializers import DirectorioResultadoSerializer, UnidadTransicionSerializer, VigenciaConsultaSerializer
+from .serializers import DisponibilidadConsultaSerializer, ReservaRecurrenteSerializer
+from .directorio import buscar_directorio
+from .ocupacion import obtener_ocupacion
+from .jerarquia import version_jerarquia, obtener_jerarquia
+from .importacion import importar_unidades, FORMATOS
+from .transiciones import transicionar_unidades
+from .temporal import residencias_vigentes_en, residencias_vigentes_entre
+from .ocupantes import ajustar_ocupantes
+from .disponibilidad import obtener_disponibilidad
+from .recurrencia import reservar_serie
+from utils.condicional import etag_de, no_modificado, respuesta_no_modificada, aplicar_validadores, get_condicional
+from utils.versiones import cache_compartido
 # Unidad Views
-class UnidadListCreateAPIView(APIView):
+class UnidadListCreateAPIView(PaginacionKeysetMixin, APIView):
+    ordering_paginacion = 'id'
+
+    @get_condicional(Unidad)
     def get(self, request):
         unidades = Unidad.objects.all()
         
@@ -44,8 +67,7 @@ class UnidadListCreateAPIView(APIView):
                 Q(edificio__icontains=search)
             )
         
-        serializer = UnidadSerializer(unidades, many=True)
-        return Response(serializer.data)
+        return self.paginar(unidades, UnidadSerializer)
 
     def post(self, request):
         serializer = UnidadSerializer(data=request.data)
@@ -55,6 +77,7 @@ class UnidadListCreateAPIView(APIView):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 class UnidadDetailAPIView(APIView):
+    @get_condicional(Unidad)
     def get(self, request, pk):
         unidad = get_object_or_404(Unidad, pk=pk)
         serializer = UnidadSerializer(unidad)
@@ -93,7 +116,7 @@ class UnidadToggleActivaAPIView(APIView):
         
         # Si vamos a desactivar, verificar residencias activas
         if unidad.esta_activa:
-            residencias_activas = unidad.residencias.filter(esta_activa=True)
+            residencias_activas = unidad.residencias.filter(esta_activa=True, esta_activo=True)
             if residencias_activas.exists():
                 return Response(
                     {"error": "No se puede desactivar una unidad con residencias activas. Desactive las residencias primero."},
@@ -114,6 +137,27 @@ class UnidadToggleActivaAPIView(APIView):
             "message": f"Unidad {unidad.codigo} {'activada' if unidad.esta_activa else 'desactivada'}"
         })
 
+class UnidadTransicionMasivaAPIView(APIView):
+    """
+    Activa, desactiva o pone en mantenimiento muchas unidades a la vez (p. ej. una torre).
+    Todo en una transacción; responde el resultado de cada unidad.
+    """
+    def post(self, request):
+        serializer = UnidadTransicionSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        datos = serializer.validated_data
+
+        unidades = Unidad.objects.all()
+        if datos.get('ids'):
+            unidades = unidades.filter(id__in=datos['ids'])
+        filtros = {campo: datos[campo] for campo in UnidadTransicionSerializer.FILTROS if campo in datos}
+        if filtros:
+            unidades = unidades.filter(**filtros)
+
+        resumen = transicionar_unidades(datos['accion'], unidades, ids_pedidos=datos.get('ids'))
+        return Response(resumen)
+
 class UnidadHardDeleteAPIView(APIView):
     """HARD DELETE forzado - Elimina incluso con residencias (PELIGROSO)"""
     def delete(self, request, pk):
@@ -128,12 +172,96 @@ class UnidadHardDeleteAPIView(APIView):
             status=status.HTTP_204_NO_CONTENT
         )
 
+class UnidadImportarAPIView(APIView):
+    """
+    Alta masiva de unidades desde un archivo CSV, NDJSON o JSON (arreglo).
+    multipart: archivo=<archivo>, formato=csv|ndjson|json (por defecto según la extensión)
+    """
+    def post(self, request):
+        archivo = request.FILES.get('archivo')
+        if not archivo:
+            return Response({"error": "Debe enviar un archivo en el campo 'archivo'"}, status=status.HTTP_400_BAD_REQUEST)
+
+        formato = request.data.get('formato')
+        if not formato:
+            if archivo.name.endswith(('.ndjson', '.jsonl')):
+                formato = 'ndjson'
+            elif archivo.name.endswith('.json'):
+                formato = 'json'
+            else:
+                formato = 'csv'
+        if formato not in FORMATOS:
+            return Response({"error": "Formato no soportado. Use csv, ndjson o json"}, status=status.HTTP_400_BAD_REQUEST)
+
+        lineas = (linea.decode('utf-8-sig') for linea in archivo)
+        reporte = importar_unidades(lineas, formato)
+
+        codigo = status.HTTP_201_CREATED if reporte['creados'] else status.HTTP_400_BAD_REQUEST
+        return Response(reporte, status=codigo)
+
+class UnidadOcupacionAPIView(APIView):
+    """Tablero de ocupación: conteos por estado, tipo, edificio y piso (cacheado)"""
+    def get(self, request):
+        return Response(obtener_ocupacion())
+
+class UnidadJerarquiaAPIView(APIView):
+    """
+    Árbol edificio -> piso -> unidades con conteos por nodo. El JSON se materializa
+    por versión; con If-None-Match de la versión vigente responde 304 sin tocar la base.
+    """
+    def get(self, request):
+        version = version_jerarquia()
+        etag = etag_de(version)
+        condicional = cache_compartido()  # solo si 'versiones' es local al proceso (check utils.W001) se omite
+        if condicional and no_modificado(request, etag):
+            return respuesta_no_modificada(etag)
+
+        _, contenido = obtener_jerarquia(version)
+        response = HttpResponse(contenido, content_type='application/json')
+        return aplicar_validadores(response, etag) if condicional else response
+
 # Residencia Views (mantener las existentes y agregar toggles)
-class ResidenciaListCreateAPIView(APIView):
+def filtrar_residencias(residencias, params):
+    """Filtros comunes de los listados de residencias: unidad, residente, tipo_contrato, esta_activa"""
+    unidad = params.get('unidad')
+    if unidad:
+        residencias = residencias.filter(unidad_id=unidad)
+
+    residente = params.get('residente')
+    if residente:
+        residencias = residencias.filter(residente_id=residente)
+
+    tipo_contrato = params.get('tipo_contrato')
+    if tipo_contrato:
+        residencias = residencias.filter(tipo_contrato=tipo_contrato)
+
+    esta_activa = params.get('esta_activa')
+    if esta_activa is not None:
+        esta_activa = esta_activa.lower() in ['true', '1', 'yes']
+        residencias = residencias.filter(esta_activa=esta_activa)
+    return residencias
+
+def _filtros_invalidos(params):
+    """Valida los ids de los filtros antes de consultar (evita un 500 por un UUID mal formado)"""
+    errores = {}
+    if params.get('unidad') and not params['unidad'].isdigit():
+        errores['unidad'] = ["Debe ser un entero"]
+    if params.get('residente'):
+        try:
+            uuid.UUID(params['residente'])
+        except ValueError:
+            errores['residente'] = ["Debe ser un UUID válido"]
+    return errores
+
+class ResidenciaListCreateAPIView(PaginacionKeysetMixin, APIView):
     def get(self, request):
-        residencias = Residencia.objects.all()
-        serializer = ResidenciaSerializer(residencias, many=True)
-        return Response(serializer.data)
+        errores = _filtros_invalidos(request.GET)
+        if errores:
+            return Response(errores, status=status.HTTP_400_BAD_REQUEST)
+
+        residencias = filtrar_residencias(Residencia.objects.all(), request.GET)
+        residencias = ResidenciaSerializer.preparar_queryset(residencias)
+        return self.paginar(residencias, ResidenciaSerializer)
 
     def post(self, request):
         serializer = ResidenciaSerializer(data=request.data)
@@ -142,9 +270,35 @@ class ResidenciaListCreateAPIView(APIView):
             return Response(serializer.data, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
+class ResidenciaVigentesAPIView(PaginacionKeysetMixin, APIView):
+    """
+    Consultas temporales sobre el historial de residencias (índices GiST del período):
+        ?fecha=2025-03-10&unidad=12        -> quién ocupaba la unidad ese día
+        ?fecha=2025-03-10&residente=<uuid> -> dónde vivía el residente ese día
+        ?desde=2025-07-01&hasta=2025-09-30 -> contratos vigentes en algún día del intervalo
+    Acepta además los filtros del listado (tipo_contrato, esta_activa).
+    """
+    def get(self, request):
+        consulta = VigenciaConsultaSerializer(data=request.GET)
+        if not consulta.is_valid():
+            return Response(consulta.errors, status=status.HTTP_400_BAD_REQUEST)
+        errores = _filtros_invalidos(request.GET)
+        if errores:
+            return Response(errores, status=status.HTTP_400_BAD_REQUEST)
+
+        residencias = filtrar_residencias(Residencia.objects.all(), request.GET)
+        datos = consulta.validated_data
+        if 'fecha' in datos:
+            residencias = residencias_vigentes_en(datos['fecha'], residencias)
+        else:
+            residencias = residencias_vigentes_entre(datos['desde'], datos['hasta'], residencias)
+
+        residencias = ResidenciaSerializer.preparar_queryset(residencias)
+        return self.paginar(residencias, ResidenciaSerializer)
+
 class ResidenciaDetailAPIView(APIView):
     def get(self, request, pk):
-        residencia = get_object_or_404(Residencia, pk=pk)
+        residencia = get_object_or_404(ResidenciaSerializer.preparar_queryset(Residencia.objects.all()), pk=pk)
         serializer = ResidenciaSerializer(residencia)
         return Response(serializer.data)
 
@@ -164,9 +318,16 @@ class ResidenciaDetailAPIView(APIView):
 
 class ResidenciaToggleActivaAPIView(APIView):
     def patch(self, request, pk):
-        residencia = get_object_or_404(Residencia, pk=pk)
+        residencia = get_object_or_404(Residencia.objects.select_related('unidad'), pk=pk)
         residencia.esta_activa = not residencia.esta_activa
-        residencia.save()
+        try:
+            with transaction.atomic():
+                residencia.save()
+        except IntegrityError as e:
+            mensaje = residencia.mensaje_conflicto(e)
+            if mensaje is None:
+                raise
+            return Response({"error": mensaje}, status=status.HTTP_400_BAD_REQUEST)
         
         # Actualizar estado de la unidad
         unidad = residencia.unidad
@@ -177,7 +338,7 @@ class ResidenciaToggleActivaAPIView(APIView):
             otras_activas = unidad.residencias.filter(esta_activa=True).exclude(id=residencia.id)
             if not otras_activas.exists():
                 unidad.estado = 'disponible'
-        unidad.save()
+        unidad.save(update_fields=['estado'])
         
         return Response({
             "id": residencia.id,
@@ -244,15 +405,102 @@ class ResidenciaHabitantesListAPIView(APIView):
             return Response(serializer.data, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
+class ResidenciaHabitantesLoteAPIView(APIView):
+    """
+    Alta de un grupo familiar completo: {"habitantes": [{...}, ...]} o el arreglo directo.
+    Todo o nada: si alguna fila tiene errores no se crea ninguna y se responden los
+    errores en la misma posición que las filas enviadas.
+    """
+    def post(self, request, residencia_id):
+        residencia = get_object_or_404(Residencia, pk=residencia_id)
+        if not (residencia.esta_activa and residencia.esta_activo):
+            return Response({"error": "La residencia no está activa"}, status=status.HTTP_400_BAD_REQUEST)
+        filas = request.data.get('habitantes') if isinstance(request.data, dict) else request.data
+        if not isinstance(filas, list) or not filas:
+            return Response({"error": "Envíe una lista no vacía de habitantes"}, status=status.HTTP_400_BAD_REQUEST)
+        if len(filas) > settings.HABITANTES_LOTE_MAXIMO:
+            return Response(
+                {"error": f"Máximo {settings.HABITANTES_LOTE_MAXIMO} habitantes por solicitud"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        serializer = HabitanteLoteSerializer(data=filas, many=True)
+        if not serializer.is_valid():
+            return Response({"habitantes": serializer.errors}, status=status.HTTP_400_BAD_REQUEST)
+        datos = serializer.validated_data
+
+        # CI repetido dentro del grupo o ya registrado en la residencia (una consulta)
+        cis = [fila['ci'] for fila in datos if fila.get('ci')]
+        registrados = set(
+            residencia.habitantes.filter(ci__in=cis, esta_activo=True).values_list('ci', flat=True)
+        ) if cis else set()
+        errores = [{} for _ in datos]
+        vistos = set()
+        for posicion, fila in enumerate(datos):
+            ci = fila.get('ci')
+            if not ci:
+                continue
+            if ci in registrados:
+                errores[posicion] = {"ci": ["Ya hay un habitante activo con este CI en la residencia"]}
+            elif ci in vistos:
+                errores[posicion] = {"ci": ["CI repetido en el grupo"]}
+            vistos.add(ci)
+        if any(errores):
+            return Response({"habitantes": errores}, status=status.HTTP_400_BAD_REQUEST)
+
+        # El titular es el de la residencia para todo el grupo: no hace falta validarlo por fila
+        with transaction.atomic():
+            habitantes = Habitante.objects.bulk_create([
+                Habitante(residencia=residencia, residente_titular_id=residencia.residente_id, **fila)
+                for fila in datos
+            ])
+            # bulk_create no dispara señales: el contador de ocupantes se ajusta una vez por lote
+            ajustar_ocupantes(residencia.id, len(habitantes))
+
+        return Response({
+            "creados": len(habitantes),
+            "habitantes": HabitanteSerializer(habitantes, many=True).data,
+        }, status=status.HTTP_201_CREATED)
+
 class UnidadResidenciasListAPIView(APIView):
     def get(self, request, unidad_id):
         unidad = get_object_or_404(Unidad, pk=unidad_id)
-        residencias = unidad.residencias.all()
+        errores = _filtros_invalidos(request.GET)
+        if errores:
+            return Response(errores, status=status.HTTP_400_BAD_REQUEST)
+
+        residencias = filtrar_residencias(unidad.residencias.all(), request.GET)
+        residencias = ResidenciaSerializer.preparar_queryset(residencias)
         serializer = ResidenciaSerializer(residencias, many=True)
         return Response(serializer.data)
     
+class DirectorioBusquedaAPIView(APIView):
+    """Directorio para guardias: busca residentes y habitantes por nombre, CI o correo"""
+    def get(self, request):
+        q = (request.GET.get('q') or '').strip()
+        if len(q) < 3:
+            return Response(
+                {"error": "El parámetro q debe tener al menos 3 caracteres"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        try:
+            limit = min(max(int(request.GET.get('limit', 20)), 1), 50)
+            offset = min(max(int(request.GET.get('offset', 0)), 0), settings.DIRECTORIO_OFFSET_MAXIMO)
+        except ValueError:
+            return Response({"error": "limit y offset deben ser enteros"}, status=status.HTTP_400_BAD_REQUEST)
+
+        resultados, hay_mas = buscar_directorio(q, limit=limit, offset=offset)
+        serializer = DirectorioResultadoSerializer(resultados, many=True)
+        siguiente = offset + limit
+        return Response({
+            "resultados": serializer.data,
+            "siguiente_offset": siguiente if hay_mas and siguiente <= settings.DIRECTORIO_OFFSET_MAXIMO else None,
+        })
+
 # condominio/views.py (agregar al final)
 class AreaComunListCreateAPIView(APIView):
+    @get_condicional(AreaComun)
     def get(self, request):
         areas = AreaComun.objects.filter(esta_activa=True)
         serializer = AreaComunSerializer(areas, many=True)
@@ -266,6 +514,7 @@ class AreaComunListCreateAPIView(APIView):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 class AreaComunDetailAPIView(APIView):
+    @get_condicional(AreaComun)
     def get(self, request, pk):
         area = get_object_or_404(AreaComun, pk=pk)
         serializer = AreaComunSerializer(area)
@@ -278,9 +527,33 @@ class AreaComunDetailAPIView(APIView):
             serializer.save()
             return Response(serializer.data)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+class AreaComunDisponibilidadAPIView(APIView):
+    """
+    Horarios libres del área por día, recortados a hora_apertura/hora_cierre:
+        ?desde=2025-10-20&hasta=2025-10-26
+    Las reservas pendientes y confirmadas ocupan el horario; no se ofrecen huecos ya
+    pasados ni en áreas en mantenimiento. Cacheado por área hasta que cambie una de sus reservas.
+    """
+    def get(self, request, pk):
+        area = get_object_or_404(AreaComun, pk=pk, esta_activa=True)
+        consulta = DisponibilidadConsultaSerializer(data=request.GET)
+        if not consulta.is_valid():
+            return Response(consulta.errors, status=status.HTTP_400_BAD_REQUEST)
+        datos = consulta.validated_data
+        return Response(obtener_disponibilidad(area, datos['desde'], datos['hasta']))
     
 # condominio/views.py (actualizar las views de reservas)
-class ReservaAreaComunListCreateAPIView(APIView):
+def _transicionar_reserva(reserva, accion):
+    """Aplica la transición; devuelve la Response de error (400 inválida, 409 conflicto) o None"""
+    try:
+        reserva.transicionar(accion)
+    except DjangoValidationError as e:
+        codigo = status.HTTP_409_CONFLICT if e.code == 'conflicto' else status.HTTP_400_BAD_REQUEST
+        return Response({"error": e.messages[0]}, status=codigo)
+    return None
+
+class ReservaAreaComunListCreateAPIView(PaginacionKeysetMixin, APIView):
     def get(self, request):
         # Si es residente, solo ver sus reservas
         if hasattr(request.user, 'residente'):
@@ -302,8 +575,7 @@ class ReservaAreaComunListCreateAPIView(APIView):
         if area_comun_id:
             reservas = reservas.filter(area_comun_id=area_comun_id)
         
-        serializer = ReservaAreaComunSerializer(reservas, many=True)
-        return Response(serializer.data)
+        return self.paginar(reservas, ReservaAreaComunSerializer)
 
     def post(self, request):
         # Verificar que el usuario sea residente
@@ -326,6 +598,46 @@ class ReservaAreaComunListCreateAPIView(APIView):
             return Response(reserva_serializer.data, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
     
+class ReservaRecurrenteAPIView(APIView):
+    """
+    Serie de reservas (p. ej. todos los martes del año):
+        {"area_comun", "fecha", "hora_inicio", "hora_fin", "frecuencia": "semanal"|"mensual", "fecha_fin"}
+    Crea en un lote las ocurrencias libres e informa las que chocan con otras reservas.
+    """
+    def post(self, request):
+        if not hasattr(request.user, 'residente'):
+            return Response(
+                {"error": "Solo los residentes pueden hacer reservas"}, 
+                status=status.HTTP_403_FORBIDDEN
+            )
+        
+        serializer = ReservaRecurrenteSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        datos = serializer.validated_data
+        
+        try:
+            creadas, conflictos = reservar_serie(
+                request.user.residente, datos['area_comun'], datos['fechas'],
+                datos['hora_inicio'], datos['hora_fin'],
+            )
+        except IntegrityError as e:
+            mensaje = ReservaAreaComun.mensaje_conflicto(e)
+            if mensaje is None:
+                raise
+            return Response({"error": mensaje}, status=status.HTTP_409_CONFLICT)
+        
+        respuesta = {
+            "creadas": len(creadas),
+            "en_conflicto": len(conflictos),
+            "conflictos": [
+                {"fecha": fecha, "motivo": ReservaAreaComun.MENSAJE_SOLAPAMIENTO} for fecha in conflictos
+            ],
+            "reservas": ReservaAreaComunSerializer(creadas, many=True).data,
+        }
+        codigo = status.HTTP_201_CREATED if creadas else status.HTTP_400_BAD_REQUEST
+        return Response(respuesta, status=codigo)
+
 class ReservaAreaComunDetailAPIView(APIView):
     def get(self, request, pk):
         reserva = get_object_or_404(ReservaAreaComun, pk=pk)
@@ -340,6 +652,7 @@ class ReservaAreaComunDetailAPIView(APIView):
         serializer = ReservaAreaComunSerializer(reserva)
         return Response(serializer.data)
 
+    @jwt_auth_required
     def patch(self, request, pk):
         reserva = get_object_or_404(ReservaAreaComun, pk=pk)
         
@@ -360,32 +673,34 @@ class ReservaAreaComunDetailAPIView(APIView):
         
         serializer = ReservaAreaComunUpdateSerializer(reserva, data=request.data, partial=True)
         if serializer.is_valid():
-            serializer.save()
-            
-            # Si se confirma la reserva, crear la cuota automáticamente
-            if 'estado' in request.data and request.data['estado'] == 'reservada':
-                reserva.crear_cuota_reserva()
+            # El cambio de estado pasa por la máquina de estados (cobro/anulación una sola vez)
+            estado = serializer.validated_data.get('estado')
+            if estado and estado != reserva.estado:
+                error = _transicionar_reserva(reserva, ReservaAreaComunUpdateSerializer.ACCIONES[estado])
+                if error:
+                    return error
             
             return Response(ReservaAreaComunSerializer(reserva).data)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 class ConfirmarReservaAPIView(APIView):
     """Endpoint específico para confirmar reservas (admin only)"""
+    @jwt_auth_required
     def post(self, request, pk):
-        # Verificar que el usuario es admin/staff
-        
-        reserva = get_object_or_404(ReservaAreaComun, pk=pk)
-        
-        if reserva.estado != 'pendiente':
+        # Verificar que el usuario es admin/staff: los residentes solo pueden cancelar
+        if hasattr(request.user, 'residente'):
             return Response(
-                {"error": f"La reserva ya está {reserva.get_estado_display()}"}, 
-                status=status.HTTP_400_BAD_REQUEST
+                {"error": "Solo la administración puede confirmar reservas"}, 
+                status=status.HTTP_403_FORBIDDEN
             )
         
-        reserva.estado = 'reservada'
-        reserva.save()
+        reserva = get_object_or_404(ReservaAreaComun, pk=pk)
+        
+        # UPDATE condicional (solo si sigue pendiente) y creación de la cuota
+        error = _transicionar_reserva(reserva, 'confirmar')
+        if error:
+            return error
         
-        # La cuota se crea automáticamente en el save() del modelo
         serializer = ReservaAreaComunSerializer(reserva)
         return Response(serializer.data)
 
@@ -401,15 +716,30 @@ class CancelarReservaAPIView(APIView):
                 status=status.HTTP_403_FORBIDDEN
             )
         
-        if reserva.estado in ['cancelada', 'completada']:
+        # UPDATE condicional y eliminación del cobro si ya estaba confirmada
+        error = _transicionar_reserva(reserva, 'cancelar')
+        if error:
+            return error
+        
+        serializer = ReservaAreaComunSerializer(reserva)
+        return Response(serializer.data)
+
+class CompletarReservaAPIView(APIView):
+    """Marca como completada una reserva confirmada (admin only)"""
+    @jwt_auth_required
+    def post(self, request, pk):
+        # Los residentes solo pueden cancelar sus reservas (igual que en el PATCH)
+        if hasattr(request.user, 'residente'):
             return Response(
-                {"error": f"La reserva ya está {reserva.get_estado_display()}"}, 
-                status=status.HTTP_400_BAD_REQUEST
+                {"error": "Solo la administración puede completar reservas"}, 
+                status=status.HTTP_403_FORBIDDEN
             )
         
-        reserva.estado = 'cancelada'
-        reserva.save()
+        reserva = get_object_or_404(ReservaAreaComun, pk=pk)
+        
+        error = _transicionar_reserva(reserva, 'completar')
+        if error:
+            return error
         
-        # La cuota se cancela automáticamente en el save() del modelo
         serializer = ReservaAreaComunSerializer(reserva)
         return Response(serializer.data)
\ No newline at end of file
@@ -4,3 +4,8 @@ from django.apps import AppConfig
 class FinanceConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'finance'
+
+    def ready(self):
+        # Versiones para GET condicional (ETag / Last-Modified) de los catálogos
+        from utils.versiones import versionar_modelos
+        versionar_modelos(self.get_model('Expensa'))
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.6 on 2026-10-18 05:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0004_usuario_fecha_registro_index'),
+        ('condominio', '0004_reserva_paginacion_index'),
+        ('finance', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='cuota',
+            index=models.Index(fields=['periodo', '-id'], name='cuota_periodo_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='multa',
+            index=models.Index(fields=['residente', '-id'], name='multa_residente_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='multa',
+            index=models.Index(fields=['residencia', '-id'], name='multa_residencia_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='pago',
+            index=models.Index(fields=['residente', '-id'], name='pago_residente_id_idx'),
+        ),
+    ]
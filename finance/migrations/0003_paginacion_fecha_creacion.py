@@ -0,0 +1,35 @@
+# Generated by Django 5.2.6 on 2026-10-18 06:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0007_revocar_usuarios_inactivos'),
+        ('condominio', '0009_reserva_sin_solapamiento'),
+        ('finance', '0002_paginacion_indexes'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='multa',
+            name='multa_residente_id_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='multa',
+            name='multa_residencia_id_idx',
+        ),
+        migrations.AddIndex(
+            model_name='multa',
+            index=models.Index(fields=['-fecha_creacion', '-id'], name='multa_fecha_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='multa',
+            index=models.Index(fields=['residente', '-fecha_creacion', '-id'], name='multa_residente_fecha_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='multa',
+            index=models.Index(fields=['residencia', '-fecha_creacion', '-id'], name='multa_residencia_fecha_idx'),
+        ),
+    ]
@@ -32,6 +32,10 @@ class Cuota(models.Model):
 
     class Meta:
         unique_together = ['residencia', 'periodo']
+        # Listados paginados por filtro (WHERE filtro = x ORDER BY id DESC)
+        indexes = [
+            models.Index(fields=['periodo', '-id'], name='cuota_periodo_id_idx'),
+        ]
 
     @property
     def detalles_expensas(self):
@@ -99,6 +103,11 @@ class Pago(models.Model):
             
         self.cuota.save()
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['residente', '-id'], name='pago_residente_id_idx'),
+        ]
+
     def __str__(self):
         return f"Pago {self.residente} - ${self.monto_pagado}"
     
@@ -115,6 +124,14 @@ class Multa(models.Model):
     creado_por = models.ForeignKey('accounts.Usuario', on_delete=models.CASCADE)
     detalle_cuota = models.OneToOneField('DetalleCuota', on_delete=models.SET_NULL, null=True, blank=True)
 
+    class Meta:
+        indexes = [
+            # Orden de los listados paginados: (-fecha_creacion, -id)
+            models.Index(fields=['-fecha_creacion', '-id'], name='multa_fecha_idx'),
+            models.Index(fields=['residente', '-fecha_creacion', '-id'], name='multa_residente_fecha_idx'),
+            models.Index(fields=['residencia', '-fecha_creacion', '-id'], name='multa_residencia_fecha_idx'),
+        ]
+
     def convertir_a_detalle_cuota(self, periodo=None):
         """Convierte la multa en un DetalleCuota para el periodo actual"""
         from django.utils import timezone
@@ -3,6 +3,8 @@ from rest_framework.response import Response
 from rest_framework import status
 from django.shortcuts import get_object_or_404
 from django.db.models import Q
+from utils.pagination import PaginacionKeysetMixin
+from utils.condicional import get_condicional
 from .models import Cuota, Pago, Expensa, DetalleCuota, Multa
 from .serializers import (
     CuotaSerializer, CuotaCreateSerializer, CuotaResidenteSerializer,
@@ -14,6 +16,7 @@ from .serializers import (
 # VIEWS PARA EXPENSAS (Administrador)
 class ExpensaListCreateAPIView(APIView):
     """Vista para listar y crear expensas (solo admin)"""
+    @get_condicional(Expensa)
     def get(self, request):
         expensas = Expensa.objects.all()
         serializer = ExpensaSerializer(expensas, many=True)
@@ -28,6 +31,7 @@ class ExpensaListCreateAPIView(APIView):
 
 class ExpensaDetailAPIView(APIView):
     """Vista para detalle, actualizar y eliminar expensas"""
+    @get_condicional(Expensa)
     def get(self, request, pk):
         expensa = get_object_or_404(Expensa, pk=pk)
         serializer = ExpensaSerializer(expensa)
@@ -49,12 +53,11 @@ class ExpensaDetailAPIView(APIView):
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 # VIEWS PARA DETALLES DE CUOTA (Administrador)
-class DetalleCuotaListCreateAPIView(APIView):
+class DetalleCuotaListCreateAPIView(PaginacionKeysetMixin, APIView):
     """Vista para listar y crear detalles de cuota"""
     def get(self, request):
         detalles = DetalleCuota.objects.all()
-        serializer = DetalleCuotaSerializer(detalles, many=True)
-        return Response(serializer.data)
+        return self.paginar(detalles, DetalleCuotaSerializer)
 
     def post(self, request):
         serializer = DetalleCuotaCreateSerializer(data=request.data)
@@ -92,11 +95,10 @@ class DetalleCuotaDetailAPIView(APIView):
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 # VIEWS PARA CUOTAS (Administrador) 
-class CuotaListCreateAPIView(APIView):
+class CuotaListCreateAPIView(PaginacionKeysetMixin, APIView):
     def get(self, request):
         cuotas = Cuota.objects.all()
-        serializer = CuotaSerializer(cuotas, many=True)
-        return Response(serializer.data)
+        return self.paginar(cuotas, CuotaSerializer)
 
     def post(self, request):
         serializer = CuotaCreateSerializer(data=request.data)
@@ -122,11 +124,10 @@ class CuotaDetailAPIView(APIView):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 # VIEWS PARA PAGOS (Administrador) 
-class PagoListCreateAPIView(APIView):
+class PagoListCreateAPIView(PaginacionKeysetMixin, APIView):
     def get(self, request):
         pagos = Pago.objects.all()
-        serializer = PagoSerializer(pagos, many=True)
-        return Response(serializer.data)
+        return self.paginar(pagos, PagoSerializer)
 
     def post(self, request):
         serializer = PagoCreateSerializer(data=request.data)
@@ -153,21 +154,19 @@ class PagoDetailAPIView(APIView):
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 # VIEWS ESPECIALES PARA RESIDENTES
-class MisCuotasAPIView(APIView):
+class MisCuotasAPIView(PaginacionKeysetMixin, APIView):
     """Vista para que un residente vea SUS cuotas"""
     def get(self, request):
         residente = request.user.residente
         cuotas = Cuota.objects.filter(residencia__residente=residente)
-        serializer = CuotaResidenteSerializer(cuotas, many=True)
-        return Response(serializer.data)
+        return self.paginar(cuotas, CuotaResidenteSerializer)
 
-class MisPagosAPIView(APIView):
+class MisPagosAPIView(PaginacionKeysetMixin, APIView):
     """Vista para que un residente vea SUS pagos"""
     def get(self, request):
         residente = request.user.residente
         pagos = Pago.objects.filter(residente=residente)
-        serializer = PagoResidenteSerializer(pagos, many=True)
-        return Response(serializer.data)
+        return self.paginar(pagos, PagoResidenteSerializer)
 
 class RealizarPagoAPIView(APIView):
     """Vista para que un residente realice un pago"""
@@ -188,19 +187,17 @@ class RealizarPagoAPIView(APIView):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 # VISTAS ADICIONALES ÚTILES
-class CuotasPorResidenteAPIView(APIView):
+class CuotasPorResidenteAPIView(PaginacionKeysetMixin, APIView):
     """Vista para administrador: ver cuotas de un residente específico"""
     def get(self, request, residente_id):
         cuotas = Cuota.objects.filter(residencia__residente_id=residente_id)
-        serializer = CuotaSerializer(cuotas, many=True)
-        return Response(serializer.data)
+        return self.paginar(cuotas, CuotaSerializer)
 
-class CuotasPorPeriodoAPIView(APIView):
+class CuotasPorPeriodoAPIView(PaginacionKeysetMixin, APIView):
     """Vista para administrador: ver cuotas de un período específico"""
     def get(self, request, periodo):
         cuotas = Cuota.objects.filter(periodo=periodo)
-        serializer = CuotaSerializer(cuotas, many=True)
-        return Response(serializer.data)
+        return self.paginar(cuotas, CuotaSerializer)
 
 class GenerarCuotasMensualesAPIView(APIView):
     """Vista para administrador: generar cuotas automáticamente para todos"""
@@ -229,13 +226,13 @@ class GenerarCuotasMensualesAPIView(APIView):
         }, status=status.HTTP_201_CREATED)
     
 # VIEWS PARA MULTAS (Administrador)
-class MultaListCreateAPIView(APIView):
+class MultaListCreateAPIView(PaginacionKeysetMixin, APIView):
     """Vista para listar y crear multas"""
+    ordering_paginacion = ('-fecha_creacion', '-id')
     
     def get(self, request):
-        multas = Multa.objects.all().order_by('-fecha_creacion')
-        serializer = MultaSerializer(multas, many=True)
-        return Response(serializer.data)
+        multas = Multa.objects.all()
+        return self.paginar(multas, MultaSerializer)
 
     def post(self, request):
         serializer = MultaSerializer(data=request.data)
@@ -288,8 +285,9 @@ class MultaConvertirACuotaAPIView(APIView):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-class MultasPorResidenteAPIView(APIView):
+class MultasPorResidenteAPIView(PaginacionKeysetMixin, APIView):
     """Vista para obtener multas por residente"""
+    ordering_paginacion = ('-fecha_creacion', '-id')
     
     def get(self, request):
         residente_id = request.query_params.get('residente_id')
@@ -299,12 +297,12 @@ class MultasPorResidenteAPIView(APIView):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        multas = Multa.objects.filter(residente_id=residente_id).order_by('-fecha_creacion')
-        serializer = MultaSerializer(multas, many=True)
-        return Response(serializer.data)
+        multas = Multa.objects.filter(residente_id=residente_id)
+        return self.paginar(multas, MultaSerializer)
 
-class MultasPorResidenciaAPIView(APIView):
+class MultasPorResidenciaAPIView(PaginacionKeysetMixin, APIView):
     """Vista para obtener multas por residencia"""
+    ordering_paginacion = ('-fecha_creacion', '-id')
     
     def get(self, request):
         residencia_id = request.query_params.get('residencia_id')
@@ -314,12 +312,12 @@ class MultasPorResidenciaAPIView(APIView):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        multas = Multa.objects.filter(residencia_id=residencia_id).order_by('-fecha_creacion')
-        serializer = MultaSerializer(multas, many=True)
-        return Response(serializer.data)
+        multas = Multa.objects.filter(residencia_id=residencia_id)
+        return self.paginar(multas, MultaSerializer)
 
-class MisMultasAPIView(APIView):
+class MisMultasAPIView(PaginacionKeysetMixin, APIView):
     """Vista para que un residente vea SUS multas"""
+    ordering_paginacion = ('-fecha_creacion', '-id')
     
     def get(self, request):
         # Solo residentes pueden ver sus propias multas
@@ -330,6 +328,5 @@ class MisMultasAPIView(APIView):
             )
         
         residente = request.user.residente
-        multas = Multa.objects.filter(residente=residente).order_by('-fecha_creacion')
-        serializer = MultaSerializer(multas, many=True)
-        return Response(serializer.data)
\ No newline at end of file
+        multas = Multa.objects.filter(residente=residente)
+        return self.paginar(multas, MultaSerializer)
\ No newline at end of file
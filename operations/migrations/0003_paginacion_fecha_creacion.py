@@ -0,0 +1,59 @@
+# Generated by Django 5.2.6 on 2026-10-18 06:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0007_revocar_usuarios_inactivos'),
+        ('condominio', '0009_reserva_sin_solapamiento'),
+        ('operations', '0002_paginacion_indexes'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='notificacion',
+            name='notificacion_usuario_id_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='notificacion',
+            name='notificacion_no_leida_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='tarea',
+            name='tarea_tomada_por_id_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='tarea',
+            name='tarea_rol_estado_id_idx',
+        ),
+        migrations.AddIndex(
+            model_name='aviso',
+            index=models.Index(condition=models.Q(('es_activo', True)), fields=['-fecha_creacion', '-id'], name='aviso_activo_fecha_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='notificacion',
+            index=models.Index(fields=['usuario', '-fecha_creacion', '-id'], name='notificacion_usuario_fecha_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='notificacion',
+            index=models.Index(condition=models.Q(('leida', False)), fields=['usuario', '-fecha_creacion', '-id'], name='notificacion_no_leida_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tarea',
+            index=models.Index(fields=['-fecha_creacion', '-id'], name='tarea_fecha_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tarea',
+            index=models.Index(fields=['tomada_por', '-fecha_creacion', '-id'], name='tarea_tomada_por_fecha_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tarea',
+            index=models.Index(fields=['asignado_rol', '-fecha_creacion', '-id'], name='tarea_rol_fecha_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tarea',
+            index=models.Index(fields=['asignado_rol', 'estado', '-fecha_creacion', '-id'], name='tarea_rol_estado_fecha_idx'),
+        ),
+    ]
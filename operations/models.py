@@ -51,6 +51,13 @@ class Tarea(models.Model):
     
     class Meta:
         ordering = ['-fecha_creacion']
+        indexes = [
+            # Orden de los listados paginados: (-fecha_creacion, -id)
+            models.Index(fields=['-fecha_creacion', '-id'], name='tarea_fecha_idx'),
+            models.Index(fields=['tomada_por', '-fecha_creacion', '-id'], name='tarea_tomada_por_fecha_idx'),
+            models.Index(fields=['asignado_rol', '-fecha_creacion', '-id'], name='tarea_rol_fecha_idx'),
+            models.Index(fields=['asignado_rol', 'estado', '-fecha_creacion', '-id'], name='tarea_rol_estado_fecha_idx'),
+        ]
     
     def __str__(self):
         return f"{self.titulo} - {self.get_estado_display()}"
@@ -102,6 +109,9 @@ class Aviso(models.Model):
     
     class Meta:
         ordering = ['-fecha_creacion']
+        indexes = [
+            models.Index(fields=['-fecha_creacion', '-id'], condition=models.Q(es_activo=True), name='aviso_activo_fecha_idx'),
+        ]
     
     def __str__(self):
         return f"{self.titulo} - {self.get_tipo_display()}"
@@ -134,6 +144,12 @@ class Notificacion(models.Model):
     
     class Meta:
         ordering = ['-fecha_creacion']
+        indexes = [
+            # Orden de los listados paginados: (-fecha_creacion, -id)
+            models.Index(fields=['usuario', '-fecha_creacion', '-id'], name='notificacion_usuario_fecha_idx'),
+            models.Index(fields=['usuario', '-fecha_creacion', '-id'], condition=models.Q(leida=False),
+                         name='notificacion_no_leida_idx'),
+        ]
     
     def __str__(self):
         return f"{self.usuario}: {self.titulo}"
\ No newline at end of file
@@ -3,17 +3,18 @@ from rest_framework.response import Response
 from rest_framework import status
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
+from utils.pagination import PaginacionKeysetMixin
 
 from .models import Tarea, Aviso, Notificacion
 from .serializers import TareaSerializer, TareaCreateSerializer, TomarTareaSerializer, CompletarTareaSerializer
 from .serializers import AvisoSerializer, AvisoCreateSerializer, NotificacionSerializer, MarcarLeidaSerializer
-class TareaListCreateAPIView(APIView):
+class TareaListCreateAPIView(PaginacionKeysetMixin, APIView):
     """Vista para listar y crear tareas (solo admin)"""
+    ordering_paginacion = ('-fecha_creacion', '-id')
     
     def get(self, request):
         tareas = Tarea.objects.all()
-        serializer = TareaSerializer(tareas, many=True)
-        return Response(serializer.data)
+        return self.paginar(tareas, TareaSerializer)
     
     def post(self, request):
         serializer = TareaCreateSerializer(data=request.data)
@@ -49,16 +50,17 @@ class TareaDetailAPIView(APIView):
         tarea.delete()
         return Response(status=status.HTTP_204_NO_CONTENT)
 
-class MisTareasAPIView(APIView):
+class MisTareasAPIView(PaginacionKeysetMixin, APIView):
     """Vista para que un usuario vea las tareas que TOMÓ"""
+    ordering_paginacion = ('-fecha_creacion', '-id')
     
     def get(self, request):
         tareas = Tarea.objects.filter(tomada_por=request.user)
-        serializer = TareaSerializer(tareas, many=True)
-        return Response(serializer.data)
+        return self.paginar(tareas, TareaSerializer)
 
-class TareasDisponiblesAPIView(APIView):
+class TareasDisponiblesAPIView(PaginacionKeysetMixin, APIView):
     """Vista para que un usuario vea tareas disponibles para su ROL"""
+    ordering_paginacion = ('-fecha_creacion', '-id')
     
     def get(self, request):
         # Tareas pendientes que coinciden con el rol del usuario y NO han sido tomadas
@@ -67,8 +69,7 @@ class TareasDisponiblesAPIView(APIView):
             estado='pendiente',
             tomada_por__isnull=True
         )
-        serializer = TareaSerializer(tareas, many=True)
-        return Response(serializer.data)
+        return self.paginar(tareas, TareaSerializer)
 
 class TomarTareaAPIView(APIView):
     """Vista para que un usuario tome una tarea disponible"""
@@ -117,8 +118,9 @@ class CompletarTareaAPIView(APIView):
         
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
-class TareasPorRolAPIView(APIView):
+class TareasPorRolAPIView(PaginacionKeysetMixin, APIView):
     """Vista para admin: ver tareas por rol específico"""
+    ordering_paginacion = ('-fecha_creacion', '-id')
     
     def get(self, request):
         rol_id = request.query_params.get('rol_id')
@@ -129,18 +131,17 @@ class TareasPorRolAPIView(APIView):
             )
         
         tareas = Tarea.objects.filter(asignado_rol_id=rol_id)
-        serializer = TareaSerializer(tareas, many=True)
-        return Response(serializer.data)
+        return self.paginar(tareas, TareaSerializer)
 
 # AVISOS
 
-class AvisoListCreateAPIView(APIView):
+class AvisoListCreateAPIView(PaginacionKeysetMixin, APIView):
     """Vista para listar y crear avisos (admin)"""
+    ordering_paginacion = ('-fecha_creacion', '-id')
     
     def get(self, request):
         avisos = Aviso.objects.filter(es_activo=True)
-        serializer = AvisoSerializer(avisos, many=True)
-        return Response(serializer.data)
+        return self.paginar(avisos, AvisoSerializer)
     
     def post(self, request):
         serializer = AvisoCreateSerializer(data=request.data)
@@ -208,30 +209,30 @@ class AvisosParaMiAPIView(APIView):
         if aviso.para_roles.exists() and usuario.rol in aviso.para_roles.all():
             return True
             
-        if (hasattr(usuario, 'residente') and 
-            usuario.residente and 
-            usuario.residente.residencia in aviso.para_residencias.all()):
+        # residencia_activa viene precargada por el cache de principales
+        residencia = getattr(usuario, 'residencia_activa', None)
+        if residencia and residencia in aviso.para_residencias.all():
             return True
             
         return False
 
 # NOTIFICACIONES
 
-class MisNotificacionesAPIView(APIView):
+class MisNotificacionesAPIView(PaginacionKeysetMixin, APIView):
     """Vista para que un usuario vea SUS notificaciones"""
+    ordering_paginacion = ('-fecha_creacion', '-id')
     
     def get(self, request):
         notificaciones = Notificacion.objects.filter(usuario=request.user)
-        serializer = NotificacionSerializer(notificaciones, many=True)
-        return Response(serializer.data)
+        return self.paginar(notificaciones, NotificacionSerializer)
 
-class NotificacionesNoLeidasAPIView(APIView):
+class NotificacionesNoLeidasAPIView(PaginacionKeysetMixin, APIView):
     """Vista para notificaciones no leídas del usuario"""
+    ordering_paginacion = ('-fecha_creacion', '-id')
     
     def get(self, request):
         notificaciones = Notificacion.objects.filter(usuario=request.user, leida=False)
-        serializer = NotificacionSerializer(notificaciones, many=True)
-        return Response(serializer.data)
+        return self.paginar(notificaciones, NotificacionSerializer)
     
     def post(self, request):
         # Marcar todas como leídas
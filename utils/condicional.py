@@ -0,0 +1,68 @@
+from functools import wraps
+from django.http import HttpResponseNotModified
+from django.utils.http import http_date, parse_etags, parse_http_date_safe
+
+from utils.versiones import cache_compartido, obtener_version
+
+
+def etag_de(version):
+    return f'"{version}"'
+
+
+def _sin_debil(etag):
+    return etag[2:] if etag.startswith('W/') else etag
+
+
+def no_modificado(request, etag, modificado=None):
+    """
+    True si el cliente ya tiene esta versión. If-None-Match manda; If-Modified-Since
+    solo se mira si no vino ETag.
+    """
+    cabecera = request.headers.get('If-None-Match')
+    if cabecera:
+        etags = {_sin_debil(e) for e in parse_etags(cabecera)}
+        return '*' in etags or _sin_debil(etag) in etags
+
+    if modificado is not None:
+        desde = parse_http_date_safe(request.headers.get('If-Modified-Since', ''))
+        return desde is not None and modificado <= desde
+    return False
+
+
+def aplicar_validadores(response, etag, modificado=None):
+    response['ETag'] = etag
+    if modificado is not None:
+        response['Last-Modified'] = http_date(modificado)
+    response['Cache-Control'] = 'no-cache'  # el cliente guarda, pero siempre revalida
+    return response
+
+
+def respuesta_no_modificada(etag, modificado=None):
+    return aplicar_validadores(HttpResponseNotModified(), etag, modificado)
+
+
+def get_condicional(modelo):
+    """
+    Decorador para el get() de vistas de catálogo: responde 304 sin consultar ni
+    serializar si el cliente ya tiene la versión vigente. Con pk en la URL usa la
+    versión del recurso; sin pk, la de la colección. Sin cache compartido no hace nada.
+    """
+    def decorador(func):
+        @wraps(func)
+        def wrapper(self, request, *args, **kwargs):
+            if not cache_compartido():
+                return func(self, request, *args, **kwargs)
+
+            pk = kwargs.get('pk')
+            # La versión de un recurso se crea recién cuando existe (un 404 no deja claves)
+            actual = obtener_version(modelo, pk, crear=pk is None)
+            if actual is not None and no_modificado(request, etag_de(actual[0]), actual[1]):
+                return respuesta_no_modificada(etag_de(actual[0]), actual[1])
+
+            response = func(self, request, *args, **kwargs)
+            if response.status_code == 200:
+                version, modificado = actual or obtener_version(modelo, pk)
+                aplicar_validadores(response, etag_de(version), modificado)
+            return response
+        return wrapper
+    return decorador
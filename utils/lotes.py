@@ -0,0 +1,8 @@
+from itertools import islice
+
+
+def lotes(iterable, tamano):
+    """Parte `iterable` en listas de hasta `tamano` elementos sin materializarlo entero"""
+    iterador = iter(iterable)
+    while lote := list(islice(iterador, tamano)):
+        yield lote
@@ -0,0 +1,31 @@
+from django.conf import settings
+from rest_framework.pagination import CursorPagination
+
+
+class PaginacionKeyset(CursorPagination):
+    """
+    Paginación por cursor (keyset): cursores opacos y orden estable, así una
+    página profunda cuesta lo mismo que la primera (WHERE col < cursor LIMIT n).
+    ?limit= ajusta el tamaño de página hasta PAGINACION_MAXIMO.
+    """
+    page_size = settings.PAGINACION_TAMANO
+    page_size_query_param = 'limit'
+    max_page_size = settings.PAGINACION_MAXIMO
+    ordering = '-id'
+
+
+class PaginacionKeysetMixin:
+    """
+    Para APIViews escritas a mano:
+        ordering_paginacion = '-id'   # único e indexado; si no es único, terminar en el id: ('-fecha', '-id')
+        return self.paginar(queryset, MiSerializer)
+    """
+    ordering_paginacion = '-id'
+    pagination_class = PaginacionKeyset
+
+    def paginar(self, queryset, serializer_class, **serializer_kwargs):
+        paginator = self.pagination_class()
+        paginator.ordering = self.ordering_paginacion
+        pagina = paginator.paginate_queryset(queryset, self.request, view=self)
+        serializer = serializer_class(pagina, many=True, **serializer_kwargs)
+        return paginator.get_paginated_response(serializer.data)
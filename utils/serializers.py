@@ -0,0 +1,53 @@
+def _lista_param(valor):
+    if valor is None:
+        return None
+    return {campo.strip() for campo in valor.split(',') if campo.strip()}
+
+
+class CamposDinamicosMixin:
+    """
+    Sparse fieldsets para ModelSerializers (solo en lecturas GET):
+        ?fields=id,nombre        -> solo esos campos
+        ?expand=usuario_info     -> incluye relaciones declaradas en Meta.expandibles
+    Sin parámetros la salida no cambia. Con ?fields= o ?expand= las relaciones
+    expandibles solo salen si se piden.
+
+    Meta.select_related = {'campo': 'ruta' | ['ruta', ...]} indica qué join necesita
+    cada campo; preparar_queryset() aplica solo los de los campos que se van a serializar.
+    """
+    def __init__(self, *args, **kwargs):
+        fields = kwargs.pop('fields', None)
+        expand = kwargs.pop('expand', None)
+        super().__init__(*args, **kwargs)
+
+        request = self.context.get('request')
+        if request is not None and request.method == 'GET':
+            if fields is None:
+                fields = _lista_param(request.query_params.get('fields'))
+            if expand is None:
+                expand = _lista_param(request.query_params.get('expand'))
+
+        if fields is None and expand is None:
+            return
+
+        expandibles = set(getattr(self.Meta, 'expandibles', []))
+        expand = set(expand or [])
+        for nombre in list(self.fields):
+            if nombre in expandibles:
+                visible = nombre in expand or (fields is not None and nombre in fields)
+            else:
+                visible = fields is None or nombre in fields
+            if not visible:
+                self.fields.pop(nombre)
+
+    @classmethod
+    def preparar_queryset(cls, queryset, request=None, **kwargs):
+        """Aplica select_related solo para las relaciones que se van a serializar"""
+        campos = cls(context={'request': request}, **kwargs).fields
+        rutas = set()
+        for campo, ruta in getattr(cls.Meta, 'select_related', {}).items():
+            if campo in campos:
+                rutas.update([ruta] if isinstance(ruta, str) else ruta)
+        if rutas:
+            queryset = queryset.select_related(*sorted(rutas))
+        return queryset
@@ -0,0 +1,100 @@
+import time
+import uuid
+from django.conf import settings
+from django.core.cache import caches
+from django.core.checks import Tags, Warning, register
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.utils.connection import ConnectionProxy
+
+
+VERSION_PREFIX = "version"
+VERSIONES_CACHE = 'versiones'
+
+# Cache de las claves de versión (settings.CACHES['versiones']): el mismo para todos los workers
+cache_versiones = ConnectionProxy(caches, VERSIONES_CACHE)
+
+# Backends cuyo contenido no se comparte entre workers: una versión nueva no llega a los demás
+CACHES_LOCALES = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+
+
+def cache_compartido():
+    return settings.CACHES[VERSIONES_CACHE]['BACKEND'] not in CACHES_LOCALES
+
+
+@register(Tags.caches)
+def revisar_cache_compartido(app_configs, **kwargs):
+    if cache_compartido():
+        return []
+    return [Warning(
+        "El cache de versiones es local al proceso: las versiones no se comparten entre workers, "
+        "así que el GET condicional (ETag / 304) queda desactivado.",
+        hint="Deje VERSION_CACHE_BACKEND en DatabaseCache o apúntelo a Redis/Memcached.",
+        id='utils.W001',
+    )]
+
+
+def _key(modelo, pk=None):
+    base = f"{VERSION_PREFIX}:{modelo._meta.label_lower}"
+    return base if pk is None else f"{base}:{pk}"
+
+
+def _nueva_version():
+    return (uuid.uuid4().hex, int(time.time()))
+
+
+def obtener_version(modelo, pk=None, crear=True):
+    """
+    (version, modificado_epoch) de la colección (pk=None) o de un recurso.
+    Si la clave no está en cache se genera una nueva: el cliente revalida una vez
+    de más, nunca recibe un 304 equivocado. Con crear=False devuelve None en ese caso.
+    """
+    key = _key(modelo, pk)
+    version = cache_versiones.get(key)
+    if version is None:
+        if not crear:
+            return None
+        cache_versiones.add(key, _nueva_version(), settings.VERSION_CACHE_TTL)
+        version = cache_versiones.get(key) or _nueva_version()
+    return version
+
+
+def registrar_cambio(modelo, pk):
+    """
+    Nueva versión para el recurso y para su colección. La fecha avanza al menos un
+    segundo respecto de la anterior: dos cambios en el mismo segundo no comparten Last-Modified.
+    """
+    registrar_cambios(modelo, [pk])
+
+
+def registrar_cambios(modelo, pks):
+    """Como registrar_cambio, para muchos recursos con una lectura y una escritura al cache"""
+    keys = [_key(modelo)] + [_key(modelo, pk) for pk in pks]
+    previas = cache_versiones.get_many(keys)
+    version, modificado = _nueva_version()
+    modificado = max([modificado] + [previa[1] + 1 for previa in previas.values()])
+    cache_versiones.set_many({key: (version, modificado) for key in keys}, settings.VERSION_CACHE_TTL)
+
+
+def registrar_cambio_coleccion(modelo):
+    """Nueva versión de la colección (altas/cambios masivos que no disparan señales)"""
+    registrar_cambios(modelo, [])
+
+
+def _versionar_por_cambio(sender, instance, **kwargs):
+    pk = instance.pk
+    # Después del commit: no anunciar una versión cuyos datos aún no se ven
+    transaction.on_commit(lambda: registrar_cambio(sender, pk))
+
+
+def versionar_modelos(*modelos):
+    """Conecta las señales que versionan colección y recurso de cada modelo"""
+    for modelo in modelos:
+        for senal in (post_save, post_delete):
+            senal.connect(
+                _versionar_por_cambio, sender=modelo,
+                dispatch_uid=f"versionar:{modelo._meta.label_lower}:{senal is post_save}",
+            )